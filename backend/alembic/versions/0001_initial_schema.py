@@ -0,0 +1,82 @@
+"""Initial schema (documents, nodes, edges)
+
+Matches the tables previously created by ``init_db``/``create_all``.
+Databases that were bootstrapped that way should be marked with
+``alembic stamp 0001`` before running ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("source_type", sa.String(length=50), nullable=True),
+        sa.Column("source_url", sa.String(length=500), nullable=True),
+        sa.Column("metadata", JSONType, nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_table(
+        "nodes",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("type", sa.String(length=100), nullable=True),
+        sa.Column("properties", JSONType, nullable=True),
+        sa.Column("source_document_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["source_document_id"], ["documents.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_nodes_name", "nodes", ["name"])
+    op.create_index("ix_nodes_type", "nodes", ["type"])
+    op.create_index("idx_nodes_name", "nodes", ["name"])
+    op.create_index("idx_nodes_type", "nodes", ["type"])
+    op.create_index("idx_nodes_name_type", "nodes", ["name", "type"])
+
+    op.create_table(
+        "edges",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("source_id", sa.Integer(), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("relation_type", sa.String(length=100), nullable=False),
+        sa.Column("properties", JSONType, nullable=True),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["source_id"], ["nodes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["target_id"], ["nodes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_edges_relation_type", "edges", ["relation_type"])
+    op.create_index("idx_edges_source", "edges", ["source_id"])
+    op.create_index("idx_edges_target", "edges", ["target_id"])
+    op.create_index("idx_edges_relation_type", "edges", ["relation_type"])
+    op.create_index("idx_edges_source_target", "edges", ["source_id", "target_id"])
+    op.create_index("idx_edges_source_relation", "edges", ["source_id", "relation_type"])
+
+
+def downgrade() -> None:
+    op.drop_table("edges")
+    op.drop_table("nodes")
+    op.drop_table("documents")
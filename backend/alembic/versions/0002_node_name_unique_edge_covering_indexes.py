@@ -0,0 +1,69 @@
+"""Unique node names and covering edge indexes
+
+Makes ``idx_nodes_name`` unique (required by ``ON CONFLICT (name)`` in
+node creation) and turns the (source|target, relation_type) edge indexes
+into covering indexes for the recursive CTE walks. Nodes sharing a name
+are merged first: edges are repointed to the lowest id per name and the
+other rows are deleted (edges this duplicates are removed by 0005).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Duplicate node id -> the lowest id sharing its name
+DUPLICATE_NODES = """
+    SELECT id, keep_id
+    FROM (SELECT id, min(id) OVER (PARTITION BY name) AS keep_id FROM nodes) ranked
+    WHERE id <> keep_id
+"""
+
+
+def upgrade() -> None:
+    for column in ("source_id", "target_id"):
+        op.execute(
+            f"""
+            UPDATE edges e
+            SET {column} = dup.keep_id
+            FROM ({DUPLICATE_NODES}) dup
+            WHERE e.{column} = dup.id
+            """
+        )
+    op.execute(f"DELETE FROM nodes WHERE id IN (SELECT id FROM ({DUPLICATE_NODES}) dup)")
+
+    op.drop_index("idx_nodes_name", table_name="nodes")
+    op.create_index("idx_nodes_name", "nodes", ["name"], unique=True)
+
+    op.drop_index("idx_edges_source_relation", table_name="edges")
+    op.create_index(
+        "idx_edges_source_relation",
+        "edges",
+        ["source_id", "relation_type"],
+        postgresql_include=["target_id", "weight"],
+    )
+    op.create_index(
+        "idx_edges_target_relation",
+        "edges",
+        ["target_id", "relation_type"],
+        postgresql_include=["source_id", "weight"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_edges_target_relation", table_name="edges")
+    op.drop_index("idx_edges_source_relation", table_name="edges")
+    op.create_index("idx_edges_source_relation", "edges", ["source_id", "relation_type"])
+
+    op.drop_index("idx_nodes_name", table_name="nodes")
+    op.create_index("idx_nodes_name", "nodes", ["name"])
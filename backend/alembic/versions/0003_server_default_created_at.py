@@ -0,0 +1,32 @@
+"""Stamp created_at with a server-side default
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("documents", "nodes", "edges")
+
+# Existing rows are naive UTC; now() alone would follow the session TimeZone
+UTC_NOW = sa.text("timezone('utc', now())")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "created_at", server_default=UTC_NOW)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "created_at", server_default=None)
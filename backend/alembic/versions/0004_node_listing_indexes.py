@@ -0,0 +1,26 @@
+"""Index nodes for newest-first listing
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_nodes_created_at", "nodes", ["created_at"])
+    op.create_index("idx_nodes_type_created_at", "nodes", ["type", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_nodes_type_created_at", table_name="nodes")
+    op.drop_index("idx_nodes_created_at", table_name="nodes")
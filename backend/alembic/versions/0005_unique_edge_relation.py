@@ -0,0 +1,42 @@
+"""Unique (source, target, relation type) edges
+
+Duplicate edges are removed (the lowest id of each is kept) before the
+unique index is created; edge inserts use it as their ON CONFLICT target.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM edges e
+        USING edges keep
+        WHERE e.source_id = keep.source_id
+          AND e.target_id = keep.target_id
+          AND e.relation_type = keep.relation_type
+          AND e.id > keep.id
+        """
+    )
+    op.create_index(
+        "idx_edges_unique_relation",
+        "edges",
+        ["source_id", "target_id", "relation_type"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_edges_unique_relation", table_name="edges")
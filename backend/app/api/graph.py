@@ -1,7 +1,11 @@
 """Graph API endpoints for nodes, edges, and queries"""
 
-from typing import Optional
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Optional
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -21,10 +25,42 @@ from app.models.schemas import (
     SearchResponse,
 )
 from app.services.graph import GraphService
+from app.models.db_models import Edge
+from app.utils.request_body import compiled_json_body, json_body, json_body_openapi
 
 router = APIRouter(prefix="/graph", tags=["Graph"])
 
 
+def _edge_payload(edge: Edge) -> dict:
+    """Serialize an edge (with joined endpoints) for list responses."""
+    return {
+        "id": edge.id,
+        "source_id": edge.source_id,
+        "target_id": edge.target_id,
+        "source_name": edge.source_node.name if edge.source_node else None,
+        "target_name": edge.target_node.name if edge.target_node else None,
+        "relation_type": edge.relation_type,
+        "properties": edge.properties,
+        "weight": edge.weight,
+        "created_at": edge.created_at,
+    }
+
+
+async def _list_body(
+    key: str, rows: AsyncIterator[Any], serialize: Callable[[Any], dict], total: int
+) -> bytes:
+    """
+    Encode a ``{key: [...], "total": n}`` list page from a row stream.
+
+    Each row is serialized as soon as it is fetched, so only the encoded bytes
+    are held for the page rather than ORM objects plus their dicts. The body is
+    finished before returning because the request session closes before a
+    streaming response would start sending.
+    """
+    items = [orjson.dumps(serialize(row)) async for row in rows]
+    return b'{"%s":[%s],"total":%d}' % (key.encode(), b",".join(items), total)
+
+
 # ==================== Node Endpoints ====================
 
 
@@ -34,9 +70,10 @@ router = APIRouter(prefix="/graph", tags=["Graph"])
     status_code=status.HTTP_201_CREATED,
     summary="Create a node",
     description="Create a new node (entity) in the knowledge graph.",
+    openapi_extra=json_body_openapi(NodeCreate),
 )
 async def create_node(
-    node_data: NodeCreate,
+    node_data: NodeCreate = Depends(json_body(NodeCreate)),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ) -> NodeResponse:
@@ -47,21 +84,20 @@ async def create_node(
     """
     graph_service = GraphService(db)
 
-    # Check if node with same name exists
-    existing = await graph_service.get_node_by_name(node_data.name)
-    if existing:
+    node = await graph_service.create_node(node_data)
+    if node is None:
+        existing = await graph_service.get_node_by_name(node_data.name)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Node with name '{node_data.name}' already exists (ID: {existing.id})",
         )
 
-    node = await graph_service.create_node(node_data)
     return NodeResponse.model_validate(node)
 
 
 @router.get(
     "/nodes",
-    response_model=NodeListResponse,
+    responses={200: {"model": NodeListResponse}},
     summary="List nodes",
     description="List all nodes with optional filtering.",
 )
@@ -72,18 +108,19 @@ async def list_nodes(
     name: Optional[str] = Query(None, description="Filter by name (partial match)"),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
-) -> NodeListResponse:
+) -> Response:
     """
     List nodes with optional filtering by type and name.
+
+    The page and the total are fetched in a single query.
     """
     graph_service = GraphService(db)
     nodes, total = await graph_service.list_nodes(
         skip=skip, limit=limit, node_type=type, name_filter=name
     )
 
-    return NodeListResponse(
-        nodes=[NodeResponse.model_validate(n) for n in nodes], total=total
-    )
+    body = b'{"nodes":%s,"total":%d}' % (orjson.dumps(nodes), total)
+    return Response(body, media_type="application/json")
 
 
 @router.get(
@@ -141,9 +178,10 @@ async def delete_node(
     status_code=status.HTTP_201_CREATED,
     summary="Create an edge",
     description="Create a new edge (relation) between two nodes.",
+    openapi_extra=json_body_openapi(EdgeCreate),
 )
 async def create_edge(
-    edge_data: EdgeCreate,
+    edge_data: EdgeCreate = Depends(json_body(EdgeCreate)),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ) -> EdgeResponse:
@@ -155,28 +193,35 @@ async def create_edge(
     graph_service = GraphService(db)
 
     # Verify source and target nodes exist
-    source = await graph_service.get_node(edge_data.source_id)
-    if not source:
+    names = await graph_service.get_nodes_by_ids([edge_data.source_id, edge_data.target_id])
+    if edge_data.source_id not in names:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Source node {edge_data.source_id} not found",
         )
 
-    target = await graph_service.get_node(edge_data.target_id)
-    if not target:
+    if edge_data.target_id not in names:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Target node {edge_data.target_id} not found",
         )
 
     edge = await graph_service.create_edge(edge_data)
+    if edge is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Edge '{edge_data.relation_type}' from node {edge_data.source_id} "
+                f"to node {edge_data.target_id} already exists"
+            ),
+        )
 
     return EdgeResponse(
         id=edge.id,
         source_id=edge.source_id,
         target_id=edge.target_id,
-        source_name=source.name,
-        target_name=target.name,
+        source_name=names[edge_data.source_id],
+        target_name=names[edge_data.target_id],
         relation_type=edge.relation_type,
         properties=edge.properties,
         weight=edge.weight,
@@ -186,7 +231,7 @@ async def create_edge(
 
 @router.get(
     "/edges",
-    response_model=EdgeListResponse,
+    responses={200: {"model": EdgeListResponse}},
     summary="List edges",
     description="List all edges with optional filtering.",
 )
@@ -198,36 +243,17 @@ async def list_edges(
     relation_type: Optional[str] = Query(None, description="Filter by relation type"),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
-) -> EdgeListResponse:
+) -> Response:
     """
     List edges with optional filtering.
     """
     graph_service = GraphService(db)
-    edges, total = await graph_service.list_edges(
-        skip=skip,
-        limit=limit,
-        source_id=source_id,
-        target_id=target_id,
-        relation_type=relation_type,
-    )
-
-    edge_responses = []
-    for edge in edges:
-        edge_responses.append(
-            EdgeResponse(
-                id=edge.id,
-                source_id=edge.source_id,
-                target_id=edge.target_id,
-                source_name=edge.source_node.name if edge.source_node else None,
-                target_name=edge.target_node.name if edge.target_node else None,
-                relation_type=edge.relation_type,
-                properties=edge.properties,
-                weight=edge.weight,
-                created_at=edge.created_at,
-            )
-        )
+    filters = dict(source_id=source_id, target_id=target_id, relation_type=relation_type)
+    total = await graph_service.count_edges(**filters)
+    edges = graph_service.stream_edges(skip=skip, limit=limit, **filters)
 
-    return EdgeListResponse(edges=edge_responses, total=total)
+    body = await _list_body("edges", edges, _edge_payload, total)
+    return Response(body, media_type="application/json")
 
 
 @router.get(
@@ -289,15 +315,16 @@ async def delete_edge(
 
 @router.post(
     "/query/impact",
-    response_model=ImpactResponse,
+    responses={200: {"model": ImpactResponse}},
     summary="Impact analysis",
     description="Find all nodes impacted by a given node going down.",
+    openapi_extra=json_body_openapi(ImpactQuery),
 )
 async def query_impact(
-    query: ImpactQuery,
+    query: SimpleNamespace = Depends(compiled_json_body(ImpactQuery)),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
-) -> ImpactResponse:
+) -> ORJSONResponse:
     """
     Analyze the impact of a node going down.
 
@@ -309,6 +336,12 @@ async def query_impact(
     """
     graph_service = GraphService(db)
 
+    if not query.node_id and not query.node_name:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Either node_id or node_name is required",
+        )
+
     # Resolve node_id from name if provided
     if query.node_name and not query.node_id:
         node = await graph_service.get_node_by_name(query.node_name)
@@ -325,22 +358,24 @@ async def query_impact(
             max_depth=query.max_depth,
             relation_types=query.relation_types,
         )
-        return result
+        # Already a validated model: serialize directly, skipping response_model
+        return ORJSONResponse(result.model_dump())
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.post(
     "/query/path",
-    response_model=PathResponse,
+    responses={200: {"model": PathResponse}},
     summary="Find path",
     description="Find the shortest path between two nodes.",
+    openapi_extra=json_body_openapi(PathQuery),
 )
 async def query_path(
-    query: PathQuery,
+    query: SimpleNamespace = Depends(compiled_json_body(PathQuery)),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
-) -> PathResponse:
+) -> ORJSONResponse:
     """
     Find the shortest path between two nodes.
 
@@ -357,14 +392,14 @@ async def query_path(
             relation_types=query.relation_types,
             top_k=query.top_k or 3,
         )
-        return result
+        return ORJSONResponse(result.model_dump())
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.get(
     "/query/search",
-    response_model=SearchResponse,
+    responses={200: {"model": SearchResponse}},
     summary="Search nodes",
     description="Search nodes by name and/or type.",
 )
@@ -374,7 +409,7 @@ async def search_nodes(
     limit: int = Query(50, ge=1, le=500, description="Maximum results"),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
-) -> SearchResponse:
+) -> ORJSONResponse:
     """
     Search nodes by name and/or type.
 
@@ -383,6 +418,6 @@ async def search_nodes(
     graph_service = GraphService(db)
     nodes = await graph_service.search_nodes(name=name, node_type=type, limit=limit)
 
-    return SearchResponse(
-        nodes=[NodeResponse.model_validate(n) for n in nodes], total=len(nodes)
+    return ORJSONResponse(
+        {"nodes": [dict(n) for n in nodes], "total": len(nodes)}
     )
@@ -1,20 +1,79 @@
 """Health check endpoints"""
 
+import asyncio
+import time
+from typing import Tuple
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 
-from app.database import check_db_connection
+from app.auth import verify_api_key
+from app.config import settings
+from app.database import check_db_connection, engine
 from app.models.schemas import HealthResponse
 
 router = APIRouter(tags=["Health"])
 
+# How long a database probe result is reused (load balancers poll often)
+DB_STATUS_TTL_SECONDS = 1.0
+
+# Response bodies for each database status, serialized once
+_HEALTH_PAYLOADS = {
+    db_status: HealthResponse(status="healthy", database=db_status, version="0.1.0").model_dump()
+    for db_status in ("connected", "disconnected")
+}
+
+# (checked_at, status) of the last database probe
+_db_status: Tuple[float, str] = (0.0, "disconnected")
+_db_status_lock = asyncio.Lock()
+
+
+async def _get_db_status() -> str:
+    """Return the database status, probing at most once per TTL."""
+    global _db_status
+
+    checked_at, db_status = _db_status
+    if time.monotonic() - checked_at < DB_STATUS_TTL_SECONDS:
+        return db_status
+
+    async with _db_status_lock:
+        # Another request may have refreshed it while we waited
+        checked_at, db_status = _db_status
+        if time.monotonic() - checked_at < DB_STATUS_TTL_SECONDS:
+            return db_status
+
+        db_status = "connected" if await check_db_connection() else "disconnected"
+        _db_status = (time.monotonic(), db_status)
+        return db_status
+
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check() -> ORJSONResponse:
     """
     Health check endpoint.
 
     Returns the health status of the application and database connection.
+    The database probe is cached for ``DB_STATUS_TTL_SECONDS``.
+    """
+    return ORJSONResponse(_HEALTH_PAYLOADS[await _get_db_status()])
+
+
+@router.get("/debug/pool", summary="Connection pool status")
+async def pool_status(_: str = Depends(verify_api_key)) -> ORJSONResponse:
     """
-    db_status = "connected" if await check_db_connection() else "disconnected"
+    Report database connection pool usage.
 
-    return HealthResponse(status="healthy", database=db_status, version="0.1.0")
+    Useful for sizing ``DB_POOL_SIZE`` / ``DB_MAX_OVERFLOW`` against the
+    observed ingestion concurrency.
+    """
+    pool = engine.pool
+    return ORJSONResponse(
+        {
+            "pool_class": type(pool).__name__,
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.db_max_overflow,
+        }
+    )
@@ -1,11 +1,18 @@
 """Ingestion API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.auth import verify_api_key
-from app.models.schemas import IngestTextRequest, IngestUrlRequest, IngestResponse
+from app.models.schemas import (
+    IngestTextRequest,
+    IngestUrlRequest,
+    IngestUrlsBatchRequest,
+    IngestResponse,
+    IngestBatchResponse,
+)
 from app.services.ingestion import IngestionService
 
 router = APIRouter(prefix="/ingest", tags=["Ingestion"])
@@ -45,6 +52,65 @@ async def ingest_text(
         )
 
 
+@router.post(
+    "/text-stream",
+    response_model=IngestResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Ingest raw text (streamed body)",
+    description="Ingest a UTF-8 text body (text/plain or application/octet-stream) without JSON wrapping.",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/plain": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def ingest_text_stream(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_api_key),
+) -> IngestResponse:
+    """
+    Ingest raw text sent as the request body.
+
+    The body is read chunk by chunk into one buffer, capped at
+    ``MAX_REQUEST_SIZE_BYTES`` (this also covers chunked uploads without a
+    Content-Length), and passed to extraction without a JSON/Pydantic
+    round-trip.
+    """
+    buffer = bytearray()
+    async for chunk in request.stream():
+        buffer += chunk
+        if len(buffer) > settings.max_request_size_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Request payload too large",
+            )
+
+    try:
+        text = buffer.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be UTF-8 text"
+        )
+    del buffer
+    if not text.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Body must not be empty"
+        )
+
+    try:
+        ingestion_service = IngestionService(db)
+        return await ingestion_service.ingest_raw_text(text)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process text: {str(e)}",
+        )
+
+
 @router.post(
     "/url",
     response_model=IngestResponse,
@@ -77,3 +143,34 @@ async def ingest_url(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process URL: {str(e)}",
         )
+
+
+@router.post(
+    "/urls",
+    response_model=IngestBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Ingest from several URLs",
+    description="Scrape several URLs concurrently and extract entities/relations from each.",
+)
+async def ingest_urls(
+    request: IngestUrlsBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_api_key),
+) -> IngestBatchResponse:
+    """
+    Scrape a batch of URLs and extract entities and relations from each page.
+
+    Pages are fetched concurrently (up to ``max_concurrency`` at a time).
+    URLs that cannot be scraped are listed under ``failed``; the rest are
+    ingested exactly like ``POST /ingest/url``.
+    """
+    try:
+        ingestion_service = IngestionService(db)
+        return await ingestion_service.ingest_urls_batch(request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process URLs: {str(e)}",
+        )
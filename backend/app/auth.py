@@ -1,11 +1,14 @@
 """API Key authentication middleware"""
 
+import hmac
 from typing import Optional
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader
-from app.config import get_settings
+from app.config import settings
 
-settings = get_settings()
+
+# Expected key, encoded once for constant-time comparison
+_EXPECTED_API_KEY = settings.api_key.encode()
 
 # API Key header scheme
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -30,7 +33,7 @@ async def verify_api_key(api_key: Optional[str] = Security(api_key_header)) -> s
             detail="API Key is required. Please provide X-API-Key header.",
         )
 
-    if api_key != settings.api_key:
+    if not hmac.compare_digest(api_key.encode(), _EXPECTED_API_KEY):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API Key.",
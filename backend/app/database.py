@@ -1,13 +1,15 @@
 """Database connection and session management"""
 
-from typing import AsyncGenerator
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Sequence, Tuple
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy import text, Executable
 
-from app.config import get_settings
+from app.config import settings
 
-settings = get_settings()
 
 # Convert postgresql:// to postgresql+asyncpg:// for async support
 database_url = settings.database_url
@@ -16,15 +18,34 @@ if database_url.startswith("postgresql://"):
 elif database_url.startswith("postgres://"):
     database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
 
+# asyncpg keeps prepared statements per connection; size the caches so hot
+# queries are reused across requests served by the same pooled connection.
+connect_args = {}
+if database_url.startswith("postgresql+asyncpg://"):
+    connect_args = {"statement_cache_size": 1024, "prepared_statement_cache_size": 512}
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize JSON/JSONB column values with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    connect_args=connect_args,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
 )
 
+# Liveness probe statement, built once
+_PING = text("SELECT 1")
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -54,20 +75,40 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def init_db() -> None:
-    """Initialize database tables"""
-    async with engine.begin() as conn:
-        # Import models to register them with Base
-        from app.models.db_models import Node, Edge, Document
+async def warm_db_pool(
+    statements: Sequence[Tuple[Executable, Dict[str, Any]]] = (),
+) -> None:
+    """
+    Open ``DB_POOL_WARM_CONNECTIONS`` pooled connections at startup.
+
+    Schema changes are applied by Alembic at deploy time (``alembic upgrade
+    head``), so serving processes only need warm connections. On Postgres,
+    ``statements`` are also run once per connection so asyncpg has them
+    prepared (and planned) before the first request needs them.
+
+    Args:
+        statements: (statement, parameters) pairs to prepare; the parameters
+            should match no rows
+    """
+    if engine.dialect.name != "postgresql":
+        statements = ()
+
+    async def warm_connection() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(_PING)
+            for statement, params in statements:
+                await conn.execute(statement, params)
 
-        await conn.run_sync(Base.metadata.create_all)
+    count = max(1, min(settings.db_pool_warm_connections, settings.db_pool_size))
+    # Held concurrently, so each one checks out a distinct connection
+    await asyncio.gather(*(warm_connection() for _ in range(count)))
 
 
 async def check_db_connection() -> bool:
     """Check if database connection is healthy"""
     try:
-        async with async_session_maker() as session:
-            await session.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(_PING)
             return True
     except Exception:
         return False
@@ -1,21 +1,25 @@
 """FastAPI application entry point"""
 
+import re
 from contextlib import asynccontextmanager
-from pathlib import Path
-from fastapi import FastAPI, Request
+from pathlib import Path, PurePosixPath
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import Scope
 
-from app.config import get_settings
-from app.database import init_db
+from app.config import settings
+from app.database import warm_db_pool
 from app.api.health import router as health_router
 from app.api.ingest import router as ingest_router
 from app.api.graph import router as graph_router
+from app.services.graph import traversal_warmup
 from app.utils.logging_config import configure_logging
-from app.utils.rate_limit import RateLimiter, RateLimitMiddleware
-
-settings = get_settings()
+from app.utils.rate_limit import RateLimiter, RateLimitMiddleware, RedisRateLimiter
+from app.utils.request_size import RequestSizeLimitMiddleware
+from app.utils.url_scraper import close_http_client
 
 
 @asynccontextmanager
@@ -29,17 +33,18 @@ async def lifespan(app: FastAPI):
     configure_logging(settings.log_level)
     print("Starting up Graph-Enhanced RAG application...")
 
-    # Initialize database tables
+    # Warm the connection pool (schema is managed by Alembic migrations)
     try:
-        await init_db()
-        print("Database tables initialized successfully")
+        await warm_db_pool(traversal_warmup())
+        print("Database connection pool ready")
     except Exception as e:
-        print(f"Warning: Could not initialize database tables: {e}")
+        print(f"Warning: Could not connect to the database: {e}")
 
     yield
 
     # Shutdown
     print("Shutting down Graph-Enhanced RAG application...")
+    await close_http_client()
 
 
 # Create FastAPI application
@@ -61,50 +66,91 @@ All API endpoints require an API key passed in the `X-API-Key` header.
     """,
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
 
-# Payload size guard (before heavier middleware)
-@app.middleware("http")
-async def max_request_size_guard(request: Request, call_next):
-    if request.headers.get("content-length"):
-        try:
-            content_length = int(request.headers["content-length"])
-            if content_length > settings.max_request_size_bytes:
-                return JSONResponse(
-                    status_code=413,
-                    content={"detail": "Request payload too large"},
-                )
-        except ValueError:
-            pass
-    return await call_next(request)
-
-
 # Add CORS middleware
-cors_origins = (
-    ["*"]
-    if settings.cors_allow_origins.strip() == "*"
-    else [o.strip() for o in settings.cors_allow_origins.split(",") if o.strip()]
+cors_origins = tuple(
+    o.strip() for o in settings.cors_allow_origins.split(",") if o.strip()
+)
+if "*" in cors_origins and len(cors_origins) > 1:
+    raise ValueError("CORS_ALLOW_ORIGINS cannot mix '*' with explicit origins")
+
+# Long origin lists are matched with one precompiled regex
+cors_origin_regex = (
+    "^(" + "|".join(re.escape(o) for o in cors_origins) + ")$"
+    if len(cors_origins) > 8
+    else None
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=cors_origins,
+    allow_origins=() if cors_origin_regex else cors_origins,
+    allow_origin_regex=cors_origin_regex,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Concrete lists (instead of "*") match what the API and frontend use
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "X-API-Key"],
 )
 
 # Add rate limiting middleware
 if settings.rate_limit_enabled:
-    limiter = RateLimiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window_seconds,
+    limiter = (
+        RedisRateLimiter(
+            redis_url=settings.redis_url,
+            max_requests=settings.rate_limit_requests,
+            window_seconds=settings.rate_limit_window_seconds,
+        )
+        if settings.redis_url
+        else RateLimiter(
+            max_requests=settings.rate_limit_requests,
+            window_seconds=settings.rate_limit_window_seconds,
+        )
     )
     app.add_middleware(RateLimitMiddleware, limiter=limiter)
 
+# Payload size guard (added last, so it runs first)
+app.add_middleware(RequestSizeLimitMiddleware, max_bytes=settings.max_request_size_bytes)
+
+
+# Build output that must 404 when missing rather than load the SPA shell
+STATIC_ASSET_SUFFIXES = frozenset(
+    {
+        ".js", ".mjs", ".css", ".map", ".json", ".wasm",
+        ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp",
+        ".woff", ".woff2", ".ttf", ".otf",
+    }
+)
+
+
+class SPAStaticFiles(StaticFiles):
+    """Static files that fall back to index.html for client-side routes."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code != 404 or self._is_static_asset(path):
+                raise
+            return await super().get_response("index.html", scope)
+
+    @staticmethod
+    def _is_static_asset(path: str) -> bool:
+        """
+        Whether a missing path is a build file (e.g. a stale /assets/*.js)
+        rather than a client-side route, which may contain dots too
+        (``/users/john.doe``, ``/docs/v1.2``).
+        """
+        posix_path = PurePosixPath(Path(path).as_posix())
+        return (
+            posix_path.parts[:1] == ("assets",)
+            or posix_path.suffix.lower() in STATIC_ASSET_SUFFIXES
+        )
+
+
 # Include API routers
 app.include_router(health_router)
 app.include_router(ingest_router)
@@ -114,13 +160,8 @@ frontend_dist = Path(__file__).parent.parent.parent / "frontend" / "dist"
 print(f"Looking for frontend at: {frontend_dist}, exists: {frontend_dist.exists()}")
 if frontend_dist.exists():
     print(f"Frontend dist found, mounting static files")
-    app.mount("/assets", StaticFiles(directory=frontend_dist / "assets"), name="assets")
-
-    @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
-        file_path = frontend_dist / full_path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(file_path)
-        return FileResponse(frontend_dist / "index.html")
+    # One mount serves /assets and the SPA; registered after the API
+    # routers so they keep precedence
+    app.mount("/", SPAStaticFiles(directory=frontend_dist, html=True), name="spa")
 else:
     print(f"WARNING: Frontend dist not found at {frontend_dist}")
@@ -11,7 +11,10 @@ from app.models.schemas import (
     DocumentResponse,
     IngestTextRequest,
     IngestUrlRequest,
+    IngestUrlsBatchRequest,
     IngestResponse,
+    IngestFailure,
+    IngestBatchResponse,
     ImpactQuery,
     ImpactResponse,
     ImpactedNode,
@@ -37,7 +40,10 @@ __all__ = [
     "DocumentResponse",
     "IngestTextRequest",
     "IngestUrlRequest",
+    "IngestUrlsBatchRequest",
     "IngestResponse",
+    "IngestFailure",
+    "IngestBatchResponse",
     "ImpactQuery",
     "ImpactResponse",
     "ImpactedNode",
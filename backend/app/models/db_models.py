@@ -3,11 +3,39 @@
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import String, Text, Float, Integer, ForeignKey, DateTime, Index, JSON
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.database import Base
 
+# JSONB on Postgres, plain JSON elsewhere (e.g. the SQLite test database)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, for ``created_at`` server defaults.
+
+    ``now()`` on Postgres follows the session ``TimeZone``, which would mix
+    local times into the UTC values the columns have always held.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP is already UTC on SQLite
+    return "CURRENT_TIMESTAMP"
+
 
 class Document(Base):
     """Document model - stores source documents"""
@@ -20,12 +48,17 @@ class Document(Base):
         String(50), default="text"
     )  # 'text' or 'url'
     source_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    metadata_: Mapped[dict] = mapped_column("metadata", JSONB, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    metadata_: Mapped[dict] = mapped_column("metadata", JSONType, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow()
+    )
 
     # Relationships
     nodes: Mapped[List["Node"]] = relationship(
-        "Node", back_populates="source_document", lazy="selectin"
+        "Node",
+        back_populates="source_document",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -40,34 +73,41 @@ class Node(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
-    properties: Mapped[dict] = mapped_column(JSONB, default=dict)
+    properties: Mapped[dict] = mapped_column(JSONType, default=dict)
     source_document_id: Mapped[Optional[int]] = mapped_column(
         Integer, ForeignKey("documents.id", ondelete="SET NULL"), nullable=True
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow()
+    )
 
-    # Relationships
+    # Relationships (never loaded implicitly; eager-load at the query site)
     source_document: Mapped[Optional["Document"]] = relationship(
-        "Document", back_populates="nodes", lazy="selectin"
+        "Document", back_populates="nodes", lazy="raise_on_sql"
     )
     outgoing_edges: Mapped[List["Edge"]] = relationship(
         "Edge",
         foreign_keys="[Edge.source_id]",
         back_populates="source_node",
-        lazy="selectin",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     incoming_edges: Mapped[List["Edge"]] = relationship(
         "Edge",
         foreign_keys="[Edge.target_id]",
         back_populates="target_node",
-        lazy="selectin",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
     # Indexes
     __table_args__ = (
-        Index("idx_nodes_name", "name"),
+        Index("idx_nodes_name", "name", unique=True),
         Index("idx_nodes_type", "type"),
         Index("idx_nodes_name_type", "name", "type"),
+        # Newest-first listing, optionally filtered by type
+        Index("idx_nodes_created_at", "created_at"),
+        Index("idx_nodes_type_created_at", "type", "created_at"),
     )
 
     def __repr__(self) -> str:
@@ -87,22 +127,24 @@ class Edge(Base):
         Integer, ForeignKey("nodes.id", ondelete="CASCADE"), nullable=False
     )
     relation_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    properties: Mapped[dict] = mapped_column(JSONB, default=dict)
+    properties: Mapped[dict] = mapped_column(JSONType, default=dict)
     weight: Mapped[float] = mapped_column(Float, default=1.0)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow()
+    )
 
     # Relationships
     source_node: Mapped["Node"] = relationship(
         "Node",
         foreign_keys=[source_id],
         back_populates="outgoing_edges",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     target_node: Mapped["Node"] = relationship(
         "Node",
         foreign_keys=[target_id],
         back_populates="incoming_edges",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     # Indexes for efficient graph traversal
@@ -111,7 +153,27 @@ class Edge(Base):
         Index("idx_edges_target", "target_id"),
         Index("idx_edges_relation_type", "relation_type"),
         Index("idx_edges_source_target", "source_id", "target_id"),
-        Index("idx_edges_source_relation", "source_id", "relation_type"),
+        # One edge per (source, target, relation); ON CONFLICT target for inserts
+        Index(
+            "idx_edges_unique_relation",
+            "source_id",
+            "target_id",
+            "relation_type",
+            unique=True,
+        ),
+        # Covering indexes for the recursive CTE walks (index-only scans on Postgres)
+        Index(
+            "idx_edges_source_relation",
+            "source_id",
+            "relation_type",
+            postgresql_include=["target_id", "weight"],
+        ),
+        Index(
+            "idx_edges_target_relation",
+            "target_id",
+            "relation_type",
+            postgresql_include=["source_id", "weight"],
+        ),
     )
 
     def __repr__(self) -> str:
@@ -3,6 +3,7 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field, HttpUrl, ConfigDict
+from pydantic.json_schema import SkipJsonSchema
 
 
 # ==================== Health ====================
@@ -53,6 +54,9 @@ class ExtractionResult(BaseModel):
     relations: List[Relation] = Field(
         default_factory=list, description="Extracted relations"
     )
+    # Internal: set once LLM canonicalization has run, so later passes can
+    # skip the result. Kept out of the LLM format instructions and dumps.
+    canonicalized: SkipJsonSchema[bool] = Field(False, exclude=True)
 
 
 # ==================== Node (Entity in DB) ====================
@@ -179,6 +183,20 @@ class IngestUrlRequest(BaseModel):
     )
 
 
+class IngestUrlsBatchRequest(BaseModel):
+    """Request to ingest content from several URLs"""
+
+    urls: List[str] = Field(
+        ..., min_length=1, max_length=50, description="URLs to scrape"
+    )
+    max_concurrency: int = Field(
+        5, ge=1, le=20, description="Maximum URLs scraped at the same time"
+    )
+    metadata: Optional[Dict[str, Any]] = Field(
+        default_factory=dict, description="Metadata attached to every document"
+    )
+
+
 class IngestResponse(BaseModel):
     """Response after ingestion"""
 
@@ -190,13 +208,27 @@ class IngestResponse(BaseModel):
     message: str
 
 
+class IngestFailure(BaseModel):
+    """A URL that could not be ingested"""
+
+    url: str
+    error: str
+
+
+class IngestBatchResponse(BaseModel):
+    """Response after batch ingestion"""
+
+    results: List[IngestResponse]
+    failed: List[IngestFailure]
+
+
 # ==================== Query ====================
 
 
 class ImpactQuery(BaseModel):
     """Query for impact analysis"""
 
-    node_id: int = Field(..., description="Starting node ID")
+    node_id: Optional[int] = Field(None, description="Starting node ID")
     node_name: Optional[str] = Field(
         None, description="Starting node name (alternative to node_id)"
     )
@@ -2,25 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 from langchain.prompts import ChatPromptTemplate
 from langchain_community.chat_models import ChatOpenAI
 
-from app.config import get_settings
+from app.config import settings
 from app.models.schemas import ExtractionResult, Entity, Relation
+from app.services.llm_cache import cache_key, get_semantic_cache, llm_cache
+from app.utils.llm_limit import llm_limiter
 from app.utils.normalization import normalize_entity_type, normalize_relation_type
 
-settings = get_settings()
 
 CANONICALIZATION_PROMPT = """You are a data quality assistant for a knowledge graph system.
 Given extracted entities and relations, normalize entity types and relation types to a
 short, consistent vocabulary.
 
 Return JSON ONLY with this schema:
-{
-  "entities": [{"name": "...", "type": "..."}],
-  "relations": [{"source": "...", "target": "...", "relation_type": "..."}]
-}
+{{
+  "entities": [{{"name": "...", "type": "..."}}],
+  "relations": [{{"source": "...", "target": "...", "relation_type": "..."}}]
+}}
 
 Rules:
 - Keep entity names unchanged.
@@ -43,6 +46,7 @@ class CanonicalizationService:
         self.api_key = api_key or settings.openai_api_key
         self.model = model or settings.llm_model
         self._llm = None
+        self._chain = None
 
     @property
     def llm(self):
@@ -52,14 +56,22 @@ class CanonicalizationService:
             self._llm = ChatOpenAI(model=self.model, temperature=0, api_key=self.api_key)
         return self._llm
 
+    @property
+    def chain(self):
+        """Prompt | LLM runnable, built on first use and reused across calls"""
+        if self._chain is None:
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    ("system", "You normalize knowledge graph labels."),
+                    ("human", CANONICALIZATION_PROMPT),
+                ]
+            )
+            self._chain = prompt | self.llm
+        return self._chain
+
     async def canonicalize(self, extraction: ExtractionResult) -> ExtractionResult:
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", "You normalize knowledge graph labels."),
-                ("human", CANONICALIZATION_PROMPT),
-            ]
-        )
-        chain = prompt | self.llm
+        if extraction.canonicalized:
+            return extraction
 
         entities_payload = [
             {"name": e.name, "type": e.type} for e in extraction.entities
@@ -69,14 +81,28 @@ class CanonicalizationService:
             for r in extraction.relations
         ]
 
-        response = await chain.ainvoke(
-            {"entities": entities_payload, "relations": relations_payload}
-        )
+        payload = {"entities": entities_payload, "relations": relations_payload}
+        key = cache_key(self.model, CANONICALIZATION_PROMPT, payload)
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return ExtractionResult.model_validate({**cached, "canonicalized": True})
+
+        # Same labels in a different order/format (optional semantic cache);
+        # a hit is only used if it covers exactly the same names
+        semantic_cache = get_semantic_cache(f"canonicalization:{self.model}")
+        vector = None
+        if semantic_cache is not None:
+            hit, vector = await semantic_cache.lookup(orjson.dumps(payload).decode())
+            if hit is not None:
+                result = ExtractionResult.model_validate({**hit, "canonicalized": True})
+                if self._same_names(result, extraction):
+                    return result
+
+        async with llm_limiter:
+            response = await self.chain.ainvoke(payload)
 
         try:
-            import json
-
-            data = json.loads(response.content)
+            data = orjson.loads(response.content)
         except Exception:
             # Fallback to deterministic normalization if LLM output fails
             return self._deterministic_fallback(extraction)
@@ -103,9 +129,95 @@ class CanonicalizationService:
                     )
                 )
 
-        return ExtractionResult(entities=entities, relations=relations)
+        result = ExtractionResult(entities=entities, relations=relations, canonicalized=True)
+        await llm_cache.set(key, result.model_dump())
+        if semantic_cache is not None:
+            semantic_cache.store(vector, result.model_dump())
+        return result
+
+    @staticmethod
+    def _same_names(a: ExtractionResult, b: ExtractionResult) -> bool:
+        """Whether two results label the same entities and relation endpoints."""
+        return {e.name for e in a.entities} == {e.name for e in b.entities} and {
+            (r.source, r.target) for r in a.relations
+        } == {(r.source, r.target) for r in b.relations}
+
+    async def canonicalize_batch(
+        self, extractions: List[ExtractionResult]
+    ) -> List[ExtractionResult]:
+        """
+        Canonicalize several extraction results with a single LLM call.
+
+        Entity and relation labels from all results are deduplicated into one
+        payload, canonicalized together, and mapped back onto each result
+        (names, endpoints and properties are kept). Labels the LLM response
+        does not cover fall back to deterministic normalization. Results
+        that are already canonicalized are passed through untouched.
+
+        Args:
+            extractions: Extraction results to canonicalize
+
+        Returns:
+            Canonicalized results, in input order
+        """
+        pending = [extraction for extraction in extractions if not extraction.canonicalized]
+        if not pending:
+            return list(extractions)
+
+        entities: Dict[str, Entity] = {}
+        relations: Dict[Tuple[str, str, str], Relation] = {}
+        for extraction in pending:
+            for entity in extraction.entities:
+                entities.setdefault(entity.name, entity)
+            for relation in extraction.relations:
+                relations.setdefault(
+                    (relation.source, relation.target, relation.relation_type), relation
+                )
+
+        merged = ExtractionResult(entities=list(entities.values()), relations=list(relations.values()))
+        canonical = await self.canonicalize(merged)
+
+        entity_types = {entity.name: entity.type for entity in canonical.entities}
+        # The response lists relations in request order; trust a position only
+        # if its endpoints match
+        relation_types: Dict[Tuple[str, str, str], str] = {}
+        for key, relation in zip(relations, canonical.relations):
+            if (relation.source, relation.target) == key[:2]:
+                relation_types[key] = relation.relation_type
+
+        return [
+            extraction
+            if extraction.canonicalized
+            else ExtractionResult(
+                entities=[
+                    entity.model_copy(
+                        update={
+                            "type": entity_types.get(entity.name)
+                            or normalize_entity_type(entity.type)
+                        }
+                    )
+                    for entity in extraction.entities
+                ],
+                relations=[
+                    relation.model_copy(
+                        update={
+                            "relation_type": relation_types.get(
+                                (relation.source, relation.target, relation.relation_type)
+                            )
+                            or normalize_relation_type(relation.relation_type)
+                        }
+                    )
+                    for relation in extraction.relations
+                ],
+                canonicalized=canonical.canonicalized,
+            )
+            for extraction in extractions
+        ]
 
     def _deterministic_fallback(self, extraction: ExtractionResult) -> ExtractionResult:
+        if extraction.canonicalized:
+            return extraction
+
         entities = [
             Entity(
                 name=e.name,
@@ -0,0 +1,89 @@
+"""In-process entity name deduplication (exact + SimHash near-duplicates)."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from hashlib import blake2b
+from typing import Dict, List, Tuple
+
+from app.utils.normalization import normalize_entity_name
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def simhash(text: str, ngram: int = 3) -> int:
+    """
+    Compute a 64-bit SimHash over character n-gram shingles.
+
+    Args:
+        text: Normalized text to fingerprint
+        ngram: Shingle length
+
+    Returns:
+        64-bit fingerprint; similar strings differ in few bits
+    """
+    shingles = [text[i : i + ngram] for i in range(max(len(text) - ngram + 1, 1))]
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class ExactDedup:
+    """Map names to the first-seen spelling with the same normalized form."""
+
+    def __init__(self) -> None:
+        self.seen: Dict[str, str] = {}
+
+    def canonical(self, name: str) -> str:
+        """Return the representative name for ``name`` (registering it if new)."""
+        key = normalize_entity_name(name) or name
+        return self.seen.setdefault(key, name)
+
+
+class SimHashDedup:
+    """
+    Map names to the first-seen name whose SimHash is within ``max_distance`` bits.
+
+    Fingerprints are indexed by 16-bit bands; with four bands and a distance
+    of at most 3, any match shares at least one band, so lookups only compare
+    against that band's bucket.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_distance must be below {SIMHASH_BANDS}")
+        self.max_distance = max_distance
+        self.buckets: Dict[Tuple[int, int], List[Tuple[int, str]]] = defaultdict(list)
+        self.resolved: Dict[str, str] = {}
+
+    def canonical(self, name: str) -> str:
+        """Return the representative name for ``name`` (registering it if new)."""
+        if name in self.resolved:
+            return self.resolved[name]
+
+        fingerprint = simhash(normalize_entity_name(name) or name)
+        bands = [(i, fingerprint >> (i * BAND_BITS) & BAND_MASK) for i in range(SIMHASH_BANDS)]
+
+        match = name
+        candidates = [entry for band in bands for entry in self.buckets.get(band, ())]
+        for other_fingerprint, other_name in candidates:
+            if bin(fingerprint ^ other_fingerprint).count("1") <= self.max_distance:
+                match = other_name
+                break
+        else:
+            for band in bands:
+                self.buckets[band].append((fingerprint, name))
+
+        self.resolved[name] = match
+        return match
@@ -1,16 +1,32 @@
 """Entity and Relation Extraction Service using LangChain"""
 
-import json
-from typing import List, Optional
+import asyncio
+import re
+from functools import lru_cache
+from typing import List, Optional, Union
+
+import orjson
+from pydantic import TypeAdapter, ValidationError
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from langchain_community.chat_models import ChatOpenAI
 
-from app.config import get_settings
+from app.config import settings
 from app.models.schemas import Entity, Relation, ExtractionResult
+from app.services.llm_cache import cache_key, get_semantic_cache, llm_cache
+from app.utils.llm_limit import llm_limiter
 from app.utils.retry import retry_async
 
-settings = get_settings()
+# Markdown code fence wrapped around the JSON (```json ... ```)
+_CODE_FENCE = re.compile(r"^```(?:json)?|```$")
+
+# Outermost {...} span, for JSON surrounded by prose
+_JSON_OBJECT = re.compile(r"\{[\s\S]*\}")
+
+# Whole-list validators: one pydantic-core call per list instead of per item
+_ENTITY_LIST = TypeAdapter(List[Entity])
+_RELATION_LIST = TypeAdapter(List[Relation])
+
 
 # System prompt for entity/relation extraction
 EXTRACTION_PROMPT = """You are a knowledge graph expert. Your task is to extract entities and their relationships from the given text.
@@ -54,13 +70,19 @@ JSON Response:"""
 class ExtractionService:
     """Service for extracting entities and relations from text using LLM"""
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        concurrency_limit: int = 10,
+    ):
         """
         Initialize extraction service.
 
         Args:
             api_key: OpenAI API key (defaults to settings)
             model: LLM model to use (defaults to settings)
+            concurrency_limit: Maximum concurrent ``extract`` calls
         """
         self.api_key = api_key or settings.openai_api_key
         self.model = model or settings.llm_model
@@ -70,6 +92,11 @@ class ExtractionService:
 
         self._llm = None
         self._parser = PydanticOutputParser(pydantic_object=ExtractionResult)
+        # Prompt | LLM runnables, built on first use and reused across calls
+        self._chain = None
+        self._fallback_chain = None
+        # Bounds in-flight LLM calls to stay within provider rate limits
+        self._sem = asyncio.Semaphore(concurrency_limit)
 
     @property
     def llm(self):
@@ -92,31 +119,131 @@ class ExtractionService:
         Returns:
             ExtractionResult containing entities and relations
         """
-        # Use structured prompt for better results
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    "You are a knowledge graph expert. Extract entities and relationships from text.",
-                ),
-                ("human", STRUCTURED_EXTRACTION_PROMPT),
-            ]
+        key = cache_key(self.model, STRUCTURED_EXTRACTION_PROMPT, text)
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return ExtractionResult.model_validate(cached)
+
+        # Near-identical inputs (optional; off unless ENABLE_SEMANTIC_LLM_CACHE)
+        semantic_cache = get_semantic_cache(f"extraction:{self.model}")
+        vector = None
+        if semantic_cache is not None:
+            hit, vector = await semantic_cache.lookup(text)
+            if hit is not None:
+                return ExtractionResult.model_validate(hit)
+
+        async with self._sem:
+            try:
+                result = await self._extract_primary(text)
+            except Exception as e:
+                # Fallback: try simpler extraction
+                return await self._fallback_extract(text, str(e))
+
+        await self._cache_result(key, result)
+        if semantic_cache is not None and (result.entities or result.relations):
+            semantic_cache.store(vector, result.model_dump())
+        return result
+
+    async def _extract_primary(self, text: str) -> ExtractionResult:
+        """Run the primary chain (with retries) under the shared LLM limiter and parse the reply"""
+        chain = self._build_chain()
+
+        async def invoke():
+            async with llm_limiter:
+                return await chain.ainvoke({"text": text})
+
+        response = await retry_async(
+            invoke,
+            retries=2,
+            base_delay=0.5,
+            max_delay=2.0,
         )
+        return self._parse_response(response.content)
 
-        chain = prompt | self.llm
+    async def _cache_result(self, key: str, result: ExtractionResult) -> None:
+        """Cache a primary-chain result; empty (likely malformed) results are not kept."""
+        if result.entities or result.relations:
+            await llm_cache.set(key, result.model_dump())
 
-        try:
-            response = await retry_async(
-                lambda: chain.ainvoke({"text": text}),
-                retries=2,
-                base_delay=0.5,
-                max_delay=2.0,
+    def _build_chain(self):
+        """Get the primary extraction chain (structured prompt | LLM)"""
+        if self._chain is None:
+            # Use structured prompt for better results
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    (
+                        "system",
+                        "You are a knowledge graph expert. Extract entities and relationships from text.",
+                    ),
+                    ("human", STRUCTURED_EXTRACTION_PROMPT),
+                ]
             )
-            result = self._parse_response(response.content)
+            self._chain = prompt | self.llm
+        return self._chain
+
+    def _build_fallback_chain(self):
+        """Get the fallback chain (format-instructions prompt | LLM)"""
+        if self._fallback_chain is None:
+            prompt = ChatPromptTemplate.from_messages(
+                [
+                    (
+                        "system",
+                        "You are a knowledge graph expert. Extract entities and relationships.",
+                    ),
+                    ("human", EXTRACTION_PROMPT),
+                ]
+            ).partial(format_instructions=self._parser.get_format_instructions())
+            self._fallback_chain = prompt | self.llm
+        return self._fallback_chain
+
+    async def extract_many(
+        self, texts: List[str], max_concurrency: int = 10
+    ) -> List[Union[ExtractionResult, Exception]]:
+        """
+        Extract entities and relations from several texts in one batched call.
+
+        Cached results are served first; the misses are extracted
+        concurrently (up to ``max_concurrency``) with the same retry and
+        fallback handling as ``extract``, each LLM call entering the shared
+        limiter. Failures are isolated per text: a text that still fails gets
+        the exception in its slot instead of a result.
+
+        Args:
+            texts: Texts to extract from
+            max_concurrency: Maximum concurrent LLM requests
+
+        Returns:
+            ExtractionResult or Exception per input text, in input order
+        """
+        if not texts:
+            return []
+
+        keys = [cache_key(self.model, STRUCTURED_EXTRACTION_PROMPT, text) for text in texts]
+        cached = await asyncio.gather(*(llm_cache.get(key) for key in keys))
+        results: List[Union[ExtractionResult, Exception, None]] = [
+            ExtractionResult.model_validate(hit) if hit is not None else None for hit in cached
+        ]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+
+        batch_sem = asyncio.Semaphore(max_concurrency)
+
+        async def extract_miss(i: int) -> ExtractionResult:
+            async with batch_sem:
+                try:
+                    result = await self._extract_primary(texts[i])
+                except Exception as e:
+                    return await self._fallback_extract(texts[i], str(e))
+            await self._cache_result(keys[i], result)
             return result
-        except Exception as e:
-            # Fallback: try simpler extraction
-            return await self._fallback_extract(text, str(e))
+
+        extracted = await asyncio.gather(
+            *(extract_miss(i) for i in misses), return_exceptions=True
+        )
+        for i, result in zip(misses, extracted):
+            results[i] = result
+        return results
 
     async def _fallback_extract(
         self, text: str, original_error: str
@@ -133,25 +260,8 @@ class ExtractionService:
         """
         try:
             # Try with format instructions
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    (
-                        "system",
-                        "You are a knowledge graph expert. Extract entities and relationships.",
-                    ),
-                    ("human", EXTRACTION_PROMPT),
-                ]
-            )
-
-            chain = prompt | self.llm
-
-            response = await chain.ainvoke(
-                {
-                    "text": text,
-                    "format_instructions": self._parser.get_format_instructions(),
-                }
-            )
-
+            async with llm_limiter:
+                response = await self._build_fallback_chain().ainvoke({"text": text})
             return self._parse_response(response.content)
         except Exception:
             # Return empty result if all fails
@@ -167,78 +277,111 @@ class ExtractionService:
         Returns:
             Parsed ExtractionResult
         """
-        # Clean up the response
-        content = content.strip()
-
         # Remove markdown code blocks if present
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
+        content = _CODE_FENCE.sub("", content.strip()).strip()
 
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError:
             # Try to extract JSON from the response
-            import re
-
-            json_match = re.search(r"\{[\s\S]*\}", content)
+            json_match = _JSON_OBJECT.search(content)
             if json_match:
                 try:
-                    data = json.loads(json_match.group())
-                except json.JSONDecodeError:
+                    data = orjson.loads(json_match.group())
+                except orjson.JSONDecodeError:
                     return ExtractionResult(entities=[], relations=[])
             else:
                 return ExtractionResult(entities=[], relations=[])
 
-        # Parse entities
-        entities = []
-        for entity_data in data.get("entities", []):
-            try:
-                entity = Entity(
-                    name=entity_data.get("name", ""),
-                    type=entity_data.get("type", "unknown"),
-                    properties=entity_data.get("properties", {}),
-                )
-                if entity.name:  # Only add if name is not empty
-                    entities.append(entity)
-            except Exception:
-                continue
+        # A bare list or scalar carries no entities/relations keys
+        if not isinstance(data, dict):
+            return ExtractionResult(entities=[], relations=[])
 
-        # Parse relations
-        relations = []
-        for relation_data in data.get("relations", []):
-            try:
-                relation = Relation(
-                    source=relation_data.get("source", ""),
-                    target=relation_data.get("target", ""),
-                    relation_type=relation_data.get("relation_type", "related_to"),
-                    properties=relation_data.get("properties", {}),
-                )
-                if (
-                    relation.source and relation.target
-                ):  # Only add if both endpoints exist
-                    relations.append(relation)
-            except Exception:
-                continue
+        # Parse entities (only those with a name)
+        entities = _validate_items(
+            _ENTITY_LIST,
+            Entity,
+            [
+                {
+                    "name": entity_data["name"],
+                    "type": entity_data.get("type", "unknown"),
+                    "properties": entity_data.get("properties", {}),
+                }
+                for entity_data in data.get("entities", [])
+                if isinstance(entity_data, dict) and entity_data.get("name")
+            ],
+        )
+
+        # Parse relations (only those with both endpoints)
+        relations = _validate_items(
+            _RELATION_LIST,
+            Relation,
+            [
+                {
+                    "source": relation_data["source"],
+                    "target": relation_data["target"],
+                    "relation_type": relation_data.get("relation_type", "related_to"),
+                    "properties": relation_data.get("properties", {}),
+                }
+                for relation_data in data.get("relations", [])
+                if isinstance(relation_data, dict)
+                and relation_data.get("source")
+                and relation_data.get("target")
+            ],
+        )
 
         return ExtractionResult(entities=entities, relations=relations)
 
     async def extract_batch(self, texts: List[str]) -> List[ExtractionResult]:
         """
-        Extract entities and relations from multiple texts.
+        Extract entities and relations from multiple texts concurrently.
+
+        Extractions run in parallel, bounded by the service's concurrency
+        limit. A text whose extraction fails yields an empty result instead of
+        failing the batch.
 
         Args:
             texts: List of texts to process
 
         Returns:
-            List of ExtractionResults
+            List of ExtractionResults, in input order
         """
-        results = []
-        for text in texts:
-            result = await self.extract(text)
-            results.append(result)
-        return results
+        results = await asyncio.gather(
+            *(self.extract(text) for text in texts), return_exceptions=True
+        )
+        return [
+            result
+            if isinstance(result, ExtractionResult)
+            else ExtractionResult(entities=[], relations=[])
+            for result in results
+        ]
+
+
+def _validate_items(adapter: TypeAdapter, model: type, items: List[dict]) -> list:
+    """
+    Validate a list of item dicts, dropping the ones that fail.
+
+    The whole list is validated in one call; only when that fails are items
+    validated one by one to skip the malformed entries.
+    """
+    try:
+        return adapter.validate_python(items)
+    except ValidationError:
+        valid = []
+        for item in items:
+            try:
+                valid.append(model.model_validate(item))
+            except ValidationError:
+                continue
+        return valid
+
+
+@lru_cache(maxsize=1)
+def get_extraction_service() -> ExtractionService:
+    """
+    Get the process-wide extraction service.
+
+    The service (and the LLM client it lazily creates, with its pooled HTTP
+    connections) is built once and shared by all requests.
+    """
+    return ExtractionService()
@@ -1,9 +1,24 @@
 """Graph traversal service using PostgreSQL Recursive CTEs"""
 
-from typing import List, Optional, Tuple, Set
-from sqlalchemy import text
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Set
+from sqlalchemy import text, TextClause
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import (
+    select,
+    and_,
+    or_,
+    any_,
+    bindparam,
+    func,
+    literal_column,
+    Integer,
+    Row,
+    RowMapping,
+)
+from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.models.schemas import (
     NodeCreate,
@@ -17,11 +32,256 @@ from app.models.schemas import (
     PathResponse,
 )
 from app.models.db_models import Node, Edge
+from app.services.query_cache import (
+    GRAPH_DIRTY,
+    PENDING_NODE_IDS,
+    graph_query_cache,
+    node_id_cache,
+)
+from app.utils.normalization import normalize_entity_name, normalize_entity_type
+
+# Rows fetched per round-trip when streaming list pages
+STREAM_BATCH_SIZE = 200
+
+# Safety cap on the number of nodes an impact query returns
+IMPACT_MAX_ROWS = 10000
+
+# Columns returned by read-only node listings (plain rows, no ORM hydration)
+NODE_LIST_COLUMNS = (
+    Node.id,
+    Node.name,
+    Node.type,
+    Node.properties,
+    Node.source_document_id,
+    Node.created_at,
+)
+
+# Node ID list sent as a single (binary) array parameter: ``id = ANY(:ids)``
+_NODE_IDS = bindparam("ids", type_=ARRAY(Integer))
+
+
+def dialect_insert(db: AsyncSession, model: type) -> postgresql.Insert:
+    """INSERT construct for the session's dialect, which exposes ON CONFLICT."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+# Hot-path statements built once; values are passed as parameters on execute
+# so every call reuses the same construct (and its compiled form)
+_SELECT_NODE_BY_NAME = select(Node).where(Node.name == bindparam("name"))
+
+# Columns of the (source_id, target_id, relation_type) unique edge index
+EDGE_KEY_COLUMNS = (Edge.source_id, Edge.target_id, Edge.relation_type)
+
+# Rows per multi-row edge INSERT; keeps the bound parameters well under the
+# SQLite (32766) and Postgres (65535) per-statement limits
+EDGE_INSERT_BATCH_SIZE = 1000
+
+
+@lru_cache(maxsize=None)
+def _insert_node_query(dialect_name: str) -> postgresql.Insert:
+    """``INSERT ... ON CONFLICT (name) DO NOTHING RETURNING`` for one dialect."""
+    make_insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+    return (
+        make_insert(Node)
+        .on_conflict_do_nothing(index_elements=[Node.name])
+        .returning(Node)
+    )
+
+
+@lru_cache(maxsize=None)
+def _insert_edge_query(dialect_name: str) -> postgresql.Insert:
+    """``INSERT ... ON CONFLICT (source_id, target_id, relation_type) DO NOTHING RETURNING``."""
+    make_insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+    return (
+        make_insert(Edge)
+        .on_conflict_do_nothing(index_elements=EDGE_KEY_COLUMNS)
+        .returning(Edge)
+    )
+
+
+@lru_cache(maxsize=None)
+def _impact_query(filter_relations: bool) -> TextClause:
+    """
+    Build the recursive impact CTE once per statement shape.
+
+    Relation types are bound as an array parameter, so the SQL text only
+    varies with whether a filter is applied. Reusing the same text lets
+    SQLAlchemy's compiled cache and asyncpg's prepared statements kick in.
+
+    Each branch carries the IDs it has visited and never re-enters them, so
+    cycles terminate before ``max_depth``; the final ``DISTINCT ON`` keeps
+    one row per impacted node instead of one per path: the shallowest, with
+    ties broken on the path so the same graph always yields the same row.
+
+    Args:
+        filter_relations: Whether to restrict edges to ``:relation_types``
+
+    Returns:
+        Textual recursive CTE statement
+    """
+    relation_filter = "AND e.relation_type = ANY(:relation_types)" if filter_relations else ""
+    return text(f"""
+        WITH RECURSIVE impacted AS (
+            -- Base case: find nodes that directly depend on the source
+            SELECT 
+                e.target_id,
+                n.name,
+                n.type,
+                e.relation_type,
+                1 as depth,
+                ARRAY[n.name] as path,
+                ARRAY[e.source_id, e.target_id] as path_ids
+            FROM edges e
+            JOIN nodes n ON n.id = e.target_id
+            WHERE e.source_id = :node_id
+                AND e.target_id <> e.source_id {relation_filter}
+            
+            UNION
+            
+            -- Recursive case: find nodes that depend on the dependents
+            SELECT 
+                e.target_id,
+                n.name,
+                n.type,
+                e.relation_type,
+                i.depth + 1,
+                i.path || n.name,
+                i.path_ids || e.target_id
+            FROM edges e
+            JOIN impacted i ON e.source_id = i.target_id
+            JOIN nodes n ON n.id = e.target_id
+            WHERE i.depth < :max_depth
+                AND NOT e.target_id = ANY(i.path_ids) {relation_filter}
+        )
+        -- Node details are carried through the recursion, so no final join
+        SELECT id, name, type, relation_type, depth, path
+        FROM (
+            SELECT DISTINCT ON (i.target_id)
+                i.target_id as id,
+                i.name,
+                i.type,
+                i.relation_type,
+                i.depth,
+                i.path
+            FROM impacted i
+            -- Equal-depth paths tie-break on the path itself, then the relation
+            ORDER BY i.target_id, i.depth, i.path, i.relation_type
+        ) nearest
+        ORDER BY depth, name
+        LIMIT :max_rows
+    """)
+
+
+@lru_cache(maxsize=None)
+def _path_query(filter_relations: bool) -> TextClause:
+    """
+    Build the recursive path-search CTE once per statement shape.
+
+    Paths are ranked and cut to ``:top_k`` in SQL, so the node lookup for
+    each path only runs for the paths that are returned. Equally scored
+    paths are ordered by their node IDs, keeping the ranking deterministic.
+
+    Args:
+        filter_relations: Whether to restrict edges to ``:relation_types``
+
+    Returns:
+        Textual recursive CTE statement
+    """
+    relation_filter = "AND e.relation_type = ANY(:relation_types)" if filter_relations else ""
+    return text(f"""
+        WITH RECURSIVE path_search AS (
+            -- Base case: start from source
+            SELECT 
+                e.target_id,
+                e.relation_type,
+                1 as depth,
+                ARRAY[e.source_id, e.target_id] as path_ids,
+                ARRAY[e.relation_type] as relations,
+                e.weight as score
+            FROM edges e
+            WHERE e.source_id = :source_id {relation_filter}
+            
+            UNION ALL
+            
+            -- Recursive case: extend path
+            SELECT 
+                e.target_id,
+                e.relation_type,
+                ps.depth + 1,
+                ps.path_ids || e.target_id,
+                ps.relations || e.relation_type,
+                ps.score + e.weight
+            FROM edges e
+            JOIN path_search ps ON e.source_id = ps.target_id
+            WHERE ps.depth < :max_depth {relation_filter}
+            AND NOT (e.target_id = ANY(ps.path_ids))  -- Avoid cycles
+        )
+        -- Rank paths by average edge weight (then length) and keep the top_k
+        , top_paths AS (
+            SELECT
+                ps.path_ids,
+                ps.relations,
+                ps.depth,
+                ps.score
+            FROM path_search ps
+            WHERE ps.target_id = :target_id
+            ORDER BY ps.score / ps.depth DESC, ps.depth, ps.path_ids, ps.relations
+            LIMIT :top_k
+        )
+        -- Node names/types for each kept path, in path order, in the same statement
+        SELECT 
+            tp.path_ids,
+            tp.relations,
+            tp.depth,
+            tp.score,
+            pn.names,
+            pn.types
+        FROM top_paths tp
+        CROSS JOIN LATERAL (
+            SELECT
+                array_agg(n.name ORDER BY p.ord) as names,
+                array_agg(n.type ORDER BY p.ord) as types
+            FROM unnest(tp.path_ids) WITH ORDINALITY AS p(id, ord)
+            JOIN nodes n ON n.id = p.id
+        ) pn
+        ORDER BY tp.score / tp.depth DESC, tp.depth, tp.path_ids, tp.relations
+    """)
+
+
+def traversal_warmup() -> List[Tuple[TextClause, Dict[str, object]]]:
+    """
+    Every traversal statement shape, with parameters that match no rows.
+
+    Passed to ``warm_db_pool`` so the recursive CTEs are prepared on each
+    pooled connection at startup.
+    """
+    statements = []
+    for filter_relations in (False, True):
+        extra = {"relation_types": [""]} if filter_relations else {}
+        statements.append(
+            (
+                _impact_query(filter_relations),
+                {"node_id": -1, "max_depth": 1, "max_rows": 1, **extra},
+            )
+        )
+        statements.append(
+            (
+                _path_query(filter_relations),
+                {"source_id": -1, "target_id": -1, "max_depth": 1, "top_k": 1, **extra},
+            )
+        )
+    return statements
 
 
 class GraphService:
     """Service for graph operations using PostgreSQL Recursive CTEs"""
 
+    # Endpoints build one service per request; the session is the only state,
+    # and per-session caches live on ``db.info``.
+    __slots__ = ("db",)
+
     def __init__(self, db: AsyncSession):
         """
         Initialize graph service.
@@ -33,52 +293,155 @@ class GraphService:
 
     # ==================== Node Operations ====================
 
-    async def create_node(self, node_data: NodeCreate) -> Node:
+    async def create_node(self, node_data: NodeCreate) -> Optional[Node]:
         """
         Create a new node.
 
+        The row is inserted with ``ON CONFLICT (name) DO NOTHING RETURNING`` so
+        the name check, the insert and the generated columns share a single
+        round-trip.
+
         Args:
             node_data: Node creation data
 
         Returns:
-            Created node
+            Created node, or None if a node with the same name already exists
         """
-        node = Node(
+        stmt = _insert_node_query(self.db.get_bind().dialect.name)
+        params = {
+            "name": node_data.name,
+            "type": node_data.type,
+            "properties": node_data.properties or {},
+            "source_document_id": node_data.source_document_id,
+        }
+        node = (await self.db.execute(stmt, params)).scalar_one_or_none()
+        if node is not None:
+            self._node_ids_by_name[node.name] = node.id
+            self._mark_graph_dirty()
+        return node
+
+    async def upsert_node(self, node_data: NodeCreate) -> Tuple[Node, bool]:
+        """
+        Insert a node, or return the existing node with the same name.
+
+        On Postgres this is one statement: ``ON CONFLICT (name) DO UPDATE``
+        with a no-op assignment makes RETURNING yield the row in both cases,
+        and ``xmax = 0`` tells whether it was freshly inserted. Other
+        dialects fall back to ``create_node`` plus a lookup by name.
+
+        Args:
+            node_data: Node creation data (ignored for existing nodes)
+
+        Returns:
+            Tuple of (node, whether it was inserted)
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            # The conflicting row can be deleted before it is read back; the
+            # insert is then retried instead of returning no node
+            while True:
+                node = await self.create_node(node_data)
+                if node is not None:
+                    return node, True
+                existing = await self.get_node_by_name(node_data.name)
+                if existing is not None:
+                    return existing, False
+
+        insert_stmt = postgresql.insert(Node).values(
             name=node_data.name,
             type=node_data.type,
             properties=node_data.properties or {},
             source_document_id=node_data.source_document_id,
         )
-        self.db.add(node)
-        await self.db.flush()
-        await self.db.refresh(node)
-        return node
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Node.name],
+            set_={"name": insert_stmt.excluded.name},
+        ).returning(Node, literal_column("xmax = 0").label("inserted"))
+        node, inserted = (await self.db.execute(stmt)).one()
+
+        self._node_ids_by_name[node.name] = node.id
+        if inserted:
+            self._mark_graph_dirty()
+        return node, inserted
+
+    def _mark_graph_dirty(self) -> None:
+        """Invalidate cached traversal results when this transaction commits."""
+        self.db.info[GRAPH_DIRTY] = True
+
+    @property
+    def _node_ids_by_name(self) -> Dict[str, int]:
+        """
+        Name -> ID index for the current transaction.
+
+        Shared by every GraphService on this session and published to the
+        process-wide ``node_id_cache`` when the transaction commits.
+        """
+        return self.db.info.setdefault(PENDING_NODE_IDS, {})
+
+    def _cached_node_id(self, name: str) -> Optional[int]:
+        """Look a name up in the transaction index, then the process cache."""
+        node_id = self._node_ids_by_name.get(name)
+        return node_id if node_id is not None else node_id_cache.get(name)
 
     async def get_node(self, node_id: int) -> Optional[Node]:
         """
         Get a node by ID.
 
+        Nodes already loaded in this session are served from the identity map
+        without another SELECT.
+
         Args:
             node_id: Node ID
 
         Returns:
             Node if found, None otherwise
         """
-        result = await self.db.execute(select(Node).where(Node.id == node_id))
-        return result.scalar_one_or_none()
+        return await self.db.get(Node, node_id)
+
+    async def get_nodes_by_ids(self, node_ids: List[int]) -> Dict[int, str]:
+        """
+        Resolve several node IDs in a single query.
+
+        Only the ID and name columns are selected, which is enough for
+        existence checks and for labelling edge endpoints.
+
+        Args:
+            node_ids: Node IDs to look up
+
+        Returns:
+            Mapping of node ID to node name for the IDs that exist
+        """
+        result = await self.db.execute(
+            select(Node.id, Node.name).where(Node.id.in_(set(node_ids)))
+        )
+        return {row.id: row.name for row in result}
 
     async def get_node_by_name(self, name: str) -> Optional[Node]:
         """
         Get a node by name.
 
+        Names resolved earlier in this transaction, or committed by any
+        session in this process, are looked up by ID so the identity map (or
+        a primary-key fetch) can answer them.
+
         Args:
             name: Node name
 
         Returns:
             Node if found, None otherwise
         """
-        result = await self.db.execute(select(Node).where(Node.name == name))
-        return result.scalar_one_or_none()
+        node_id = self._cached_node_id(name)
+        if node_id is not None:
+            node = await self.db.get(Node, node_id)
+            if node is not None and node.name == name:
+                return node
+            self._node_ids_by_name.pop(name, None)
+            node_id_cache.discard(name)
+
+        result = await self.db.execute(_SELECT_NODE_BY_NAME, {"name": name})
+        node = result.scalar_one_or_none()
+        if node is not None:
+            self._node_ids_by_name[name] = node.id
+        return node
 
     async def find_node_by_normalized_name(self, normalized_name: str) -> Optional[Node]:
         """
@@ -93,8 +456,6 @@ class GraphService:
         result = await self.db.execute(select(Node).where(Node.name.ilike(f"%{token}%")))
         candidates = list(result.scalars().all())
 
-        from app.utils.normalization import normalize_entity_name
-
         for node in candidates:
             if normalize_entity_name(node.name) == normalized_name:
                 return node
@@ -110,10 +471,14 @@ class GraphService:
         limit: int = 50,
         node_type: Optional[str] = None,
         name_filter: Optional[str] = None,
-    ) -> Tuple[List[Node], int]:
+    ) -> Tuple[List[dict], int]:
         """
         List nodes with optional filtering.
 
+        The page and the total come back from one statement: ``COUNT(*)
+        OVER ()`` is evaluated over the filtered rows before OFFSET/LIMIT.
+        Only a page past the end needs a separate count.
+
         Args:
             skip: Number of records to skip
             limit: Maximum number of records to return
@@ -121,31 +486,53 @@ class GraphService:
             name_filter: Filter by name (partial match)
 
         Returns:
-            Tuple of (nodes, total count)
+            Tuple of (node rows as ``NODE_LIST_COLUMNS`` dicts, total count)
         """
-        query = select(Node)
-        count_query = select(Node)
+        query = select(*NODE_LIST_COLUMNS, func.count().over().label("total"))
+        conditions = self._node_filters(node_type, name_filter)
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = query.order_by(Node.created_at.desc()).offset(skip).limit(limit)
 
+        rows = (await self.db.execute(query)).mappings().all()
+        if rows:
+            total = rows[0]["total"]
+        elif skip:
+            total = await self.count_nodes(node_type=node_type, name_filter=name_filter)
+        else:
+            total = 0
+
+        nodes = [{column.key: row[column.key] for column in NODE_LIST_COLUMNS} for row in rows]
+        return nodes, total
+
+    def _node_filters(self, node_type: Optional[str], name_filter: Optional[str]) -> list:
+        """Build WHERE conditions shared by node listing and counting."""
         conditions = []
         if node_type:
             conditions.append(Node.type == node_type)
         if name_filter:
             conditions.append(Node.name.ilike(f"%{name_filter}%"))
+        return conditions
 
-        if conditions:
-            query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
+    async def count_nodes(
+        self, node_type: Optional[str] = None, name_filter: Optional[str] = None
+    ) -> int:
+        """
+        Count nodes matching the listing filters.
 
-        # Get total count
-        count_result = await self.db.execute(count_query)
-        total = len(count_result.all())
+        Args:
+            node_type: Filter by node type
+            name_filter: Filter by name (partial match)
 
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(Node.created_at.desc())
-        result = await self.db.execute(query)
-        nodes = list(result.scalars().all())
+        Returns:
+            Number of matching nodes
+        """
+        count_query = select(func.count()).select_from(Node)
+        conditions = self._node_filters(node_type, name_filter)
+        if conditions:
+            count_query = count_query.where(and_(*conditions))
 
-        return nodes, total
+        return (await self.db.execute(count_query)).scalar_one()
 
     async def delete_node(self, node_id: int) -> bool:
         """
@@ -160,13 +547,22 @@ class GraphService:
         node = await self.get_node(node_id)
         if not node:
             return False
+        self._node_ids_by_name.pop(node.name, None)
+        node_id_cache.discard(node.name)
         await self.db.delete(node)
+        await self.db.flush()
+        self._mark_graph_dirty()
         return True
 
     async def get_or_create_node(self, name: str, node_type: str = "unknown") -> Node:
         """
         Get existing node or create new one.
 
+        There is no separate exact-name SELECT: an exact match is returned by
+        the ``ON CONFLICT (name)`` upsert itself, so a miss costs the fuzzy
+        scan plus one atomic insert and concurrent callers cannot create
+        duplicates.
+
         Args:
             name: Node name
             node_type: Node type (for creation)
@@ -174,16 +570,15 @@ class GraphService:
         Returns:
             Existing or newly created node
         """
-        from app.utils.normalization import normalize_entity_name, normalize_entity_type
-
-        node = await self.get_node_by_name(name)
-        if not node:
-            normalized_name = normalize_entity_name(name)
-            node = await self.find_node_by_normalized_name(normalized_name)
+        if self._cached_node_id(name) is not None:
+            node = await self.get_node_by_name(name)
+            if node:
+                return node
+        node = await self.find_node_by_normalized_name(normalize_entity_name(name))
         if node:
             return node
         canonical_type = normalize_entity_type(node_type)
-        return await self.create_node(
+        node, _ = await self.upsert_node(
             NodeCreate(
                 name=name,
                 type=canonical_type,
@@ -193,31 +588,116 @@ class GraphService:
                 },
             )
         )
+        return node
+
+    async def bulk_upsert_nodes(self, rows: List[dict]) -> Tuple[Dict[str, int], int]:
+        """
+        Insert many nodes at once, keeping existing nodes with the same name.
+
+        New rows go in with a single multi-row ``INSERT ... ON CONFLICT (name)
+        DO NOTHING RETURNING id, name``; names that already existed (or were
+        inserted concurrently) are resolved with one follow-up SELECT.
+        Existing nodes are left untouched.
+
+        Args:
+            rows: Node column values (name, type, properties, source_document_id)
+
+        Returns:
+            Tuple of (name -> node ID for every row, number of nodes created)
+        """
+        if not rows:
+            return {}, 0
+
+        stmt = (
+            dialect_insert(self.db, Node)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Node.name])
+            .returning(Node.id, Node.name)
+        )
+        node_ids = {row.name: row.id for row in await self.db.execute(stmt)}
+        nodes_created = len(node_ids)
+
+        conflicted = [row["name"] for row in rows if row["name"] not in node_ids]
+        if conflicted:
+            result = await self.db.execute(
+                select(Node.id, Node.name).where(Node.name.in_(conflicted))
+            )
+            node_ids.update({row.name: row.id for row in result})
+
+        self._node_ids_by_name.update(node_ids)
+        if nodes_created:
+            self._mark_graph_dirty()
+        return node_ids, nodes_created
 
     # ==================== Edge Operations ====================
 
-    async def create_edge(self, edge_data: EdgeCreate) -> Edge:
+    async def create_edge(self, edge_data: EdgeCreate) -> Optional[Edge]:
         """
         Create a new edge.
 
+        The row is inserted with ``ON CONFLICT (source_id, target_id,
+        relation_type) DO NOTHING RETURNING`` so the duplicate check, the
+        insert and the generated columns share a single round-trip.
+
         Args:
             edge_data: Edge creation data
 
         Returns:
-            Created edge
-        """
-        edge = Edge(
-            source_id=edge_data.source_id,
-            target_id=edge_data.target_id,
-            relation_type=edge_data.relation_type,
-            properties=edge_data.properties or {},
-            weight=edge_data.weight or 1.0,
-        )
-        self.db.add(edge)
-        await self.db.flush()
-        await self.db.refresh(edge)
+            Created edge, or None if the same edge already exists
+        """
+        params = {
+            "source_id": edge_data.source_id,
+            "target_id": edge_data.target_id,
+            "relation_type": edge_data.relation_type,
+            "properties": edge_data.properties or {},
+            "weight": edge_data.weight or 1.0,
+        }
+        stmt = _insert_edge_query(self.db.get_bind().dialect.name)
+        edge = (await self.db.execute(stmt, params)).scalar_one_or_none()
+        if edge is not None:
+            self._mark_graph_dirty()
         return edge
 
+    async def bulk_create_edges(self, rows: Dict[Tuple[int, int, str], dict]) -> int:
+        """
+        Insert edges that do not exist yet.
+
+        Rows go in with multi-row ``INSERT ... ON CONFLICT (source_id,
+        target_id, relation_type) DO NOTHING RETURNING id``, at most
+        ``EDGE_INSERT_BATCH_SIZE`` rows per statement. The unique index makes
+        the duplicate check atomic, so concurrent ingests cannot both insert
+        the same edge.
+
+        Args:
+            rows: (source_id, target_id, relation_type) -> edge properties
+
+        Returns:
+            Number of edges created
+        """
+        values = [
+            {
+                "source_id": source_id,
+                "target_id": target_id,
+                "relation_type": relation_type,
+                "properties": properties,
+                "weight": 1.0,
+            }
+            for (source_id, target_id, relation_type), properties in rows.items()
+        ]
+
+        edges_created = 0
+        for start in range(0, len(values), EDGE_INSERT_BATCH_SIZE):
+            stmt = (
+                dialect_insert(self.db, Edge)
+                .values(values[start : start + EDGE_INSERT_BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=EDGE_KEY_COLUMNS)
+                .returning(Edge.id)
+            )
+            edges_created += len((await self.db.execute(stmt)).all())
+        if edges_created:
+            self._mark_graph_dirty()
+        return edges_created
+
     async def get_edge(self, edge_id: int) -> Optional[Edge]:
         """
         Get an edge by ID.
@@ -228,7 +708,11 @@ class GraphService:
         Returns:
             Edge if found, None otherwise
         """
-        result = await self.db.execute(select(Edge).where(Edge.id == edge_id))
+        result = await self.db.execute(
+            select(Edge)
+            .options(joinedload(Edge.source_node), joinedload(Edge.target_node))
+            .where(Edge.id == edge_id)
+        )
         return result.scalar_one_or_none()
 
     async def list_edges(
@@ -252,9 +736,18 @@ class GraphService:
         Returns:
             Tuple of (edges, total count)
         """
-        query = select(Edge)
-        count_query = select(Edge)
+        filters = dict(source_id=source_id, target_id=target_id, relation_type=relation_type)
+        total = await self.count_edges(**filters)
+        edges = [edge async for edge in self.stream_edges(skip=skip, limit=limit, **filters)]
+        return edges, total
 
+    def _edge_filters(
+        self,
+        source_id: Optional[int],
+        target_id: Optional[int],
+        relation_type: Optional[str],
+    ) -> list:
+        """Build WHERE conditions shared by edge listing and counting."""
         conditions = []
         if source_id:
             conditions.append(Edge.source_id == source_id)
@@ -262,21 +755,68 @@ class GraphService:
             conditions.append(Edge.target_id == target_id)
         if relation_type:
             conditions.append(Edge.relation_type == relation_type)
+        return conditions
+
+    async def count_edges(
+        self,
+        source_id: Optional[int] = None,
+        target_id: Optional[int] = None,
+        relation_type: Optional[str] = None,
+    ) -> int:
+        """
+        Count edges matching the listing filters.
 
+        Args:
+            source_id: Filter by source node ID
+            target_id: Filter by target node ID
+            relation_type: Filter by relation type
+
+        Returns:
+            Number of matching edges
+        """
+        count_query = select(func.count()).select_from(Edge)
+        conditions = self._edge_filters(source_id, target_id, relation_type)
         if conditions:
-            query = query.where(and_(*conditions))
             count_query = count_query.where(and_(*conditions))
 
-        # Get total count
-        count_result = await self.db.execute(count_query)
-        total = len(count_result.all())
+        return (await self.db.execute(count_query)).scalar_one()
 
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(Edge.created_at.desc())
-        result = await self.db.execute(query)
-        edges = list(result.scalars().all())
+    async def stream_edges(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        source_id: Optional[int] = None,
+        target_id: Optional[int] = None,
+        relation_type: Optional[str] = None,
+    ) -> AsyncIterator[Edge]:
+        """
+        Stream a page of edges (with both endpoints joined) through a server-side cursor.
 
-        return edges, total
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            source_id: Filter by source node ID
+            target_id: Filter by target node ID
+            relation_type: Filter by relation type
+
+        Yields:
+            Edges ordered by creation time, newest first
+        """
+        query = select(Edge)
+        conditions = self._edge_filters(source_id, target_id, relation_type)
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = (
+            query.options(joinedload(Edge.source_node), joinedload(Edge.target_node))
+            .offset(skip)
+            .limit(limit)
+            .order_by(Edge.created_at.desc())
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        result = await self.db.stream_scalars(query)
+        async for edge in result:
+            yield edge
 
     async def delete_edge(self, edge_id: int) -> bool:
         """
@@ -292,6 +832,7 @@ class GraphService:
         if not edge:
             return False
         await self.db.delete(edge)
+        self._mark_graph_dirty()
         return True
 
     # ==================== Graph Traversal ====================
@@ -306,6 +847,10 @@ class GraphService:
         Find all nodes impacted by a given node using Recursive CTE.
         This finds nodes that depend on the given node.
 
+        Results are served from the traversal cache until the graph changes
+        or the cache TTL expires; sessions with uncommitted graph writes
+        bypass it.
+
         Args:
             node_id: Starting node ID
             max_depth: Maximum traversal depth
@@ -314,57 +859,38 @@ class GraphService:
         Returns:
             ImpactResponse with list of impacted nodes
         """
+        key = ("impact", node_id, max_depth, tuple(relation_types or ()))
+        # Uncommitted writes in this session make both the cache and the
+        # result unrepresentative of the committed graph
+        dirty = self.db.info.get(GRAPH_DIRTY, False)
+        if not dirty:
+            cached = graph_query_cache.get(key)
+            if cached is not None:
+                return cached
+
+        version = graph_query_cache.version
+        response = await self._get_impacted_nodes(node_id, max_depth, relation_types)
+        if not dirty:
+            graph_query_cache.set(key, response, version)
+        return response
+
+    async def _get_impacted_nodes(
+        self,
+        node_id: int,
+        max_depth: int,
+        relation_types: Optional[List[str]],
+    ) -> ImpactResponse:
+        """Run the impact CTE (uncached); see ``get_impacted_nodes``."""
         # Get source node
         source_node = await self.get_node(node_id)
         if not source_node:
             raise ValueError(f"Node {node_id} not found")
 
-        # Build the relation type filter
-        relation_filter = ""
+        params = {"node_id": node_id, "max_depth": max_depth, "max_rows": IMPACT_MAX_ROWS}
         if relation_types:
-            relation_filter = f"AND e.relation_type = ANY(ARRAY{relation_types})"
-
-        # Recursive CTE query to find all dependent nodes
-        query = text(f"""
-            WITH RECURSIVE impacted AS (
-                -- Base case: find nodes that directly depend on the source
-                SELECT 
-                    e.target_id,
-                    e.relation_type,
-                    1 as depth,
-                    ARRAY[n.name] as path
-                FROM edges e
-                JOIN nodes n ON n.id = e.target_id
-                WHERE e.source_id = :node_id {relation_filter}
-                
-                UNION ALL
-                
-                -- Recursive case: find nodes that depend on the dependents
-                SELECT 
-                    e.target_id,
-                    e.relation_type,
-                    i.depth + 1,
-                    i.path || n.name
-                FROM edges e
-                JOIN impacted i ON e.source_id = i.target_id
-                JOIN nodes n ON n.id = e.target_id
-                WHERE i.depth < :max_depth {relation_filter}
-            )
-            SELECT 
-                i.target_id as id,
-                n.name,
-                n.type,
-                i.relation_type,
-                i.depth,
-                i.path
-            FROM impacted i
-            JOIN nodes n ON n.id = i.target_id
-            ORDER BY i.depth, n.name
-        """)
+            params["relation_types"] = list(relation_types)
 
-        result = await self.db.execute(
-            query, {"node_id": node_id, "max_depth": max_depth}
-        )
+        result = await self.db.execute(_impact_query(bool(relation_types)), params)
         rows = result.fetchall()
 
         # Build impacted nodes list
@@ -399,70 +925,62 @@ class GraphService:
         """
         Find path between two nodes using Recursive CTE.
 
+        Results are served from the traversal cache until the graph changes
+        or the cache TTL expires; sessions with uncommitted graph writes
+        bypass it.
+
         Args:
             source_id: Starting node ID
             target_id: Target node ID
             max_depth: Maximum search depth
             relation_types: Optional filter for relation types
+            top_k: Number of best-scoring paths to return
 
         Returns:
             PathResponse with path if found
         """
-        # Get source and target nodes
-        source_node = await self.get_node(source_id)
-        target_node = await self.get_node(target_id)
+        key = ("path", source_id, target_id, max_depth, tuple(relation_types or ()), top_k)
+        # Uncommitted writes in this session make both the cache and the
+        # result unrepresentative of the committed graph
+        dirty = self.db.info.get(GRAPH_DIRTY, False)
+        if not dirty:
+            cached = graph_query_cache.get(key)
+            if cached is not None:
+                return cached
+
+        version = graph_query_cache.version
+        response = await self._find_path(source_id, target_id, max_depth, relation_types, top_k)
+        if not dirty:
+            graph_query_cache.set(key, response, version)
+        return response
+
+    async def _find_path(
+        self,
+        source_id: int,
+        target_id: int,
+        max_depth: int,
+        relation_types: Optional[List[str]],
+        top_k: int,
+    ) -> PathResponse:
+        """Run the path-search CTE (uncached); see ``find_path``."""
+        # Source and target in one query
+        node_lookup = await self._path_nodes_by_id({source_id, target_id})
+        source_node = node_lookup.get(source_id)
+        target_node = node_lookup.get(target_id)
 
         if not source_node or not target_node:
             raise ValueError("Source or target node not found")
 
-        # Build the relation type filter
-        relation_filter = ""
+        params = {
+            "source_id": source_id,
+            "target_id": target_id,
+            "max_depth": max_depth,
+            "top_k": max(top_k, 1),
+        }
         if relation_types:
-            relation_filter = f"AND e.relation_type = ANY(ARRAY{relation_types})"
-
-        # Recursive CTE to find candidate paths
-        query = text(f"""
-            WITH RECURSIVE path_search AS (
-                -- Base case: start from source
-                SELECT 
-                    e.target_id,
-                    e.relation_type,
-                    1 as depth,
-                    ARRAY[e.source_id, e.target_id] as path_ids,
-                    ARRAY[e.relation_type] as relations,
-                    e.weight as score
-                FROM edges e
-                WHERE e.source_id = :source_id {relation_filter}
-                
-                UNION ALL
-                
-                -- Recursive case: extend path
-                SELECT 
-                    e.target_id,
-                    e.relation_type,
-                    ps.depth + 1,
-                    ps.path_ids || e.target_id,
-                    ps.relations || e.relation_type,
-                    ps.score + e.weight
-                FROM edges e
-                JOIN path_search ps ON e.source_id = ps.target_id
-                WHERE ps.depth < :max_depth {relation_filter}
-                AND NOT (e.target_id = ANY(ps.path_ids))  -- Avoid cycles
-            )
-            SELECT 
-                path_ids,
-                relations,
-                depth,
-                score
-            FROM path_search
-            WHERE target_id = :target_id
-            ORDER BY depth
-        """)
+            params["relation_types"] = list(relation_types)
 
-        result = await self.db.execute(
-            query,
-            {"source_id": source_id, "target_id": target_id, "max_depth": max_depth},
-        )
+        result = await self.db.execute(_path_query(bool(relation_types)), params)
         rows = result.fetchall()
 
         if not rows:
@@ -474,43 +992,18 @@ class GraphService:
                 found=False,
             )
 
-        # Fetch nodes once for efficient lookup
-        unique_ids: Set[int] = set()
-        for row in rows:
-            unique_ids.update(row.path_ids)
-
-        node_lookup = {}
-        if unique_ids:
-            node_rows = await self.db.execute(select(Node).where(Node.id.in_(unique_ids)))
-            node_lookup = {n.id: n for n in node_rows.scalars().all()}
-
-        # Score and sort paths
-        scored_paths = []
-        for row in rows:
-            avg_weight = row.score / row.depth if row.depth else 0.0
-            scored_paths.append(
-                {
-                    "path_ids": row.path_ids,
-                    "relations": row.relations,
-                    "depth": row.depth,
-                    "score": avg_weight,
-                }
-            )
-
-        scored_paths.sort(key=lambda p: (-p["score"], p["depth"]))
-        top_paths = scored_paths[: max(top_k, 1)]
-
+        # Rows arrive ranked and limited to top_k, with node names/types as
+        # parallel arrays, so no further sorting or lookups are needed
         path_results: List[PathResult] = []
-        for path in top_paths:
-            path_nodes = []
-            for node_id in path["path_ids"]:
-                node = node_lookup.get(node_id)
-                if node:
-                    path_nodes.append(PathNode(id=node.id, name=node.name, type=node.type))
+        for row in rows:
+            path_nodes = [
+                PathNode(id=node_id, name=name, type=node_type)
+                for node_id, name, node_type in zip(row.path_ids, row.names, row.types)
+            ]
 
             explanation_parts = []
             for i in range(len(path_nodes) - 1):
-                relation = path["relations"][i] if i < len(path["relations"]) else "related_to"
+                relation = row.relations[i] if i < len(row.relations) else "related_to"
                 explanation_parts.append(
                     f"{path_nodes[i].name} -[{relation}]-> {path_nodes[i + 1].name}"
                 )
@@ -519,9 +1012,9 @@ class GraphService:
             path_results.append(
                 PathResult(
                     path=path_nodes,
-                    relations=path["relations"],
-                    path_length=path["depth"],
-                    score=round(path["score"], 4),
+                    relations=row.relations,
+                    path_length=row.depth,
+                    score=round(row.score / row.depth, 4),
                     explanation=explanation,
                 )
             )
@@ -534,6 +1027,14 @@ class GraphService:
             found=True,
         )
 
+    async def _path_nodes_by_id(self, node_ids: Set[int]) -> Dict[int, Row]:
+        """Load (id, name, type) rows for several nodes with ``id = ANY(:ids)``."""
+        result = await self.db.execute(
+            select(Node.id, Node.name, Node.type).where(Node.id == any_(_NODE_IDS)),
+            {"ids": list(node_ids)},
+        )
+        return {row.id: row for row in result}
+
     async def get_node_dependencies(self, node_id: int) -> List[Edge]:
         """
         Get all edges where this node is the source (outgoing dependencies).
@@ -544,8 +1045,7 @@ class GraphService:
         Returns:
             List of outgoing edges
         """
-        result = await self.db.execute(select(Edge).where(Edge.source_id == node_id))
-        return list(result.scalars().all())
+        return [edge async for edge in self.stream_node_dependencies(node_id)]
 
     async def get_node_dependents(self, node_id: int) -> List[Edge]:
         """
@@ -557,15 +1057,48 @@ class GraphService:
         Returns:
             List of incoming edges
         """
-        result = await self.db.execute(select(Edge).where(Edge.target_id == node_id))
-        return list(result.scalars().all())
+        return [edge async for edge in self.stream_node_dependents(node_id)]
+
+    def stream_node_dependencies(self, node_id: int) -> AsyncIterator[Edge]:
+        """
+        Stream outgoing edges through a server-side cursor.
+
+        Hub nodes can have tens of thousands of edges; iterating this instead
+        of ``get_node_dependencies`` keeps memory at ``STREAM_BATCH_SIZE`` rows.
+
+        Args:
+            node_id: Node ID
+
+        Yields:
+            Outgoing edges
+        """
+        return self._stream_edges_where(Edge.source_id == node_id)
+
+    def stream_node_dependents(self, node_id: int) -> AsyncIterator[Edge]:
+        """
+        Stream incoming edges through a server-side cursor.
+
+        Args:
+            node_id: Node ID
+
+        Yields:
+            Incoming edges
+        """
+        return self._stream_edges_where(Edge.target_id == node_id)
+
+    async def _stream_edges_where(self, condition) -> AsyncIterator[Edge]:
+        """Yield edges matching ``condition`` in ``STREAM_BATCH_SIZE`` batches."""
+        query = select(Edge).where(condition).execution_options(yield_per=STREAM_BATCH_SIZE)
+        result = await self.db.stream_scalars(query)
+        async for edge in result:
+            yield edge
 
     async def search_nodes(
         self,
         name: Optional[str] = None,
         node_type: Optional[str] = None,
         limit: int = 50,
-    ) -> List[Node]:
+    ) -> List[RowMapping]:
         """
         Search nodes by name and/or type.
 
@@ -575,9 +1108,9 @@ class GraphService:
             limit: Maximum results
 
         Returns:
-            List of matching nodes
+            List of matching node rows (``NODE_LIST_COLUMNS``)
         """
-        query = select(Node)
+        query = select(*NODE_LIST_COLUMNS)
 
         conditions = []
         if name:
@@ -591,4 +1124,4 @@ class GraphService:
         query = query.limit(limit).order_by(Node.name)
 
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return list(result.mappings().all())
@@ -1,28 +1,33 @@
 """Document ingestion service"""
 
-from typing import Optional, List, Tuple
+import asyncio
+from typing import Dict, Optional, List, Set, Tuple
+from sqlalchemy import insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.schemas import (
     IngestTextRequest,
     IngestUrlRequest,
+    IngestUrlsBatchRequest,
     IngestResponse,
+    IngestFailure,
+    IngestBatchResponse,
     DocumentCreate,
     ExtractionResult,
+    Entity,
 )
-from app.models.db_models import Node, Edge, Document
-from app.services.extraction import ExtractionService
+from app.models.db_models import Node, Document
+from app.services.extraction import ExtractionService, get_extraction_service
 from app.services.graph import GraphService
 from app.services.canonicalization import CanonicalizationService
+from app.services.dedup import ExactDedup, SimHashDedup
 from app.utils.url_scraper import scrape_url
 from app.utils.normalization import (
     normalize_entity_name,
     normalize_entity_type,
     normalize_relation_type,
 )
-from app.config import get_settings
-
-settings = get_settings()
+from app.config import settings
 
 
 class IngestionService:
@@ -39,11 +44,20 @@ class IngestionService:
         self.graph_service = GraphService(db)
         self.extraction_service: Optional[ExtractionService] = None
         self.canonicalization_service: Optional[CanonicalizationService] = None
+        # Name -> node ID for every name resolved or created by this service
+        self._node_cache: Dict[str, int] = {}
+        # (source_id, target_id, relation_type) of every edge known to exist
+        self._edge_seen: Set[Tuple[int, int, str]] = set()
+        # Name dedup indexes, kept for the lifetime of the service
+        self._exact_dedup = ExactDedup()
+        self._near_dedup: Optional[SimHashDedup] = (
+            SimHashDedup() if settings.enable_near_duplicate_entities else None
+        )
 
     def _get_extraction_service(self) -> ExtractionService:
-        """Get or create extraction service"""
+        """Get the shared extraction service"""
         if self.extraction_service is None:
-            self.extraction_service = ExtractionService()
+            self.extraction_service = get_extraction_service()
         return self.extraction_service
 
     def _get_canonicalization_service(self) -> CanonicalizationService:
@@ -62,41 +76,34 @@ class IngestionService:
         Returns:
             IngestResponse with ingestion results
         """
-        # Create document record
-        document = Document(
-            content=request.text, source_type="text", metadata_=request.metadata or {}
-        )
-        self.db.add(document)
-        await self.db.flush()
-        await self.db.refresh(document)
+        return await self.ingest_raw_text(request.text, request.metadata)
 
-        # Extract entities and relations
-        extraction_service = self._get_extraction_service()
-        extraction_result = await extraction_service.extract(request.text)
-        extraction_result = self._deterministic_normalize(extraction_result)
+    async def ingest_raw_text(
+        self, text: str, metadata: Optional[dict] = None
+    ) -> IngestResponse:
+        """
+        Ingest text that has already been read and decoded.
 
-        if settings.enable_llm_canonicalization:
-            try:
-                canonicalizer = self._get_canonicalization_service()
-                extraction_result = await canonicalizer.canonicalize(extraction_result)
-            except Exception:
-                # Keep deterministic normalization on failures
-                pass
+        Used by ``ingest_text`` and by the streaming endpoint, which hands
+        over the body without building a request model around it.
 
-        # Create nodes and edges
-        nodes_created, edges_created = await self._create_graph_from_extraction(
-            extraction_result, document.id
-        )
+        Args:
+            text: Text to process
+            metadata: Additional document metadata
 
-        return IngestResponse(
-            document_id=document.id,
-            entities_extracted=len(extraction_result.entities),
-            relations_extracted=len(extraction_result.relations),
-            nodes_created=nodes_created,
-            edges_created=edges_created,
-            message=f"Successfully ingested document. Created {nodes_created} nodes and {edges_created} edges.",
+        Returns:
+            IngestResponse with ingestion results
+        """
+        document_id = await self._insert_document(
+            content=text, source_type="text", metadata=metadata
         )
 
+        # Extract entities and relations
+        extraction_service = self._get_extraction_service()
+        extraction_result = await extraction_service.extract(text)
+
+        return await self._ingest_extraction(document_id, extraction_result)
+
     async def ingest_url(self, request: IngestUrlRequest) -> IngestResponse:
         """
         Scrape URL and ingest content.
@@ -113,41 +120,145 @@ class IngestionService:
         except Exception as e:
             raise ValueError(f"Failed to scrape URL: {str(e)}")
 
-        # Create document record
-        document = Document(
+        document_id = await self._insert_document(
             content=scraped_content,
             source_type="url",
             source_url=request.url,
-            metadata_=request.metadata or {},
+            metadata=request.metadata,
         )
-        self.db.add(document)
-        await self.db.flush()
-        await self.db.refresh(document)
 
         # Extract entities and relations
         extraction_service = self._get_extraction_service()
         extraction_result = await extraction_service.extract(scraped_content)
-        extraction_result = self._deterministic_normalize(extraction_result)
 
-        if settings.enable_llm_canonicalization:
+        return await self._ingest_extraction(
+            document_id, extraction_result, source=" from URL"
+        )
+
+    async def ingest_urls_batch(self, request: IngestUrlsBatchRequest) -> IngestBatchResponse:
+        """
+        Scrape several URLs concurrently and ingest their content.
+
+        Scraping runs through ``asyncio.gather`` bounded by a semaphore of
+        ``request.max_concurrency``; graph writes then run one document at a
+        time on this service's session. LLM extraction for all pages is a
+        single batched call. A URL that fails to scrape or extract is reported
+        in ``failed`` without aborting the rest of the batch.
+
+        Args:
+            request: Batch URL ingestion request
+
+        Returns:
+            IngestBatchResponse with per-document results and failures
+        """
+        semaphore = asyncio.Semaphore(request.max_concurrency)
+
+        async def _scrape(url: str) -> str:
+            async with semaphore:
+                return await scrape_url(url)
+
+        scraped = await asyncio.gather(
+            *(_scrape(url) for url in request.urls), return_exceptions=True
+        )
+
+        failed: List[IngestFailure] = []
+        pages: List[Tuple[str, str]] = []
+        for url, content in zip(request.urls, scraped):
+            if isinstance(content, Exception):
+                failed.append(IngestFailure(url=url, error=f"Failed to scrape URL: {content}"))
+            elif not content.strip():
+                failed.append(IngestFailure(url=url, error="No content found at URL"))
+            else:
+                pages.append((url, content))
+
+        extraction_service = self._get_extraction_service()
+        extractions = await extraction_service.extract_many([content for _, content in pages])
+
+        extracted: List[Tuple[str, str, ExtractionResult]] = []
+        for (url, content), extraction_result in zip(pages, extractions):
+            if isinstance(extraction_result, Exception):
+                failed.append(
+                    IngestFailure(url=url, error=f"Failed to extract entities: {extraction_result}")
+                )
+            else:
+                extracted.append((url, content, extraction_result))
+
+        # One canonicalization pass (a single LLM call) for the whole batch
+        normalized = await self._normalize_extractions([result for _, _, result in extracted])
+
+        results: List[IngestResponse] = []
+        for (url, content, _), extraction_result in zip(extracted, normalized):
+            document_id = await self._insert_document(
+                content=content,
+                source_type="url",
+                source_url=url,
+                metadata=request.metadata,
+            )
+            results.append(
+                await self._ingest_extraction(
+                    document_id, extraction_result, source=" from URL", normalized=True
+                )
+            )
+
+        return IngestBatchResponse(results=results, failed=failed)
+
+    async def _normalize_extractions(
+        self, extractions: List[ExtractionResult]
+    ) -> List[ExtractionResult]:
+        """
+        Normalize extraction results, canonicalizing them together if enabled.
+
+        Args:
+            extractions: Raw extraction results
+
+        Returns:
+            Normalized results, in input order
+        """
+        normalized = [self._deterministic_normalize(result) for result in extractions]
+
+        if settings.enable_llm_canonicalization and normalized:
             try:
                 canonicalizer = self._get_canonicalization_service()
-                extraction_result = await canonicalizer.canonicalize(extraction_result)
+                normalized = await canonicalizer.canonicalize_batch(normalized)
             except Exception:
+                # Keep deterministic normalization on failures
                 pass
+        return normalized
+
+    async def _ingest_extraction(
+        self,
+        document_id: int,
+        extraction_result: ExtractionResult,
+        source: str = "",
+        normalized: bool = False,
+    ) -> IngestResponse:
+        """
+        Normalize an extraction result and write it to the graph.
+
+        Args:
+            document_id: Source document ID
+            extraction_result: Extraction result for the document
+            source: Suffix describing the source in the response message
+            normalized: Whether ``extraction_result`` is already normalized
+
+        Returns:
+            IngestResponse with ingestion results
+        """
+        if not normalized:
+            extraction_result = (await self._normalize_extractions([extraction_result]))[0]
 
         # Create nodes and edges
         nodes_created, edges_created = await self._create_graph_from_extraction(
-            extraction_result, document.id
+            extraction_result, document_id
         )
 
         return IngestResponse(
-            document_id=document.id,
+            document_id=document_id,
             entities_extracted=len(extraction_result.entities),
             relations_extracted=len(extraction_result.relations),
             nodes_created=nodes_created,
             edges_created=edges_created,
-            message=f"Successfully ingested document from URL. Created {nodes_created} nodes and {edges_created} edges.",
+            message=f"Successfully ingested document{source}. Created {nodes_created} nodes and {edges_created} edges.",
         )
 
     async def _create_graph_from_extraction(
@@ -156,6 +267,9 @@ class IngestionService:
         """
         Create nodes and edges from extraction result.
 
+        Nodes and edges are resolved and written in bulk, so the number of
+        round-trips does not grow with the number of entities or relations.
+
         Args:
             extraction: Extraction result with entities and relations
             document_id: Source document ID
@@ -163,94 +277,221 @@ class IngestionService:
         Returns:
             Tuple of (nodes_created, edges_created)
         """
-        nodes_created = 0
-        edges_created = 0
+        extraction = self._dedupe_names(extraction)
+        node_ids, nodes_created = await self._bulk_upsert_nodes(extraction, document_id)
 
-        # Create a mapping of entity name -> node
-        entity_nodes: dict = {}
+        # (source_id, target_id, relation_type) -> properties, first occurrence wins
+        edge_rows: Dict[Tuple[int, int, str], dict] = {}
+        for relation in extraction.relations:
+            key = (
+                node_ids[relation.source],
+                node_ids[relation.target],
+                normalize_relation_type(relation.relation_type),
+            )
+            if key not in self._edge_seen:
+                edge_rows.setdefault(key, relation.properties or {})
 
-        # Create nodes for entities
-        for entity in extraction.entities:
-            canonical_name = normalize_entity_name(entity.name)
-            canonical_type = normalize_entity_type(entity.type)
+        # Inserted or already present, these need no further existence checks
+        edges_created = await self.graph_service.bulk_create_edges(edge_rows)
+        self._edge_seen.update(edge_rows)
 
-            # Check if node already exists
-            existing_node = await self.graph_service.get_node_by_name(entity.name)
-            if not existing_node:
-                existing_node = await self.graph_service.find_node_by_normalized_name(
-                    canonical_name
-                )
-            if existing_node:
-                # Attach alias if new name is different
-                if entity.name != existing_node.name:
-                    aliases = existing_node.properties.get("aliases", [])
-                    if entity.name not in aliases:
-                        aliases.append(entity.name)
-                        existing_node.properties["aliases"] = aliases
-                entity_nodes[entity.name] = existing_node
-            else:
-                # Create new node
-                from app.models.schemas import NodeCreate
-
-                node = await self.graph_service.create_node(
-                    NodeCreate(
-                        name=entity.name,
-                        type=canonical_type,
-                        properties={
-                            **(entity.properties or {}),
-                            "canonical_name": canonical_name,
-                            "aliases": [entity.name]
-                            if entity.name != canonical_name
-                            else [],
-                        },
-                        source_document_id=document_id,
-                    )
-                )
-                entity_nodes[entity.name] = node
-                nodes_created += 1
+        return nodes_created, edges_created
 
-        # Create edges for relations
-        for relation in extraction.relations:
-            source_name = relation.source
-            target_name = relation.target
-
-            # Ensure both source and target nodes exist
-            if source_name not in entity_nodes:
-                source_node = await self.graph_service.get_or_create_node(source_name)
-                entity_nodes[source_name] = source_node
-                nodes_created += 1
-            else:
-                source_node = entity_nodes[source_name]
+    def _canonical_name(self, name: str) -> str:
+        """Map a name to its in-process representative (exact, then near-duplicate)."""
+        name = self._exact_dedup.canonical(name)
+        if self._near_dedup is not None:
+            name = self._near_dedup.canonical(name)
+        return name
 
-            if target_name not in entity_nodes:
-                target_node = await self.graph_service.get_or_create_node(target_name)
-                entity_nodes[target_name] = target_node
-                nodes_created += 1
-            else:
-                target_node = entity_nodes[target_name]
+    def _dedupe_names(self, extraction: ExtractionResult) -> ExtractionResult:
+        """
+        Collapse duplicate entity names before any database lookups.
 
-            # Check if edge already exists
-            existing_edges, _ = await self.graph_service.list_edges(
-                source_id=source_node.id,
-                target_id=target_node.id,
-                relation_type=normalize_relation_type(relation.relation_type),
+        Names that normalize to the same text (and, when enabled, names whose
+        SimHash is within 3 bits) are folded onto one representative. The
+        folded spellings are kept as aliases and relation endpoints are
+        rewritten to the representative.
+
+        Args:
+            extraction: Normalized extraction result
+
+        Returns:
+            Extraction result with one entity per representative name
+        """
+        entities: Dict[str, Entity] = {}
+        merged: Dict[str, List[str]] = {}
+        for entity in extraction.entities:
+            canonical = self._canonical_name(entity.name)
+            if canonical not in entities:
+                entities[canonical] = entity.model_copy(update={"name": canonical})
+                merged[canonical] = []
+            if entity.name != canonical and entity.name not in merged[canonical]:
+                merged[canonical].append(entity.name)
+
+        for canonical, names in merged.items():
+            if names:
+                entity = entities[canonical]
+                entity.properties = {**(entity.properties or {}), "aliases": names}
+
+        relations = [
+            relation.model_copy(
+                update={
+                    "source": self._canonical_name(relation.source),
+                    "target": self._canonical_name(relation.target),
+                }
             )
+            for relation in extraction.relations
+        ]
+        return ExtractionResult(entities=list(entities.values()), relations=relations)
+
+    async def _bulk_upsert_nodes(
+        self, extraction: ExtractionResult, document_id: int
+    ) -> Tuple[Dict[str, int], int]:
+        """
+        Resolve every entity and relation endpoint name to a node ID.
 
-            if not existing_edges:
-                # Create new edge
-                from app.models.schemas import EdgeCreate
-
-                await self.graph_service.create_edge(
-                    EdgeCreate(
-                        source_id=source_node.id,
-                        target_id=target_node.id,
-                        relation_type=normalize_relation_type(relation.relation_type),
-                        properties=relation.properties or {},
-                    )
+        Names already resolved by this service are served from ``_node_cache``.
+        The rest are matched exactly first, then by normalized name or alias;
+        normalized matches of extracted entities are recorded as aliases.
+        Whatever is left is inserted in one statement by
+        ``GraphService.bulk_upsert_nodes``.
+
+        Args:
+            extraction: Extraction result with entities and relations
+            document_id: Source document ID
+
+        Returns:
+            Tuple of (name -> node ID, number of nodes created)
+        """
+        # Row to insert per name; extracted entities win over bare relation endpoints
+        specs: Dict[str, dict] = {}
+        for entity in extraction.entities:
+            canonical_name = normalize_entity_name(entity.name)
+            specs.setdefault(
+                entity.name,
+                {
+                    "name": entity.name,
+                    "type": normalize_entity_type(entity.type),
+                    "properties": {
+                        **(entity.properties or {}),
+                        "canonical_name": canonical_name,
+                        "aliases": (entity.properties or {}).get("aliases", [])
+                        + ([entity.name] if entity.name != canonical_name else []),
+                    },
+                    "source_document_id": document_id,
+                },
+            )
+        entity_names = set(specs)
+        for relation in extraction.relations:
+            for name in (relation.source, relation.target):
+                specs.setdefault(
+                    name,
+                    {
+                        "name": name,
+                        "type": normalize_entity_type("unknown"),
+                        "properties": {
+                            "canonical_name": normalize_entity_name(name),
+                            "aliases": [],
+                        },
+                        "source_document_id": None,
+                    },
                 )
-                edges_created += 1
+        if not specs:
+            return {}, 0
+
+        # Names resolved by earlier documents handled by this service
+        node_ids: Dict[str, int] = {
+            name: self._node_cache[name] for name in specs if name in self._node_cache
+        }
+
+        # Exact, then normalized name / alias matches (one SELECT)
+        uncached = [name for name in specs if name not in node_ids]
+        if uncached:
+            for name, node in (await self._find_existing_nodes(uncached)).items():
+                node_ids[name] = node.id
+                if name in entity_names and name != node.name:
+                    self._add_alias(node, name)
+
+        # Insert the rest; names that normalize alike share the first one's row
+        new_rows: Dict[str, dict] = {}
+        row_for_name: Dict[str, str] = {}
+        for name, spec in specs.items():
+            if name in node_ids:
+                continue
+            key = normalize_entity_name(name) or name
+            row = new_rows.setdefault(key, spec)
+            if row is not spec and name in entity_names:
+                aliases = row["properties"]["aliases"]
+                if name not in aliases:
+                    aliases.append(name)
+            row_for_name[name] = row["name"]
+
+        if not new_rows:
+            self._node_cache.update(node_ids)
+            return node_ids, 0
+
+        inserted, nodes_created = await self.graph_service.bulk_upsert_nodes(
+            list(new_rows.values())
+        )
+        for name, row_name in row_for_name.items():
+            node_ids[name] = inserted[row_name]
+        self._node_cache.update(node_ids)
+        return node_ids, nodes_created
 
-        return nodes_created, edges_created
+    async def _find_existing_nodes(self, names: List[str]) -> Dict[str, Node]:
+        """
+        Match names to existing nodes with a single SELECT.
+
+        Exact-name matches are fetched together with fuzzy candidates (name
+        ILIKE the longest token of each normalized name, as in
+        ``GraphService.find_node_by_normalized_name``). Names without an
+        exact match are then matched in Python on normalized name or alias.
+
+        Args:
+            names: Names to resolve
+
+        Returns:
+            Mapping of name -> matching node
+        """
+        tokens = set()
+        for name in names:
+            normalized_name = normalize_entity_name(name)
+            if normalized_name:
+                tokens.add(max(normalized_name.split(), key=len))
+
+        conditions = [Node.name.in_(names), *(Node.name.ilike(f"%{t}%") for t in tokens)]
+        result = await self.db.execute(select(Node).where(or_(*conditions)))
+        candidates = list(result.scalars())
+
+        wanted_names = set(names)
+        matches: Dict[str, Node] = {
+            node.name: node for node in candidates if node.name in wanted_names
+        }
+
+        wanted: Dict[str, List[str]] = {}
+        for name in names:
+            normalized_name = normalize_entity_name(name)
+            if name not in matches and normalized_name:
+                wanted.setdefault(normalized_name, []).append(name)
+
+        for node in candidates:
+            if not wanted:
+                break
+            aliases = node.properties.get("aliases", []) if node.properties else []
+            for key in [normalize_entity_name(node.name), *map(normalize_entity_name, aliases)]:
+                for name in wanted.pop(key, []):
+                    matches[name] = node
+        return matches
+
+    @staticmethod
+    def _add_alias(node: Node, alias: str) -> None:
+        """Record an alias on a node; the dict is replaced so the change is flushed."""
+        properties = dict(node.properties or {})
+        aliases = list(properties.get("aliases", []))
+        if alias not in aliases:
+            properties["aliases"] = aliases + [alias]
+            node.properties = properties
 
     async def create_document(self, doc_data: DocumentCreate) -> Document:
         """
@@ -262,19 +503,48 @@ class IngestionService:
         Returns:
             Created document
         """
-        document = Document(
-            content=doc_data.content,
-            source_type=doc_data.source_type,
-            source_url=doc_data.source_url,
-            metadata_=doc_data.metadata or {},
+        result = await self.db.execute(
+            insert(Document)
+            .values(
+                content=doc_data.content,
+                source_type=doc_data.source_type,
+                source_url=doc_data.source_url,
+                metadata_=doc_data.metadata or {},
+            )
+            .returning(Document)
         )
-        self.db.add(document)
-        await self.db.flush()
-        await self.db.refresh(document)
-        return document
+        return result.scalar_one()
+
+    async def _insert_document(
+        self,
+        content: str,
+        source_type: str,
+        source_url: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> int:
+        """
+        Insert a document row and return its ID.
+
+        A single ``INSERT ... RETURNING id``; no ORM instance is tracked and
+        no refresh SELECT is needed.
+        """
+        result = await self.db.execute(
+            insert(Document)
+            .values(
+                content=content,
+                source_type=source_type,
+                source_url=source_url,
+                metadata_=metadata or {},
+            )
+            .returning(Document.id)
+        )
+        return result.scalar_one()
 
     def _deterministic_normalize(self, extraction: ExtractionResult) -> ExtractionResult:
         """Normalize entity and relation types deterministically."""
+        if extraction.canonicalized:
+            return extraction
+
         entities = []
         for entity in extraction.entities:
             if not entity.name:
@@ -0,0 +1,211 @@
+"""Response cache for deterministic (temperature=0) LLM calls."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from app.config import settings
+
+
+def cache_key(model: str, prompt: str, payload: Any) -> str:
+    """
+    Build a cache key from everything that determines the LLM output.
+
+    Args:
+        model: LLM model name
+        prompt: Prompt template text
+        payload: JSON-serializable prompt inputs
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = orjson.dumps(
+        {"model": model, "prompt": prompt, "payload": payload},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(material).hexdigest()
+
+
+class LRUBackend:
+    """In-process LRU storage with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class RedisBackend:
+    """Redis storage shared by all workers; values are stored as JSON."""
+
+    def __init__(self, redis_url: str, prefix: str = "llmcache:") -> None:
+        # Optional dependency: only needed when REDIS_URL is configured
+        from redis import asyncio as aioredis
+
+        self.redis = aioredis.from_url(redis_url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.redis.get(self.prefix + key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.redis.set(self.prefix + key, orjson.dumps(value), ex=max(int(ttl), 1))
+
+
+class LLMCache:
+    """
+    Cache of parsed LLM results keyed by ``cache_key``.
+
+    Values must be JSON-serializable (e.g. ``model_dump()`` output) so any
+    backend can hold them. Backend errors are treated as misses; the cache
+    never fails an LLM call.
+    """
+
+    def __init__(self, backend: Any, ttl_seconds: float, enabled: bool = True) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and ttl_seconds > 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on miss."""
+        if not self.enabled:
+            return None
+        try:
+            return await self.backend.get(key)
+        except Exception:
+            return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ``ttl`` seconds (defaults to the cache TTL)."""
+        if not self.enabled:
+            return
+        try:
+            await self.backend.set(key, value, ttl or self.ttl_seconds)
+        except Exception:
+            pass
+
+
+llm_cache = LLMCache(
+    backend=(
+        RedisBackend(settings.redis_url)
+        if settings.redis_url
+        else LRUBackend(max_entries=settings.llm_cache_max_entries)
+    ),
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    enabled=settings.llm_cache_enabled,
+)
+
+
+class SemanticLLMCache:
+    """
+    Nearest-neighbour cache keyed on input embeddings.
+
+    Catches near-identical inputs (whitespace changes, reordering) that the
+    exact ``cache_key`` misses: the query embedding is compared against all
+    stored embeddings with one matrix product and the closest entry is
+    reused when its cosine similarity reaches ``threshold``. Entries live in
+    process memory; the oldest are evicted beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        threshold: float = 0.94,
+        max_entries: int = 512,
+        ttl_seconds: float = 86400.0,
+    ) -> None:
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.vectors: Optional[np.ndarray] = None  # (N, dim), unit-normalized
+        self.expires_at: List[float] = []
+        self.values: List[Any] = []
+
+    async def lookup(self, text: str) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """
+        Find a cached value for text similar to ``text``.
+
+        Returns:
+            Tuple of (cached value or None, query embedding for a later
+            ``store``; None if embedding failed)
+        """
+        try:
+            vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+        except Exception:
+            return None, None
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None, None
+        vector /= norm
+
+        if self.vectors is None or not self.values:
+            return None, vector
+        scores = self.vectors @ vector
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold and self.expires_at[best] > time.monotonic():
+            return self.values[best], vector
+        return None, vector
+
+    def store(self, vector: Optional[np.ndarray], value: Any) -> None:
+        """Add an entry for an embedding returned by ``lookup``."""
+        if vector is None:
+            return
+        row = vector[np.newaxis, :]
+        self.vectors = row if self.vectors is None else np.vstack([self.vectors, row])
+        self.expires_at.append(time.monotonic() + self.ttl_seconds)
+        self.values.append(value)
+
+        overflow = len(self.values) - self.max_entries
+        if overflow > 0:
+            self.vectors = self.vectors[overflow:]
+            del self.expires_at[:overflow]
+            del self.values[:overflow]
+
+
+@lru_cache(maxsize=None)
+def get_semantic_cache(namespace: str) -> Optional[SemanticLLMCache]:
+    """
+    Get the semantic cache for one prompt/model namespace.
+
+    Returns None unless ``ENABLE_SEMANTIC_LLM_CACHE`` is set. Each namespace
+    (e.g. extraction vs canonicalization) keeps its own entries.
+    """
+    if not settings.enable_semantic_llm_cache or not settings.openai_api_key:
+        return None
+
+    from langchain_openai import OpenAIEmbeddings
+
+    return SemanticLLMCache(
+        embeddings=OpenAIEmbeddings(
+            model=settings.semantic_cache_embedding_model,
+            openai_api_key=settings.openai_api_key,
+        ),
+        threshold=settings.semantic_cache_threshold,
+        max_entries=settings.semantic_cache_max_entries,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+    )
@@ -0,0 +1,130 @@
+"""In-process caches for graph traversal results and node name lookups."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Session.info flag set by graph writes; consumed when the transaction ends
+GRAPH_DIRTY = "graph_dirty"
+
+# Session.info name -> node ID map for the current transaction
+PENDING_NODE_IDS = "node_ids_by_name"
+
+
+class GraphQueryCache:
+    """
+    TTL cache for impact/path results, tied to a graph version.
+
+    Any committed node/edge write bumps the version, which drops every cached
+    entry. Callers read ``version`` before running a query and pass it to
+    ``set``, so a result computed across a bump is never stored. The TTL
+    bounds staleness for writes committed by other processes, which this
+    process cannot observe.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 0
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value, or None on miss/expiry."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, version: int) -> None:
+        """
+        Store a value computed at ``version``, evicting the least recently used
+        entry when full. Values from an older version are dropped.
+        """
+        if not self.enabled or version != self.version:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def bump(self) -> None:
+        """Advance the graph version and drop every cached result."""
+        self.version += 1
+        self.entries.clear()
+
+
+class NodeIdCache:
+    """
+    LRU map of node name -> node ID shared by every session in the process.
+
+    Only IDs from committed transactions are published here. Entries are
+    hints: callers load the node by ID and check its name, so rows renamed
+    or deleted by another process are simply treated as a miss.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, int]" = OrderedDict()
+
+    def get(self, name: str) -> Optional[int]:
+        """Return the cached node ID, or None on miss."""
+        node_id = self.entries.get(name)
+        if node_id is not None:
+            self.entries.move_to_end(name)
+        return node_id
+
+    def update(self, node_ids: Dict[str, int]) -> None:
+        """Store several name -> ID pairs, evicting the least recently used."""
+        if self.max_entries <= 0:
+            return
+        for name, node_id in node_ids.items():
+            self.entries[name] = node_id
+            self.entries.move_to_end(name)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def discard(self, name: str) -> None:
+        """Forget a name (e.g. after its node is deleted)."""
+        self.entries.pop(name, None)
+
+
+graph_query_cache = GraphQueryCache(ttl_seconds=settings.graph_query_cache_ttl_seconds)
+node_id_cache = NodeIdCache(max_entries=settings.node_id_cache_max_entries)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_on_graph_write(session: Session) -> None:
+    """Bump the cache version once a transaction that wrote graph rows ends."""
+    if session.info.pop(GRAPH_DIRTY, False):
+        graph_query_cache.bump()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_node_ids(session: Session) -> None:
+    """Share the node IDs resolved by a committed transaction process-wide."""
+    pending = session.info.pop(PENDING_NODE_IDS, None)
+    if pending:
+        node_id_cache.update(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_node_ids(session: Session) -> None:
+    """Drop node IDs that may belong to rolled-back inserts."""
+    session.info.pop(PENDING_NODE_IDS, None)
@@ -0,0 +1,64 @@
+"""Process-wide limiter for outbound LLM requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.config import settings
+
+
+class LLMLimiter:
+    """
+    Cap concurrent LLM requests and, optionally, requests per minute.
+
+    Every chain call in the extraction and canonicalization services enters
+    this limiter, so concurrent ingests share one budget instead of each
+    bursting into provider 429s (and their retry backoff). The per-minute
+    cap is a token bucket refilled continuously; 0 disables it.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int = 0) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self._sem = asyncio.Semaphore(self.max_concurrency)
+        self._tokens = float(requests_per_minute)
+        self._refilled_at = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "LLMLimiter":
+        await self._sem.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._sem.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._sem.release()
+
+    async def _take_token(self) -> None:
+        """Wait until the per-minute budget allows one more request."""
+        if self.requests_per_minute <= 0:
+            return
+
+        rate = self.requests_per_minute / 60.0
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.requests_per_minute),
+                    self._tokens + (now - self._refilled_at) * rate,
+                )
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / rate)
+
+
+llm_limiter = LLMLimiter(
+    max_concurrency=settings.llm_concurrency,
+    requests_per_minute=settings.llm_requests_per_minute,
+)
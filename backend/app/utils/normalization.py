@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Dict
 
 ENTITY_TYPE_MAP: Dict[str, str] = {
@@ -53,18 +54,31 @@ RELATION_TYPE_MAP: Dict[str, str] = {
 }
 
 
+# ASCII characters other than [a-z0-9], whitespace, "_" and "-" become spaces
+_STRIP_TABLE = str.maketrans(
+    {
+        c: " "
+        for c in map(chr, range(128))
+        if not (c.isalnum() or c.isspace() or c in "_-")
+    }
+)
+_NON_WORD = re.compile(r"[^a-z0-9\s_-]")
+_SEPARATORS = re.compile(r"[\s_-]+")
+
+
 def normalize_text(value: str) -> str:
-    value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9\s_-]", " ", value)
-    value = re.sub(r"[_-]+", " ", value)
-    value = re.sub(r"\s+", " ", value)
-    return value.strip()
+    value = value.strip().lower().translate(_STRIP_TABLE)
+    if not value.isascii():
+        value = _NON_WORD.sub(" ", value)
+    return _SEPARATORS.sub(" ", value).strip()
 
 
 def normalize_entity_name(name: str) -> str:
     return normalize_text(name)
 
 
+# Type labels come from a small, repetitive vocabulary: memoize on raw input
+@lru_cache(maxsize=4096)
 def normalize_entity_type(entity_type: str) -> str:
     if not entity_type:
         return "unknown"
@@ -72,6 +86,7 @@ def normalize_entity_type(entity_type: str) -> str:
     return ENTITY_TYPE_MAP.get(key, key)
 
 
+@lru_cache(maxsize=4096)
 def normalize_relation_type(relation_type: str) -> str:
     if not relation_type:
         return "related_to"
@@ -1,36 +1,103 @@
-"""Simple in-memory rate limiting middleware."""
+"""Rate limiting middleware with in-memory or Redis-backed counters."""
 
 from __future__ import annotations
 
+import hashlib
 import time
-from collections import defaultdict, deque
-from typing import Deque, Dict
+from typing import Dict, List, Tuple
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+# Number of bucket dicts keys are spread across (power of two)
+RATE_LIMIT_SHARDS = 16
+
 
 class RateLimiter:
+    """
+    In-process token bucket per key.
+
+    Each key holds ``(tokens, last_refill)``: the bucket starts full at
+    ``max_requests`` and refills continuously at ``max_requests`` per
+    ``window_seconds``. Checks are O(1) and allocate nothing per request.
+
+    Buckets are spread over ``RATE_LIMIT_SHARDS`` dicts so each stays small
+    and can be swept on its own: one shard per ``window_seconds /
+    RATE_LIMIT_SHARDS`` drops keys idle for a full window (their bucket is
+    full again, same as a missing key), so memory tracks active clients
+    rather than every client ever seen. No locks are needed: ``is_allowed`` never
+    awaits, so it runs atomically on the event loop, and each worker
+    process has its own limiter (use ``RedisRateLimiter`` to share limits).
+    """
+
     def __init__(self, max_requests: int, window_seconds: int) -> None:
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.hits: Dict[str, Deque[float]] = defaultdict(deque)
+        self.refill_rate = max_requests / window_seconds
+        self._shards: List[Dict[str, Tuple[float, float]]] = [
+            {} for _ in range(RATE_LIMIT_SHARDS)
+        ]
+        self._sweep_interval = window_seconds / RATE_LIMIT_SHARDS
+        self._next_sweep = time.monotonic() + self._sweep_interval
+        self._sweep_cursor = 0
 
-    def is_allowed(self, key: str) -> bool:
-        now = time.time()
-        window_start = now - self.window_seconds
-        queue = self.hits[key]
+    def _sweep(self, now: float) -> None:
+        """Evict idle keys from the next shard in round-robin order."""
+        buckets = self._shards[self._sweep_cursor]
+        self._sweep_cursor = (self._sweep_cursor + 1) % RATE_LIMIT_SHARDS
+        self._next_sweep = now + self._sweep_interval
 
-        while queue and queue[0] < window_start:
-            queue.popleft()
+        idle_before = now - self.window_seconds
+        for key in [key for key, (_, last_refill) in buckets.items() if last_refill <= idle_before]:
+            del buckets[key]
 
-        if len(queue) >= self.max_requests:
+    async def is_allowed(self, key: str) -> bool:
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        buckets = self._shards[hash(key) & (RATE_LIMIT_SHARDS - 1)]
+        tokens, last_refill = buckets.get(key, (self.max_requests, now))
+        tokens = min(self.max_requests, tokens + (now - last_refill) * self.refill_rate)
+
+        if tokens < 1:
+            buckets[key] = (tokens, now)
             return False
 
-        queue.append(now)
+        buckets[key] = (tokens - 1, now)
         return True
 
 
+class RedisRateLimiter:
+    """
+    Fixed-window limiter shared by all workers through Redis.
+
+    Each window is one counter key updated with ``INCR`` + ``EXPIRE`` in a
+    single pipelined round-trip. If Redis is unreachable, requests are let
+    through rather than failing the API.
+    """
+
+    def __init__(self, redis_url: str, max_requests: int, window_seconds: int) -> None:
+        # Optional dependency: only needed when REDIS_URL is configured
+        from redis import asyncio as aioredis
+
+        self.redis = aioredis.from_url(redis_url)
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+
+    async def is_allowed(self, key: str) -> bool:
+        window = int(time.time() // self.window_seconds)
+        counter_key = f"ratelimit:{key}:{window}"
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.incr(counter_key)
+                pipe.expire(counter_key, self.window_seconds)
+                count, _ = await pipe.execute()
+        except Exception:
+            return True
+        return count <= self.max_requests
+
+
 class RateLimitMiddleware:
     def __init__(self, app, limiter: RateLimiter) -> None:
         self.app = app
@@ -44,9 +111,11 @@ class RateLimitMiddleware:
         request = Request(scope, receive=receive)
         client = request.client.host if request.client else "unknown"
         api_key = request.headers.get("x-api-key", "anonymous")
-        key = f"{client}:{api_key}"
+        # Hash the key so raw API keys never end up in limiter storage
+        api_key_hash = hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+        key = f"{client}:{api_key_hash}"
 
-        if not self.limiter.is_allowed(key):
+        if not await self.limiter.is_allowed(key):
             response = JSONResponse(
                 status_code=429,
                 content={
@@ -0,0 +1,94 @@
+"""Request body parsing helpers for hot JSON endpoints."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Type, TypeVar
+
+import fastjsonschema
+import orjson
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def json_body(model: Type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """
+    Build a dependency that parses and validates the raw body in one pass.
+
+    FastAPI's default body handling runs ``json.loads`` and then validates the
+    resulting dict; ``model_validate_json`` lets pydantic-core do both directly
+    on the request bytes.
+
+    Args:
+        model: Pydantic model describing the request body
+
+    Returns:
+        Dependency callable returning a validated model instance
+    """
+
+    async def parse(request: Request) -> ModelT:
+        raw = await request.body()
+        try:
+            return model.model_validate_json(raw)
+        except ValidationError as e:
+            errors = [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+            raise RequestValidationError(errors, body=raw)
+
+    return parse
+
+
+def compiled_json_body(
+    model: Type[BaseModel],
+) -> Callable[[Request], Awaitable[SimpleNamespace]]:
+    """
+    Build a dependency that validates the body with a precompiled JSON schema.
+
+    The model's JSON schema is compiled once by fastjsonschema at import time;
+    requests are checked against the generated validator (which also fills in
+    schema defaults) and returned as a lightweight namespace instead of a
+    Pydantic instance. Use it for bodies that are only read downstream.
+
+    Args:
+        model: Pydantic model whose JSON schema describes the request body
+
+    Returns:
+        Dependency callable returning the validated body as a SimpleNamespace
+    """
+    validate = fastjsonschema.compile(model.model_json_schema())
+
+    async def parse(request: Request) -> SimpleNamespace:
+        raw = await request.body()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            raise RequestValidationError(
+                [{"type": "json_invalid", "loc": ("body",), "msg": str(e), "input": {}}],
+                body=raw,
+            )
+        try:
+            data = validate(data)
+        except fastjsonschema.JsonSchemaValueException as e:
+            loc = ("body", *e.path[1:]) if e.path else ("body",)
+            raise RequestValidationError(
+                [{"type": e.rule, "loc": loc, "msg": e.message, "input": e.value}],
+                body=raw,
+            )
+        return SimpleNamespace(**data)
+
+    return parse
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body for routes that parse their body via a dependency."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
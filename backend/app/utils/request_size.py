@@ -0,0 +1,33 @@
+"""Request payload size guard (raw ASGI middleware)."""
+
+from __future__ import annotations
+
+from fastapi.responses import JSONResponse
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Reject requests whose Content-Length exceeds a limit with a 413.
+
+    Reads the header straight from the ASGI scope, so oversized requests are
+    answered before any other middleware or request object is involved.
+    """
+
+    def __init__(self, app, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+        self.response = JSONResponse(
+            status_code=413,
+            content={"detail": "Request payload too large"},
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        await self.response(scope, receive, send)
+                        return
+                    break
+
+        await self.app(scope, receive, send)
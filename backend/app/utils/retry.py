@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import random
 from typing import Awaitable, Callable, TypeVar
 
 T = TypeVar("T")
@@ -16,7 +17,6 @@ async def retry_async(
     exceptions: tuple[type[Exception], ...] = (Exception,),
 ) -> T:
     attempt = 0
-    delay = base_delay
 
     while True:
         try:
@@ -25,5 +25,7 @@ async def retry_async(
             attempt += 1
             if attempt > retries:
                 raise
-            await asyncio.sleep(delay)
-            delay = min(delay * 2, max_delay)
+            # Full jitter on every sleep, so callers that failed together
+            # retry apart from the first attempt on
+            cap = min(base_delay * 2 ** (attempt - 1), max_delay)
+            await asyncio.sleep(random.uniform(0, cap))
@@ -1,21 +1,122 @@
 """URL scraping utility"""
 
+import asyncio
 import re
-from typing import Optional
+from typing import Optional, Tuple
 from urllib.parse import urlparse
 
-import httpx
-from bs4 import BeautifulSoup
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from app.config import settings
 from app.utils.retry import retry_async
 
+# Bytes read from the response per chunk
+_CHUNK_SIZE = 65536
+
+# Media types scrape_url accepts; anything else is rejected before the body is read
+_HTML_MIME = "text/html"
+_SUPPORTED_MIME_TYPES = frozenset({_HTML_MIME, "text/plain"})
+
+
+# Elements that never hold article text
+_NOISE_SELECTOR = "script, style, nav, header, footer, aside, iframe, noscript"
+
+# Main content candidates, tried in order (class/id matches are substrings,
+# case-insensitive)
+_CONTENT_SELECTORS = (
+    "main",
+    "article",
+    "div[class*=content i], div[class*=main i], div[class*=article i], "
+    "div[class*=post i], div[class*=entry i]",
+    "div[id*=content i], div[id*=main i], div[id*=article i], "
+    "div[id*=post i], div[id*=entry i]",
+)
+
+# All candidates at once, matched in a single walk of the document
+_CONTENT_SELECTOR = ", ".join(_CONTENT_SELECTORS)
+
+# A line's text between its first and last non-space character, when that
+# span is at least 3 characters long
+_TEXT_LINE = re.compile(r"\S[^\n]+\S")
+
+# Runs of spaces inside a line
+_MULTI_SPACE = re.compile(r" {2,}")
+
+# Navigation/legal lines, matched at the start of a line in one pass
+_BOILERPLATE = re.compile(
+    r"^(?:skip to|jump to|click here|read more|share this|follow us|subscribe"
+    r"|cookie|privacy policy|terms of|sign in|log in|sign up|register"
+    r"|© \d{4}|all rights reserved|copyright)",
+    re.IGNORECASE,
+)
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; GraphRAG/1.0; +https://github.com/ritwikareddykancharla/graph-enhanced-rag)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+# Shared session: connections (and their TLS sessions) are pooled across calls
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_client() -> aiohttp.ClientSession:
+    """Get the shared scraping session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300),
+        )
+    return _session
+
+
+async def close_http_client() -> None:
+    """Close the shared scraping session (called on application shutdown)."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def _read_capped(response: aiohttp.ClientResponse, max_bytes: int) -> str:
+    """
+    Read and decode at most ``max_bytes`` of a response body.
+
+    The body is streamed in chunks into one buffer and the connection is
+    released as soon as the cap is reached, so an oversized page costs
+    ``max_bytes`` of memory rather than its full size. HTML parsers cope
+    with the truncated tail.
+
+    Args:
+        response: Open response
+        max_bytes: Maximum number of body bytes to keep
 
-async def scrape_url(url: str, timeout: int = 30) -> str:
+    Returns:
+        Decoded body (charset from Content-Type, else UTF-8)
+    """
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+        body += chunk
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            break
+    try:
+        return body.decode(response.charset or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset label
+        return body.decode("utf-8", errors="replace")
+
+
+async def scrape_url(url: str, timeout: int = 30, max_bytes: Optional[int] = None) -> str:
     """
     Scrape and extract text content from a URL.
 
     Args:
         url: URL to scrape
         timeout: Request timeout in seconds
+        max_bytes: Body size cap (defaults to ``SCRAPE_MAX_BYTES``)
 
     Returns:
         Extracted text content
@@ -32,44 +133,41 @@ async def scrape_url(url: str, timeout: int = 30) -> str:
         raise ValueError(f"Unsupported URL scheme: {parsed.scheme}")
 
     # Fetch the page
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; GraphRAG/1.0; +https://github.com/ritwikareddykancharla/graph-enhanced-rag)",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-    }
-
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-        async def _fetch():
-            response = await client.get(url, headers=headers)
+    session = get_http_client()
+
+    async def _fetch() -> Tuple[str, str]:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
             response.raise_for_status()
-            return response
-
-        try:
-            response = await retry_async(
-                _fetch,
-                retries=2,
-                base_delay=0.5,
-                max_delay=2.0,
-                exceptions=(httpx.HTTPError,),
-            )
-        except httpx.HTTPStatusError as e:
-            raise ValueError(
-                f"HTTP error {e.response.status_code} while fetching {url}"
+
+            # Check content type before downloading the body
+            content_type = response.headers.get("content-type", "")
+            mime = content_type.split(";", 1)[0].strip().lower()
+            if mime not in _SUPPORTED_MIME_TYPES:
+                raise ValueError(f"Unsupported content type: {content_type}")
+
+            return mime, await _read_capped(
+                response, max_bytes or settings.scrape_max_bytes
             )
-        except httpx.RequestError as e:
-            raise ValueError(f"Failed to fetch {url}: {str(e)}")
 
-    # Check content type
-    content_type = response.headers.get("content-type", "")
-    if "text/html" not in content_type and "text/plain" not in content_type:
-        raise ValueError(f"Unsupported content type: {content_type}")
+    try:
+        mime, body = await retry_async(
+            _fetch,
+            retries=2,
+            base_delay=0.5,
+            max_delay=2.0,
+            exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+        )
+    except aiohttp.ClientResponseError as e:
+        raise ValueError(f"HTTP error {e.status} while fetching {url}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise ValueError(f"Failed to fetch {url}: {str(e) or type(e).__name__}")
 
     # Parse HTML
-    if "text/html" in content_type:
-        return _extract_text_from_html(response.text, url)
+    if mime == _HTML_MIME:
+        return _extract_text_from_html(body, url)
     else:
         # Plain text
-        return response.text
+        return body
 
 
 def _extract_text_from_html(html: str, url: str) -> str:
@@ -83,52 +181,57 @@ def _extract_text_from_html(html: str, url: str) -> str:
     Returns:
         Extracted text
     """
-    soup = BeautifulSoup(html, "lxml")
+    tree = LexborHTMLParser(html)
 
     # Remove unwanted elements
-    for element in soup(
-        ["script", "style", "nav", "header", "footer", "aside", "iframe", "noscript"]
-    ):
+    for element in tree.css(_NOISE_SELECTOR):
         element.decompose()
 
     # Try to find main content area
-    main_content = (
-        soup.find("main")
-        or soup.find("article")
-        or soup.find("div", class_=re.compile(r"content|main|article|post|entry", re.I))
-        or soup.find("div", id=re.compile(r"content|main|article|post|entry", re.I))
-        or soup.body
-    )
-
-    if not main_content:
-        main_content = soup
+    main_content = _find_main_content(tree) or tree.body or tree.root
+    if main_content is None:
+        return ""
 
     # Extract text
-    text = main_content.get_text(separator="\n", strip=True)
-
-    # Clean up text
-    lines = text.split("\n")
-    cleaned_lines = []
-
-    for line in lines:
-        line = line.strip()
-        # Skip empty lines and very short lines (likely noise)
-        if len(line) < 3:
-            continue
-        # Skip lines that look like navigation or boilerplate
-        if _is_boilerplate(line):
-            continue
-        cleaned_lines.append(line)
+    text = main_content.text(separator="\n", strip=True)
 
+    # Clean up text: keep stripped lines of 3+ characters (shorter ones are
+    # likely noise) that don't look like navigation or boilerplate
+    lines = (match.group() for match in _TEXT_LINE.finditer(text))
+    cleaned_lines = [line for line in lines if not _is_boilerplate(line)]
     text = "\n".join(cleaned_lines)
 
-    # Remove excessive whitespace
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" {2,}", " ", text)
+    # Remove excessive whitespace (lines are already stripped and non-empty,
+    # so only runs of spaces inside a line remain)
+    text = _MULTI_SPACE.sub(" ", text)
 
     return text.strip()
 
 
+def _find_main_content(tree: LexborHTMLParser) -> Optional[LexborNode]:
+    """
+    Find the element most likely to hold the page's main content.
+
+    Args:
+        tree: Parsed HTML document
+
+    Returns:
+        First match of ``_CONTENT_SELECTORS`` in priority order, or None
+    """
+    best = None
+    best_rank = len(_CONTENT_SELECTORS)
+    # Candidates come back in document order; rank each against the
+    # higher-priority selectors only, keeping the earliest best match
+    for node in tree.css(_CONTENT_SELECTOR):
+        for rank, selector in enumerate(_CONTENT_SELECTORS[:best_rank]):
+            if node.css_matches(selector):
+                best, best_rank = node, rank
+                break
+        if best_rank == 0:
+            break
+    return best
+
+
 def _is_boilerplate(line: str) -> bool:
     """
     Check if a line is likely boilerplate/navigation text.
@@ -139,63 +242,33 @@ def _is_boilerplate(line: str) -> bool:
     Returns:
         True if likely boilerplate
     """
-    line_lower = line.lower()
-
     # Common boilerplate patterns
-    boilerplate_patterns = [
-        r"^skip to",
-        r"^jump to",
-        r"^click here",
-        r"^read more",
-        r"^share this",
-        r"^follow us",
-        r"^subscribe",
-        r"^cookie",
-        r"^privacy policy",
-        r"^terms of",
-        r"^sign in",
-        r"^log in",
-        r"^sign up",
-        r"^register",
-        r"^© \d{4}",
-        r"^all rights reserved",
-        r"^copyright",
-    ]
-
-    for pattern in boilerplate_patterns:
-        if re.match(pattern, line_lower):
-            return True
-
-    # Check if line is mostly links (not useful for extraction)
-    if line.count("http") > 3:
+    if _BOILERPLATE.match(line):
         return True
 
-    return False
+    # Check if line is mostly links (not useful for extraction)
+    return "http" in line and line.count("http") > 3
 
 
-def _extract_title(soup: BeautifulSoup) -> Optional[str]:
+def _extract_title(tree: LexborHTMLParser) -> Optional[str]:
     """
     Extract page title.
 
     Args:
-        soup: BeautifulSoup object
+        tree: Parsed HTML document
 
     Returns:
         Page title or None
     """
     # Try og:title first
-    og_title = soup.find("meta", property="og:title")
-    if og_title and og_title.get("content"):
-        return og_title["content"]
-
-    # Try h1
-    h1 = soup.find("h1")
-    if h1:
-        return h1.get_text(strip=True)
-
-    # Try title tag
-    title = soup.find("title")
-    if title:
-        return title.get_text(strip=True)
+    og_title = tree.css_first('meta[property="og:title"]')
+    if og_title is not None and og_title.attributes.get("content"):
+        return og_title.attributes["content"]
+
+    # Try h1, then the title tag
+    for selector in ("h1", "title"):
+        node = tree.css_first(selector)
+        if node is not None:
+            return node.text(strip=True)
 
     return None
@@ -3,12 +3,41 @@
 
 import argparse
 import asyncio
-import json
+import hashlib
+import mmap
+import shelve
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import orjson
+
+from app.models.schemas import Entity, ExtractionResult, Relation
 from app.services.extraction import ExtractionService
 
+# On-disk memo of extraction results, shared across eval runs
+DEFAULT_CACHE_PATH = "backend/evals/.extract_cache"
+
+# Extractions in flight at once
+DEFAULT_CONCURRENCY = 8
+
+
+def _iter_lines(path: Path) -> Iterator[bytes]:
+    """Yield the non-blank lines of ``path`` from a read-only memory map."""
+    with path.open("rb") as f:
+        if not path.stat().st_size:
+            return  # mmap rejects empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            end = len(mm)
+            while start < end:
+                nl = mm.find(b"\n", start)
+                if nl < 0:
+                    nl = end  # last line without a trailing newline
+                line = mm[start:nl]
+                start = nl + 1
+                if line.strip():
+                    yield line
+
 
 def _norm(text: str) -> str:
     return " ".join(text.strip().lower().split())
@@ -30,6 +59,19 @@ def _relation_key(rel: Dict[str, str]) -> Tuple[str, str, str]:
     )
 
 
+# Prediction-side keys read model attributes directly; gold records are dicts
+def _pred_entity_key(entity: Entity) -> Tuple[str, str]:
+    return (_norm(entity.name or ""), _norm(entity.type or ""))
+
+
+def _pred_relation_key(rel: Relation) -> Tuple[str, str, str]:
+    return (
+        _norm(rel.source or ""),
+        _norm(rel.target or ""),
+        _norm(rel.relation_type or ""),
+    )
+
+
 def _precision_recall_f1(tp: int, fp: int, fn: int) -> Tuple[float, float, float]:
     precision = tp / (tp + fp) if tp + fp > 0 else 0.0
     recall = tp / (tp + fn) if tp + fn > 0 else 0.0
@@ -42,83 +84,121 @@ def _precision_recall_f1(tp: int, fp: int, fn: int) -> Tuple[float, float, float
 
 
 def _score_sets(pred: set, gold: set) -> Tuple[int, int, int]:
+    # One intersection; fp and fn follow from the set sizes
     tp = len(pred & gold)
-    fp = len(pred - gold)
-    fn = len(gold - pred)
-    return tp, fp, fn
-
-
-async def _evaluate(dataset_path: Path, model: str | None) -> int:
+    return tp, len(pred) - tp, len(gold) - tp
+
+
+async def _cached_extract(
+    service: ExtractionService, text: str, cache: Optional[shelve.Shelf]
+) -> ExtractionResult:
+    """Extract from ``text``, reusing a result stored by an earlier run."""
+    if cache is None:
+        return await service.extract(text)
+
+    key = hashlib.sha256(f"{service.model}|{text}".encode()).hexdigest()
+    cached = cache.get(key)
+    if cached is not None:
+        return ExtractionResult.model_validate_json(cached)
+
+    prediction = await service.extract(text)
+    # Empty results usually mean a failed call; retry those next run
+    if prediction.entities or prediction.relations:
+        cache[key] = prediction.model_dump_json()
+    return prediction
+
+
+async def _evaluate(
+    dataset_path: Path,
+    model: str | None,
+    cache_path: Optional[Path] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
     if not dataset_path.exists():
         print(f"Dataset not found: {dataset_path}")
         return 1
 
     service = ExtractionService(model=model)
-
+    cache = shelve.open(str(cache_path)) if cache_path else None
+    try:
+        return await _run(service, dataset_path, cache, concurrency)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+async def _run(
+    service: ExtractionService,
+    dataset_path: Path,
+    cache: Optional[shelve.Shelf],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
     entity_strict = {"tp": 0, "fp": 0, "fn": 0}
     entity_name = {"tp": 0, "fp": 0, "fn": 0}
     relation_strict = {"tp": 0, "fp": 0, "fn": 0}
 
-    samples = 0
+    # orjson parses the raw bytes; no per-line str decode
+    records = [orjson.loads(line) for line in _iter_lines(dataset_path)]
+
+    # Keep up to ``concurrency`` extractions in flight; results keep dataset order
+    sem = asyncio.Semaphore(concurrency)
 
-    with dataset_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            record = json.loads(line)
-            samples += 1
-            text = record["text"]
-
-            prediction = await service.extract(text)
-
-            pred_entities = [e.model_dump() for e in prediction.entities]
-            pred_relations = [r.model_dump() for r in prediction.relations]
-
-            gold_entities = record.get("entities", [])
-            gold_relations = record.get("relations", [])
-
-            pred_entity_set = {_entity_key(e) for e in pred_entities if e.get("name")}
-            gold_entity_set = {_entity_key(e) for e in gold_entities if e.get("name")}
-
-            pred_entity_name_set = {
-                _entity_name_key(e) for e in pred_entities if e.get("name")
-            }
-            gold_entity_name_set = {
-                _entity_name_key(e) for e in gold_entities if e.get("name")
-            }
-
-            pred_relation_set = {
-                _relation_key(r)
-                for r in pred_relations
-                if r.get("source") and r.get("target")
-            }
-            gold_relation_set = {
-                _relation_key(r)
-                for r in gold_relations
-                if r.get("source") and r.get("target")
-            }
-
-            tp, fp, fn = _score_sets(pred_entity_set, gold_entity_set)
-            entity_strict["tp"] += tp
-            entity_strict["fp"] += fp
-            entity_strict["fn"] += fn
-
-            tp, fp, fn = _score_sets(pred_entity_name_set, gold_entity_name_set)
-            entity_name["tp"] += tp
-            entity_name["fp"] += fp
-            entity_name["fn"] += fn
-
-            tp, fp, fn = _score_sets(pred_relation_set, gold_relation_set)
-            relation_strict["tp"] += tp
-            relation_strict["fp"] += fp
-            relation_strict["fn"] += fn
-
-            print(f"\nSample {record.get('id', samples)}")
-            print(f"Text: {text}")
-            print(f"Pred entities: {len(pred_entities)} | Gold entities: {len(gold_entities)}")
-            print(
-                f"Pred relations: {len(pred_relations)} | Gold relations: {len(gold_relations)}"
-            )
+    async def run_one(record: dict) -> ExtractionResult:
+        async with sem:
+            return await _cached_extract(service, record["text"], cache)
+
+    predictions = await asyncio.gather(*(run_one(record) for record in records))
+
+    samples = 0
+    for record, prediction in zip(records, predictions):
+        samples += 1
+        text = record["text"]
+
+        gold_entities = record.get("entities", [])
+        gold_relations = record.get("relations", [])
+
+        pred_entity_set = {
+            _pred_entity_key(e) for e in prediction.entities if e.name
+        }
+        gold_entity_set = {_entity_key(e) for e in gold_entities if e.get("name")}
+
+        pred_entity_name_set = {name for name, _ in pred_entity_set}
+        gold_entity_name_set = {
+            _entity_name_key(e) for e in gold_entities if e.get("name")
+        }
+
+        pred_relation_set = {
+            _pred_relation_key(r)
+            for r in prediction.relations
+            if r.source and r.target
+        }
+        gold_relation_set = {
+            _relation_key(r)
+            for r in gold_relations
+            if r.get("source") and r.get("target")
+        }
+
+        tp, fp, fn = _score_sets(pred_entity_set, gold_entity_set)
+        entity_strict["tp"] += tp
+        entity_strict["fp"] += fp
+        entity_strict["fn"] += fn
+
+        tp, fp, fn = _score_sets(pred_entity_name_set, gold_entity_name_set)
+        entity_name["tp"] += tp
+        entity_name["fp"] += fp
+        entity_name["fn"] += fn
+
+        tp, fp, fn = _score_sets(pred_relation_set, gold_relation_set)
+        relation_strict["tp"] += tp
+        relation_strict["fp"] += fp
+        relation_strict["fn"] += fn
+
+        print(f"\nSample {record.get('id', samples)}")
+        print(f"Text: {text}")
+        print(f"Pred entities: {len(prediction.entities)} | Gold entities: {len(gold_entities)}")
+        print(
+            f"Pred relations: {len(prediction.relations)} | Gold relations: {len(gold_relations)}"
+        )
 
     ep, er, ef = _precision_recall_f1(**entity_strict)
     enp, enr, enf = _precision_recall_f1(**entity_name)
@@ -153,9 +233,26 @@ def main() -> int:
         help="Path to JSONL dataset",
     )
     parser.add_argument("--model", default=None, help="LLM model override")
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE_PATH,
+        help="Extraction result cache file (shelve); reused across runs",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always call the LLM"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum extractions in flight",
+    )
     args = parser.parse_args()
 
-    return asyncio.run(_evaluate(Path(args.dataset), args.model))
+    cache_path = None if args.no_cache else Path(args.cache)
+    return asyncio.run(
+        _evaluate(Path(args.dataset), args.model, cache_path, args.concurrency)
+    )
 
 
 if __name__ == "__main__":
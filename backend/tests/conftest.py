@@ -1,32 +1,67 @@
 """Test configuration and fixtures"""
 
 import asyncio
-from typing import AsyncGenerator, Generator
+import os
+from collections import OrderedDict
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Generator, List, Tuple
+import orjson
 import pytest
 import pytest_asyncio
-from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
+from httpx import AsyncClient, ASGITransport, Response
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
-from app.main import app
+from fastapi import FastAPI
+
+from app.auth import verify_api_key
+from app.main import app as fastapi_app
 from app.database import Base, get_db
+from app.models.db_models import Edge, Node
 from app.config import get_settings
-
-# Test database URL (in-memory SQLite for testing)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
-
-# Create test engine
-test_engine = create_async_engine(
-    TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-
-test_session_maker = async_sessionmaker(
-    test_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+from app.services.llm_cache import LRUBackend, llm_cache
+from app.services.query_cache import node_id_cache
+
+# Test database URL (in-memory SQLite unless a CI run points it at Postgres)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# One engine for the whole session, so connections are set up once, not per test
+if TEST_DATABASE_URL.startswith("sqlite"):
+    # Every test shares the single in-memory connection
+    test_engine = create_async_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite defers BEGIN until the first DML statement, which breaks
+    # SAVEPOINT; take over transaction control so each test can run inside one.
+    # Durability is irrelevant here, so journaling and syncing are minimised.
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in (
+            "synchronous=OFF",
+            "journal_mode=MEMORY",
+            "temp_store=MEMORY",
+            "locking_mode=EXCLUSIVE",
+        ):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+else:
+    test_engine = create_async_engine(
+        TEST_DATABASE_URL,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+    )
 
 
 @pytest.fixture(scope="session")
@@ -37,26 +72,104 @@ def event_loop() -> Generator:
     loop.close()
 
 
-@pytest_asyncio.fixture
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Create test database session"""
+@pytest.fixture(autouse=True)
+def fresh_llm_cache(monkeypatch):
+    """Give every test an empty in-memory LLM cache"""
+    monkeypatch.setattr(llm_cache, "backend", LRUBackend())
+    return llm_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_node_id_cache(monkeypatch):
+    """Give every test an empty process-wide node ID cache"""
+    monkeypatch.setattr(node_id_cache, "entries", OrderedDict())
+    return node_id_cache
+
+
+@pytest_asyncio.fixture(scope="session")
+async def test_schema() -> None:
+    """Create the schema once for the whole test session"""
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    async with test_session_maker() as session:
-        yield session
-        await session.rollback()
-
 
 @pytest_asyncio.fixture
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
-    """Create test client with database dependency override"""
+async def db_session(test_schema) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Create a test database session isolated in an outer transaction.
+
+    Session commits release a SAVEPOINT instead of committing, and the outer
+    transaction is rolled back afterwards, so no test sees another's rows.
+    """
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
 
-    async def override_get_db():
-        yield db_session
 
-    app.dependency_overrides[get_db] = override_get_db
+@pytest.fixture
+def bulk_create_nodes(
+    db_session: AsyncSession,
+) -> Callable[[List[Dict]], Awaitable[List[Node]]]:
+    """Insert setup-only nodes in one statement, bypassing the service layer"""
+
+    async def create(rows: List[Dict]) -> List[Node]:
+        result = await db_session.scalars(
+            insert(Node).returning(Node, sort_by_parameter_order=True), rows
+        )
+        return list(result)
+
+    return create
+
+
+@pytest.fixture
+def bulk_create_edges(
+    db_session: AsyncSession,
+) -> Callable[[List[Tuple[int, int, str]]], Awaitable[List[Edge]]]:
+    """Insert setup-only (source_id, target_id, relation_type) edges in one statement"""
+
+    async def create(edges: List[Tuple[int, int, str]]) -> List[Edge]:
+        rows = [
+            {"source_id": source_id, "target_id": target_id, "relation_type": relation_type}
+            for source_id, target_id, relation_type in edges
+        ]
+        result = await db_session.scalars(
+            insert(Edge).returning(Edge, sort_by_parameter_order=True), rows
+        )
+        return list(result)
+
+    return create
+
+
+async def _skip_api_key_check() -> str:
+    """Stand-in for ``verify_api_key`` that accepts every request"""
+    return get_settings().api_key
 
+
+@pytest.fixture(scope="session")
+def app() -> Generator[FastAPI, None, None]:
+    """
+    The FastAPI application, shared by all API tests.
+
+    API key checks are bypassed; ``auth_client`` restores them for the tests
+    that exercise authentication.
+    """
+    fastapi_app.dependency_overrides[verify_api_key] = _skip_api_key_check
+    yield fastapi_app
+    fastapi_app.dependency_overrides.pop(verify_api_key, None)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """One ASGI client reused across the test session"""
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
@@ -64,7 +177,44 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     ) as ac:
         yield ac
 
-    app.dependency_overrides.clear()
+
+@pytest_asyncio.fixture
+async def client(
+    app: FastAPI, http_client: AsyncClient, db_session: AsyncSession
+) -> AsyncGenerator[AsyncClient, None]:
+    """Shared test client with the database dependency bound to this test's session"""
+
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield http_client
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest_asyncio.fixture
+async def auth_client(
+    app: FastAPI, client: AsyncClient
+) -> AsyncGenerator[AsyncClient, None]:
+    """Client with the real API key check and no default API key header"""
+    app.dependency_overrides.pop(verify_api_key, None)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides[verify_api_key] = _skip_api_key_check
+
+
+@pytest.fixture
+def post_json(client: AsyncClient) -> Callable[[str, object], Awaitable[Response]]:
+    """POST a body serialized with orjson (bytes straight to the transport)"""
+
+    async def post(url: str, body: object) -> Response:
+        return await client.post(
+            url, content=orjson.dumps(body), headers={"Content-Type": "application/json"}
+        )
+
+    return post
 
 
 @pytest.fixture
@@ -10,62 +10,79 @@ For headless mode:
 
 import random
 import string
+from collections import deque
 from locust import HttpUser, task, between, events
 from locust.runners import MasterRunner, WorkerRunner
 
 
+_ALPHA = string.ascii_lowercase + string.digits
+
+_TEMPLATES = (
+    "The {service} Service depends on the {db} Database for data storage. "
+    "The {service} Service connects to the {cache} Cache for session management. "
+    "The {api} API calls the {service} Service for business logic. "
+    "The {db} Database replicates to the {analytics} Analytics platform. "
+    "The {frontend} Frontend communicates with the {api} API gateway.",
+    "Microservice {name} uses {dep} for dependency injection. "
+    "Component {a} connects to component {b} via REST API. "
+    "The {queue} Message Queue feeds into the {worker} Worker process.",
+    "Service {svc1} depends on Service {svc2} which connects to Database {db}. "
+    "The {gateway} API Gateway routes to {svc1}, {svc2}, and {svc3}. "
+    "Cache layer {cache} sits in front of {db} reducing query load by 80%.",
+)
+
+_SERVICES = (
+    "Payment",
+    "Auth",
+    "User",
+    "Order",
+    "Inventory",
+    "Notification",
+    "Email",
+    "Search",
+)
+_DBS = ("Postgres", "MySQL", "MongoDB", "Redis", "Elasticsearch")
+_COMPONENTS = ("API", "Worker", "Gateway", "Frontend", "Mobile", "Admin")
+
+
 def random_string(length=10):
-    return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
+    return "".join(random.choices(_ALPHA, k=length))
 
 
 def generate_architecture_text():
-    templates = [
-        "The {service} Service depends on the {db} Database for data storage. "
-        "The {service} Service connects to the {cache} Cache for session management. "
-        "The {api} API calls the {service} Service for business logic. "
-        "The {db} Database replicates to the {analytics} Analytics platform. "
-        "The {frontend} Frontend communicates with the {api} API gateway.",
-        "Microservice {name} uses {dep} for dependency injection. "
-        "Component {a} connects to component {b} via REST API. "
-        "The {queue} Message Queue feeds into the {worker} Worker process.",
-        "Service {svc1} depends on Service {svc2} which connects to Database {db}. "
-        "The {gateway} API Gateway routes to {svc1}, {svc2}, and {svc3}. "
-        "Cache layer {cache} sits in front of {db} reducing query load by 80%.",
-    ]
-
-    services = [
-        "Payment",
-        "Auth",
-        "User",
-        "Order",
-        "Inventory",
-        "Notification",
-        "Email",
-        "Search",
-    ]
-    dbs = ["Postgres", "MySQL", "MongoDB", "Redis", "Elasticsearch"]
-    components = ["API", "Worker", "Gateway", "Frontend", "Mobile", "Admin"]
-
-    template = random.choice(templates)
-
-    return template.format(
-        service=random.choice(services),
-        db=random.choice(dbs),
-        cache=random.choice(dbs),
-        api=random.choice(components),
-        analytics="Analytics",
-        frontend="Web",
-        name=random_string(8),
-        dep=random_string(6),
-        a=random_string(5),
-        b=random_string(5),
-        queue="Kafka",
-        worker="Celery",
-        svc1=random.choice(services),
-        svc2=random.choice(services),
-        svc3=random.choice(services),
-        gateway="Kong",
-        cache_layer=random.choice(dbs),
+    return generate_architecture_text_batch(1)
+
+
+def generate_architecture_text_batch(n):
+    """Generate ``n`` architecture descriptions joined into one text."""
+    # Draw every random value for the batch up front, one call per vocabulary
+    templates = random.choices(_TEMPLATES, k=n)
+    services = random.choices(_SERVICES, k=4 * n)
+    dbs = random.choices(_DBS, k=2 * n)
+    apis = random.choices(_COMPONENTS, k=n)
+    # Four random identifiers per text (8 + 6 + 5 + 5 characters)
+    chars = "".join(random.choices(_ALPHA, k=24 * n))
+
+    return " ".join(
+        templates[i].format(
+            service=services[4 * i],
+            db=dbs[2 * i],
+            cache=dbs[2 * i + 1],
+            api=apis[i],
+            analytics="Analytics",
+            frontend="Web",
+            name=chars[24 * i : 24 * i + 8],
+            dep=chars[24 * i + 8 : 24 * i + 14],
+            a=chars[24 * i + 14 : 24 * i + 19],
+            b=chars[24 * i + 19 : 24 * i + 24],
+            queue="Kafka",
+            worker="Celery",
+            svc1=services[4 * i + 1],
+            svc2=services[4 * i + 2],
+            svc3=services[4 * i + 3],
+            gateway="Kong",
+        )
+        for i in range(n)
     )
 
 
@@ -79,7 +96,8 @@ class GraphRAGUser(HttpUser):
     def on_start(self):
         self.api_key = "test-stress-key"
         self.headers = {"X-API-Key": self.api_key, "Content-Type": "application/json"}
-        self.created_node_ids = []
+        # Most recent IDs only; memory stays constant over long runs
+        self.created_node_ids = deque(maxlen=200)
         self.created_edge_ids = []
 
         self.health_check()
@@ -164,11 +182,7 @@ class GraphRAGUser(HttpUser):
             )
             return
 
-        node_id = (
-            random.choice(self.created_node_ids[-20:])
-            if len(self.created_node_ids) > 20
-            else self.created_node_ids[0]
-        )
+        node_id = random.choice(self.created_node_ids)
 
         payload = {"node_id": node_id, "max_depth": random.randint(3, 7)}
 
@@ -185,8 +199,9 @@ class GraphRAGUser(HttpUser):
         if len(self.created_node_ids) < 2:
             return
 
-        source_id = random.choice(self.created_node_ids)
-        target_id = random.choice([n for n in self.created_node_ids if n != source_id])
+        source_id, target_id = random.sample(self.created_node_ids, 2)
+        if source_id == target_id:
+            return
 
         payload = {
             "source_id": source_id,
@@ -224,8 +239,7 @@ class HeavyIngestionUser(HttpUser):
     @task
     def bulk_ingest(self):
         """Send large text payloads for ingestion."""
-        texts = [generate_architecture_text() for _ in range(5)]
-        combined_text = " ".join(texts)
+        combined_text = generate_architecture_text_batch(5)
 
         payload = {
             "text": combined_text,
@@ -1,15 +1,21 @@
 """Tests for the API endpoints"""
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
-from httpx import AsyncClient
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.main import SPAStaticFiles
+from app.models.schemas import NodeCreate, EdgeCreate, Entity, ExtractionResult
 
-from app.models.schemas import NodeCreate, EdgeCreate
+# One event loop for every test in this module
+pytestmark = pytest.mark.asyncio(scope="session")
 
 
 class TestHealthEndpoint:
     """Tests for health check endpoints"""
 
-    @pytest.mark.asyncio
     async def test_health_check(self, client: AsyncClient):
         """Test health check endpoint"""
         response = await client.get("/health")
@@ -19,16 +25,24 @@ class TestHealthEndpoint:
         assert data["status"] == "healthy"
         assert "version" in data
 
+    async def test_pool_status(self, client: AsyncClient):
+        """Test connection pool status endpoint"""
+        response = await client.get("/debug/pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["checked_out"] >= 0
+        assert "max_overflow" in data
+
 
 class TestNodeEndpoints:
     """Tests for node CRUD endpoints"""
 
-    @pytest.mark.asyncio
-    async def test_create_node(self, client: AsyncClient):
+    async def test_create_node(self, post_json):
         """Test creating a node via API"""
-        response = await client.post(
+        response = await post_json(
             "/graph/nodes",
-            json={"name": "API Server", "type": "server", "properties": {"port": 8080}},
+            {"name": "API Server", "type": "server", "properties": {"port": 8080}},
         )
 
         assert response.status_code == 201
@@ -37,29 +51,35 @@ class TestNodeEndpoints:
         assert data["type"] == "server"
         assert data["properties"]["port"] == 8080
 
-    @pytest.mark.asyncio
-    async def test_create_duplicate_node(self, client: AsyncClient):
+    async def test_create_duplicate_node(self, post_json, bulk_create_nodes):
         """Test creating a node with duplicate name"""
         # Create first node
-        await client.post(
-            "/graph/nodes", json={"name": "Duplicate Test", "type": "test"}
-        )
+        await bulk_create_nodes([{"name": "Duplicate Test", "type": "test"}])
 
         # Try to create duplicate
-        response = await client.post(
-            "/graph/nodes", json={"name": "Duplicate Test", "type": "test"}
+        response = await post_json(
+            "/graph/nodes", {"name": "Duplicate Test", "type": "test"}
         )
 
         assert response.status_code == 409
 
-    @pytest.mark.asyncio
-    async def test_list_nodes(self, client: AsyncClient):
+    async def test_create_node_invalid_body(self, client: AsyncClient, post_json):
+        """Test that malformed node payloads are rejected with 422"""
+        response = await post_json("/graph/nodes", {"name": ""})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "name"]
+
+        response = await client.post(
+            "/graph/nodes",
+            content=b"{not json",
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+    async def test_list_nodes(self, client: AsyncClient, bulk_create_nodes):
         """Test listing nodes"""
         # Create some nodes
-        for i in range(3):
-            await client.post(
-                "/graph/nodes", json={"name": f"List Test {i}", "type": "test"}
-            )
+        await bulk_create_nodes([{"name": f"List Test {i}", "type": "test"} for i in range(3)])
 
         response = await client.get("/graph/nodes")
 
@@ -69,37 +89,29 @@ class TestNodeEndpoints:
         assert "total" in data
         assert data["total"] >= 3
 
-    @pytest.mark.asyncio
-    async def test_get_node(self, client: AsyncClient):
+    async def test_get_node(self, client: AsyncClient, bulk_create_nodes):
         """Test getting a single node"""
         # Create a node
-        create_response = await client.post(
-            "/graph/nodes", json={"name": "Get Test Node", "type": "test"}
-        )
-        node_id = create_response.json()["id"]
+        (node,) = await bulk_create_nodes([{"name": "Get Test Node", "type": "test"}])
 
         # Get the node
-        response = await client.get(f"/graph/nodes/{node_id}")
+        response = await client.get(f"/graph/nodes/{node.id}")
 
         assert response.status_code == 200
         data = response.json()
         assert data["name"] == "Get Test Node"
 
-    @pytest.mark.asyncio
     async def test_get_nonexistent_node(self, client: AsyncClient):
         """Test getting a node that doesn't exist"""
         response = await client.get("/graph/nodes/99999")
 
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_delete_node(self, client: AsyncClient):
+    async def test_delete_node(self, client: AsyncClient, bulk_create_nodes):
         """Test deleting a node"""
         # Create a node
-        create_response = await client.post(
-            "/graph/nodes", json={"name": "Delete Test Node", "type": "test"}
-        )
-        node_id = create_response.json()["id"]
+        (node,) = await bulk_create_nodes([{"name": "Delete Test Node", "type": "test"}])
+        node_id = node.id
 
         # Delete it
         response = await client.delete(f"/graph/nodes/{node_id}")
@@ -110,15 +122,14 @@ class TestNodeEndpoints:
         get_response = await client.get(f"/graph/nodes/{node_id}")
         assert get_response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_search_nodes(self, client: AsyncClient):
+    async def test_search_nodes(self, client: AsyncClient, bulk_create_nodes):
         """Test searching nodes"""
         # Create nodes with specific names
-        await client.post(
-            "/graph/nodes", json={"name": "Search Test Alpha", "type": "alpha"}
-        )
-        await client.post(
-            "/graph/nodes", json={"name": "Search Test Beta", "type": "beta"}
+        await bulk_create_nodes(
+            [
+                {"name": "Search Test Alpha", "type": "alpha"},
+                {"name": "Search Test Beta", "type": "beta"},
+            ]
         )
 
         # Search by name
@@ -132,24 +143,21 @@ class TestNodeEndpoints:
 class TestEdgeEndpoints:
     """Tests for edge CRUD endpoints"""
 
-    @pytest.mark.asyncio
-    async def test_create_edge(self, client: AsyncClient):
+    async def test_create_edge(self, post_json, bulk_create_nodes):
         """Test creating an edge via API"""
         # Create nodes
-        source_response = await client.post(
-            "/graph/nodes", json={"name": "Edge Source", "type": "server"}
+        source, target = await bulk_create_nodes(
+            [
+                {"name": "Edge Source", "type": "server"},
+                {"name": "Edge Target", "type": "database"},
+            ]
         )
-        target_response = await client.post(
-            "/graph/nodes", json={"name": "Edge Target", "type": "database"}
-        )
-
-        source_id = source_response.json()["id"]
-        target_id = target_response.json()["id"]
+        source_id, target_id = source.id, target.id
 
         # Create edge
-        response = await client.post(
+        response = await post_json(
             "/graph/edges",
-            json={
+            {
                 "source_id": source_id,
                 "target_id": target_id,
                 "relation_type": "depends_on",
@@ -163,19 +171,23 @@ class TestEdgeEndpoints:
         assert data["target_id"] == target_id
         assert data["relation_type"] == "depends_on"
 
-    @pytest.mark.asyncio
-    async def test_create_edge_invalid_source(self, client: AsyncClient):
+        # Same relation again conflicts
+        response = await post_json(
+            "/graph/edges",
+            {"source_id": source_id, "target_id": target_id, "relation_type": "depends_on"},
+        )
+        assert response.status_code == 409
+
+    async def test_create_edge_invalid_source(self, post_json, bulk_create_nodes):
         """Test creating an edge with invalid source"""
         # Create only target node
-        target_response = await client.post(
-            "/graph/nodes", json={"name": "Target Only", "type": "test"}
-        )
-        target_id = target_response.json()["id"]
+        (target,) = await bulk_create_nodes([{"name": "Target Only", "type": "test"}])
+        target_id = target.id
 
         # Try to create edge with non-existent source
-        response = await client.post(
+        response = await post_json(
             "/graph/edges",
-            json={
+            {
                 "source_id": 99999,
                 "target_id": target_id,
                 "relation_type": "depends_on",
@@ -184,28 +196,17 @@ class TestEdgeEndpoints:
 
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_list_edges(self, client: AsyncClient):
+    async def test_list_edges(self, client: AsyncClient, bulk_create_nodes, bulk_create_edges):
         """Test listing edges"""
         # Create nodes and edge
-        source_response = await client.post(
-            "/graph/nodes", json={"name": "List Edge Source", "type": "test"}
+        source, target = await bulk_create_nodes(
+            [
+                {"name": "List Edge Source", "type": "test"},
+                {"name": "List Edge Target", "type": "test"},
+            ]
         )
-        target_response = await client.post(
-            "/graph/nodes", json={"name": "List Edge Target", "type": "test"}
-        )
-
-        source_id = source_response.json()["id"]
-        target_id = target_response.json()["id"]
 
-        await client.post(
-            "/graph/edges",
-            json={
-                "source_id": source_id,
-                "target_id": target_id,
-                "relation_type": "connects_to",
-            },
-        )
+        await bulk_create_edges([(source.id, target.id, "connects_to")])
 
         response = await client.get("/graph/edges")
 
@@ -214,55 +215,139 @@ class TestEdgeEndpoints:
         assert "edges" in data
         assert data["total"] >= 1
 
-    @pytest.mark.asyncio
-    async def test_delete_edge(self, client: AsyncClient):
+    async def test_delete_edge(self, client: AsyncClient, bulk_create_nodes, bulk_create_edges):
         """Test deleting an edge"""
         # Create nodes and edge
-        source_response = await client.post(
-            "/graph/nodes", json={"name": "Delete Edge Source", "type": "test"}
+        source, target = await bulk_create_nodes(
+            [
+                {"name": "Delete Edge Source", "type": "test"},
+                {"name": "Delete Edge Target", "type": "test"},
+            ]
         )
-        target_response = await client.post(
-            "/graph/nodes", json={"name": "Delete Edge Target", "type": "test"}
+
+        (edge,) = await bulk_create_edges([(source.id, target.id, "temp_relation")])
+
+        # Delete edge
+        response = await client.delete(f"/graph/edges/{edge.id}")
+
+        assert response.status_code == 204
+
+
+class TestQueryEndpoints:
+    """Tests for impact and path query endpoints"""
+
+    async def test_path_query_invalid_depth(self, post_json):
+        """Test that out-of-range query parameters are rejected with 422"""
+        response = await post_json(
+            "/graph/query/path",
+            {"source_node_id": 1, "target_node_id": 2, "max_depth": 0},
         )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "max_depth"]
 
-        source_id = source_response.json()["id"]
-        target_id = target_response.json()["id"]
+    async def test_impact_query_requires_node(self, post_json):
+        """Test that impact queries need a node id or name"""
+        response = await post_json("/graph/query/impact", {"max_depth": 2})
+        assert response.status_code == 422
 
-        edge_response = await client.post(
-            "/graph/edges",
-            json={
-                "source_id": source_id,
-                "target_id": target_id,
-                "relation_type": "temp_relation",
-            },
+
+class TestIngestEndpoints:
+    """Tests for ingestion endpoints"""
+
+    async def test_ingest_text_stream(self, client: AsyncClient):
+        """Test ingesting a raw text body"""
+        extraction_service = MagicMock()
+        extraction_service.extract = AsyncMock(
+            return_value=ExtractionResult(entities=[Entity(name="Stream Service", type="service")])
         )
-        edge_id = edge_response.json()["id"]
 
-        # Delete edge
-        response = await client.delete(f"/graph/edges/{edge_id}")
+        with patch(
+            "app.services.ingestion.get_extraction_service",
+            return_value=extraction_service,
+        ):
+            response = await client.post(
+                "/ingest/text-stream",
+                content="Stream Service handles uploads.".encode(),
+                headers={"Content-Type": "text/plain"},
+            )
 
-        assert response.status_code == 204
+        assert response.status_code == 201
+        assert response.json()["nodes_created"] == 1
+        extraction_service.extract.assert_awaited_once_with("Stream Service handles uploads.")
+
+    async def test_ingest_text_stream_empty_body(self, client: AsyncClient):
+        """Test that an empty body is rejected"""
+        response = await client.post(
+            "/ingest/text-stream", content=b"", headers={"Content-Type": "text/plain"}
+        )
+
+        assert response.status_code == 400
 
 
 class TestAuth:
     """Tests for API authentication"""
 
-    @pytest.mark.asyncio
-    async def test_missing_api_key(self, client: AsyncClient):
+    async def test_missing_api_key(self, auth_client: AsyncClient):
         """Test request without API key"""
         # Make request without API key header
-        response = await client.get(
-            "/graph/nodes",
-            headers={},  # No API key
-        )
+        response = await auth_client.get("/graph/nodes")
 
         assert response.status_code == 401
 
-    @pytest.mark.asyncio
-    async def test_invalid_api_key(self, client: AsyncClient):
+    async def test_invalid_api_key(self, auth_client: AsyncClient):
         """Test request with invalid API key"""
-        response = await client.get(
+        response = await auth_client.get(
             "/graph/nodes", headers={"X-API-Key": "invalid-key"}
         )
 
         assert response.status_code == 403
+
+    async def test_valid_api_key(self, auth_client: AsyncClient, api_key: str):
+        """Test request with the configured API key"""
+        response = await auth_client.get("/graph/nodes", headers={"X-API-Key": api_key})
+
+        assert response.status_code == 200
+
+
+class TestRequestSizeLimit:
+    """Tests for the payload size guard"""
+
+    async def test_oversized_payload_rejected(self, client: AsyncClient):
+        """Test that a body larger than the limit is rejected with 413"""
+        from app.config import settings
+
+        response = await client.post(
+            "/graph/nodes",
+            content=b"x" * (settings.max_request_size_bytes + 1),
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == 413
+
+
+class TestSPAStaticFiles:
+    """Tests for the frontend mount's index.html fallback"""
+
+    @pytest.mark.parametrize(
+        "path,status_code,body",
+        [
+            ("/graph", 200, "shell"),
+            ("/users/john.doe", 200, "shell"),
+            ("/docs/v1.2", 200, "shell"),
+            ("/assets/missing.js", 404, None),
+            ("/assets/v1.2", 404, None),
+            ("/missing.css", 404, None),
+        ],
+    )
+    async def test_client_routes_fall_back_to_index(self, tmp_path, path, status_code, body):
+        """Test that client-side routes (even dotted) get index.html and missing assets 404"""
+        (tmp_path / "index.html").write_text("shell")
+        spa = FastAPI()
+        spa.mount("/", SPAStaticFiles(directory=tmp_path, html=True))
+
+        async with AsyncClient(transport=ASGITransport(app=spa), base_url="http://test") as ac:
+            response = await ac.get(path)
+
+        assert response.status_code == status_code
+        if body is not None:
+            assert response.text == body
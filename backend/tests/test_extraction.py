@@ -1,21 +1,93 @@
 """Tests for the extraction service"""
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock
+from langchain_community.chat_models.fake import FakeListChatModel
 
 from app.services.extraction import ExtractionService
+from app.services.canonicalization import CanonicalizationService
+from app.services.llm_cache import SemanticLLMCache
+from app.utils.llm_limit import LLMLimiter
 from app.models.schemas import ExtractionResult, Entity, Relation
 
 
+VALID_JSON = """
+{
+    "entities": [
+        {"name": "Payment Service", "type": "service"},
+        {"name": "Auth API", "type": "api"}
+    ],
+    "relations": [
+        {"source": "Payment Service", "target": "Auth API", "relation_type": "uses"}
+    ]
+}
+"""
+
+MARKDOWN_JSON = """
+```json
+{
+    "entities": [
+        {"name": "Cache", "type": "service"}
+    ],
+    "relations": []
+}
+```
+"""
+
+PROSE_JSON = 'Here is the graph: {"entities": [{"name": "Queue", "type": "queue"}]} Done.'
+
+EMPTY_NAME_JSON = """
+{
+    "entities": [
+        {"name": "", "type": "server"},
+        {"name": "Valid Entity", "type": "service"}
+    ],
+    "relations": []
+}
+"""
+
+
+class _StubTemplate:
+    """ChatPromptTemplate stand-in whose ``prompt | llm`` is just ``llm``"""
+
+    @staticmethod
+    def from_messages(_messages):
+        return _StubTemplate()
+
+    def __or__(self, other):
+        return other
+
+
+class _FakeChain:
+    """Prompt | LLM (or bare LLM) stand-in that always answers with the same content"""
+
+    def __init__(self, content: str):
+        self._response = SimpleNamespace(content=content)
+
+    async def ainvoke(self, _inputs):
+        return self._response
+
+
+async def _no_retry(fn, **_):
+    return await fn()
+
+
+@pytest.fixture(scope="module")
+def extraction_service() -> ExtractionService:
+    """One bare service shared by the response-parsing tests"""
+    return ExtractionService.__new__(ExtractionService)
+
+
 class TestExtractionService:
     """Tests for ExtractionService"""
 
     @pytest.mark.asyncio
-    async def test_extract_entities_and_relations(self):
+    async def test_extract_entities_and_relations(self, monkeypatch):
         """Test successful extraction of entities and relations"""
-        # Mock LLM response
-        mock_response = MagicMock()
-        mock_response.content = """
+        content = """
         {
             "entities": [
                 {"name": "Server A", "type": "server", "properties": {}},
@@ -27,20 +99,12 @@ class TestExtractionService:
         }
         """
 
-        service = ExtractionService.__new__(ExtractionService)
-        service._llm = MagicMock()
-        service._llm.ainvoke = AsyncMock(return_value=mock_response)
-
-        # Create proper mock for chain
-        with patch.object(service, "llm", service._llm):
-            with patch("app.services.extraction.ChatPromptTemplate") as mock_template:
-                mock_chain = MagicMock()
-                mock_chain.ainvoke = AsyncMock(return_value=mock_response)
-                mock_template.from_messages.return_value.__or__ = MagicMock(
-                    return_value=mock_chain
-                )
+        # The real chain builder runs; prompt | llm resolves to the fake LLM
+        monkeypatch.setattr("app.services.extraction.ChatPromptTemplate", _StubTemplate)
+        service = ExtractionService(api_key="test-key")
+        service._llm = _FakeChain(content)
 
-                result = await service.extract("Server A depends on Database B")
+        result = await service.extract("Server A depends on Database B")
 
         assert isinstance(result, ExtractionResult)
         assert len(result.entities) == 2
@@ -48,76 +112,284 @@ class TestExtractionService:
         assert result.entities[0].name == "Server A"
         assert result.relations[0].relation_type == "depends_on"
 
-    def test_parse_response_valid_json(self):
-        """Test parsing valid JSON response"""
+    @pytest.mark.asyncio
+    async def test_extract_many_isolates_failures(self, monkeypatch):
+        """Test that a failing or malformed reply in a batch does not fail the others"""
+        replies = {
+            "Queue text": '{"entities": [{"name": "Queue", "type": "component"}], "relations": []}',
+            # A JSON array instead of an object
+            "Array text": '[{"name": "A"}]',
+        }
+
+        async def fake_ainvoke(inputs):
+            if inputs["text"] not in replies:
+                raise TimeoutError("LLM timeout")
+            return SimpleNamespace(content=replies[inputs["text"]])
+
         service = ExtractionService.__new__(ExtractionService)
+        service.model = "gpt-4"
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = fake_ainvoke
+        fallback = '{"entities": [{"name": "Fallback", "type": "component"}], "relations": []}'
 
-        content = """
-        {
-            "entities": [
-                {"name": "Payment Service", "type": "service"},
-                {"name": "Auth API", "type": "api"}
-            ],
-            "relations": [
-                {"source": "Payment Service", "target": "Auth API", "relation_type": "uses"}
-            ]
-        }
-        """
+        monkeypatch.setattr(service, "_build_chain", lambda: mock_chain)
+        monkeypatch.setattr(service, "_build_fallback_chain", lambda: _FakeChain(fallback))
+        monkeypatch.setattr("app.services.extraction.retry_async", _no_retry)
+        results = await service.extract_many(["Queue text", "Array text", "Slow text"])
 
-        result = service._parse_response(content)
+        assert results[0].entities[0].name == "Queue"
+        assert results[1] == ExtractionResult(entities=[], relations=[])
+        # The failed call goes through the same fallback as ``extract``
+        assert results[2].entities[0].name == "Fallback"
 
-        assert len(result.entities) == 2
-        assert len(result.relations) == 1
-        assert result.entities[0].name == "Payment Service"
-        assert result.entities[1].type == "api"
+    @pytest.mark.asyncio
+    async def test_extract_many_waits_for_llm_limiter(self, monkeypatch):
+        """Test that batched calls share the process-wide LLM limiter"""
+        limiter = LLMLimiter(max_concurrency=1)
+        monkeypatch.setattr("app.services.extraction.llm_limiter", limiter)
 
-    def test_parse_response_with_markdown(self):
-        """Test parsing JSON wrapped in markdown code blocks"""
+        mock_response = MagicMock()
+        mock_response.content = '{"entities": [{"name": "Queue", "type": "component"}], "relations": []}'
         service = ExtractionService.__new__(ExtractionService)
+        service.model = "gpt-4"
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = AsyncMock(return_value=mock_response)
+        monkeypatch.setattr(service, "_build_chain", lambda: mock_chain)
+
+        async with limiter:
+            task = asyncio.create_task(service.extract_many(["Queue text"]))
+            await asyncio.sleep(0.01)
+            # The only slot is held, so the batch cannot reach the LLM yet
+            mock_chain.ainvoke.assert_not_awaited()
+        results = await task
+
+        mock_chain.ainvoke.assert_awaited_once()
+        assert results[0].entities[0].name == "Queue"
+
+    @pytest.mark.parametrize(
+        "content,n_entities,n_relations,first_name",
+        [
+            pytest.param(VALID_JSON, 2, 1, "Payment Service", id="valid_json"),
+            pytest.param(MARKDOWN_JSON, 1, 0, "Cache", id="with_markdown"),
+            pytest.param(PROSE_JSON, 1, 0, "Queue", id="json_in_prose"),
+            pytest.param("This is not valid JSON", 0, 0, None, id="invalid_json"),
+            pytest.param('[{"name": "A"}]', 0, 0, None, id="json_array"),
+            # Empty-name entities are filtered out
+            pytest.param(EMPTY_NAME_JSON, 1, 0, "Valid Entity", id="empty_entities"),
+        ],
+    )
+    def test_parse_response(
+        self, extraction_service, content, n_entities, n_relations, first_name
+    ):
+        """Test parsing LLM responses into entities and relations"""
+        result = extraction_service._parse_response(content)
+
+        assert len(result.entities) == n_entities
+        assert len(result.relations) == n_relations
+        if first_name is not None:
+            assert result.entities[0].name == first_name
 
+    def test_parse_response_skips_malformed_items(self, extraction_service):
+        """Test that invalid entries are dropped without losing the valid ones"""
         content = """
-        ```json
         {
-            "entities": [
-                {"name": "Cache", "type": "service"}
-            ],
-            "relations": []
+            "entities": [{"name": "Queue"}, {"name": 42, "type": "server"}, "junk"],
+            "relations": [{"source": "Queue", "target": "Worker"}, {"source": "Queue"}]
         }
-        ```
         """
 
-        result = service._parse_response(content)
+        result = extraction_service._parse_response(content)
 
-        assert len(result.entities) == 1
-        assert result.entities[0].name == "Cache"
+        assert [(e.name, e.type) for e in result.entities] == [("Queue", "unknown")]
+        assert [r.relation_type for r in result.relations] == ["related_to"]
 
-    def test_parse_response_invalid_json(self):
-        """Test handling invalid JSON"""
-        service = ExtractionService.__new__(ExtractionService)
+    @pytest.mark.asyncio
+    async def test_extract_batch_runs_concurrently(self, monkeypatch):
+        """Test that batch extraction is bounded by the concurrency limit and isolates failures"""
+        service = ExtractionService(api_key="test-key", concurrency_limit=2)
+        in_flight = 0
+        peak = 0
 
-        content = "This is not valid JSON"
+        async def fake_ainvoke(inputs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if inputs["text"] == "bad":
+                raise RuntimeError("boom")
+            response = MagicMock()
+            response.content = '{"entities": [{"name": "%s", "type": "service"}], "relations": []}' % inputs["text"]
+            return response
 
-        result = service._parse_response(content)
+        async def failing_fallback(text, error):
+            raise RuntimeError("fallback failed")
 
-        assert len(result.entities) == 0
-        assert len(result.relations) == 0
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = fake_ainvoke
 
-    def test_parse_response_empty_entities(self):
-        """Test handling empty entity name"""
-        service = ExtractionService.__new__(ExtractionService)
+        monkeypatch.setattr(service, "_build_chain", lambda: mock_chain)
+        monkeypatch.setattr(service, "_fallback_extract", failing_fallback)
+        monkeypatch.setattr("app.services.extraction.retry_async", _no_retry)
+        results = await service.extract_batch(["A", "bad", "B", "C"])
 
-        content = """
-        {
-            "entities": [
-                {"name": "", "type": "server"},
-                {"name": "Valid Entity", "type": "service"}
+        assert peak == 2
+        assert [r.entities[0].name if r.entities else None for r in results] == ["A", None, "B", "C"]
+
+    def test_chains_are_built_once(self):
+        """Test that the prompt | LLM chains are reused across calls"""
+        service = ExtractionService(api_key="test-key")
+
+        assert service._build_chain() is service._build_chain()
+        assert service._build_fallback_chain() is service._build_fallback_chain()
+
+    @pytest.mark.asyncio
+    async def test_extract_uses_response_cache(self, monkeypatch):
+        """Test that identical inputs are answered from the LLM cache"""
+        mock_response = MagicMock()
+        mock_response.content = '{"entities": [{"name": "Cache Node", "type": "cache"}], "relations": []}'
+
+        service = ExtractionService(api_key="test-key")
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = AsyncMock(return_value=mock_response)
+
+        monkeypatch.setattr(service, "_build_chain", lambda: mock_chain)
+        first = await service.extract("Cache Node stores sessions")
+        second = await service.extract("Cache Node stores sessions")
+        batched = await service.extract_many(["Cache Node stores sessions"])
+
+        assert mock_chain.ainvoke.await_count == 1
+        assert first == second == batched[0]
+
+
+class TestLLMLimiter:
+    """Tests for the shared LLM request limiter"""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrency_and_rate(self):
+        """Test that in-flight requests are capped and the RPM bucket is spent"""
+        limiter = LLMLimiter(max_concurrency=2, requests_per_minute=600)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter._tokens < 600 - 5
+
+
+class TestSemanticLLMCache:
+    """Tests for the embedding-similarity LLM cache"""
+
+    class FakeEmbeddings:
+        """Bag-of-words embedding over a tiny vocabulary"""
+
+        vocabulary = ["server", "database", "cache", "queue", "depends"]
+
+        async def aembed_query(self, text: str):
+            words = text.lower().split()
+            return [float(words.count(w)) for w in self.vocabulary]
+
+    @pytest.mark.asyncio
+    async def test_reuses_value_for_similar_input(self):
+        """Test that a reordered input hits and an unrelated one misses"""
+        cache = SemanticLLMCache(self.FakeEmbeddings(), threshold=0.94)
+
+        hit, vector = await cache.lookup("server depends database")
+        assert hit is None
+        cache.store(vector, {"entities": []})
+
+        hit, _ = await cache.lookup("database server depends")
+        assert hit == {"entities": []}
+
+        hit, _ = await cache.lookup("queue cache")
+        assert hit is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_oldest_entries(self):
+        """Test that the cache keeps at most max_entries"""
+        cache = SemanticLLMCache(self.FakeEmbeddings(), max_entries=1)
+
+        _, first = await cache.lookup("server")
+        cache.store(first, "first")
+        _, second = await cache.lookup("queue")
+        cache.store(second, "second")
+
+        assert cache.values == ["second"]
+        assert (await cache.lookup("server"))[0] is None
+
+
+class TestCanonicalizationService:
+    """Tests for CanonicalizationService"""
+
+    @pytest.mark.asyncio
+    async def test_canonicalize_batch_uses_one_call(self, monkeypatch):
+        """Test that a batch is canonicalized in one call and mapped back per result"""
+        service = CanonicalizationService(api_key="test-key")
+        first = ExtractionResult(
+            entities=[Entity(name="Auth API", type="REST api", properties={"port": 443})],
+            relations=[Relation(source="Auth API", target="Users DB", relation_type="reads")],
+        )
+        second = ExtractionResult(
+            entities=[Entity(name="Users DB", type="postgres"), Entity(name="Auth API", type="REST api")],
+        )
+        canonical = ExtractionResult(
+            entities=[Entity(name="Auth API", type="api"), Entity(name="Users DB", type="database")],
+            relations=[Relation(source="Auth API", target="Users DB", relation_type="reads_from")],
+            canonicalized=True,
+        )
+
+        mock_call = AsyncMock(return_value=canonical)
+        monkeypatch.setattr(service, "canonicalize", mock_call)
+        results = await service.canonicalize_batch([first, second])
+
+        mock_call.assert_awaited_once()
+        assert len(mock_call.await_args.args[0].entities) == 2
+        assert results[0].entities[0].type == "api"
+        assert results[0].entities[0].properties == {"port": 443}
+        assert results[0].relations[0].relation_type == "reads_from"
+        assert [e.type for e in results[1].entities] == ["database", "api"]
+        assert all(result.canonicalized for result in results)
+
+        # Already-canonicalized results short-circuit without another call
+        mock_call = AsyncMock()
+        monkeypatch.setattr(service, "canonicalize", mock_call)
+        again = await service.canonicalize_batch(results)
+
+        mock_call.assert_not_awaited()
+        assert again == results
+
+    @pytest.mark.asyncio
+    async def test_canonicalize_runs_real_chain(self):
+        """Test that the prompt formats and a single result keeps its properties"""
+        service = CanonicalizationService(api_key="test-key")
+        service._llm = FakeListChatModel(
+            responses=[
+                '{"entities": [{"name": "Auth API", "type": "api"}],'
+                ' "relations": [{"source": "Auth API", "target": "Users DB", "relation_type": "reads_from"}]}'
+            ]
+        )
+        extraction = ExtractionResult(
+            entities=[Entity(name="Auth API", type="REST thing", properties={"port": 443})],
+            relations=[
+                Relation(
+                    source="Auth API", target="Users DB", relation_type="reads", properties={"weight": 1}
+                )
             ],
-            "relations": []
-        }
-        """
+        )
 
-        result = service._parse_response(content)
+        [result] = await service.canonicalize_batch([extraction])
 
-        # Empty name entities should be filtered out
-        assert len(result.entities) == 1
-        assert result.entities[0].name == "Valid Entity"
+        assert result.canonicalized
+        assert result.entities[0].type == "api"
+        assert result.entities[0].properties == {"port": 443}
+        assert result.relations[0].relation_type == "reads_from"
+        assert result.relations[0].properties == {"weight": 1}
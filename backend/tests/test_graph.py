@@ -1,17 +1,62 @@
 """Tests for the graph service"""
 
+import os
+from collections import OrderedDict
+
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.graph import GraphService
+from app.services.graph import (
+    EDGE_INSERT_BATCH_SIZE,
+    GraphService,
+    _impact_query,
+    _path_query,
+    traversal_warmup,
+)
 from app.models.schemas import NodeCreate, EdgeCreate
 from app.models.db_models import Node, Edge
+from app.services.query_cache import GraphQueryCache, NodeIdCache, graph_query_cache, node_id_cache
+
+# Async tests share one event loop (sync tests in this module stay unmarked)
+SESSION_LOOP = pytest.mark.asyncio(scope="session")
+
+# The traversal CTEs use Postgres arrays and DISTINCT ON
+REQUIRES_POSTGRES = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL", "").startswith("postgresql"),
+    reason="set TEST_DATABASE_URL to a Postgres database to run the traversal CTEs",
+)
+
+
+async def _dependents_bfs(
+    db: AsyncSession, node_id: int, max_depth: int = 5, relation_types=None
+) -> dict:
+    """Reference walk for tiny test graphs: dependent node ID -> shortest depth"""
+    query = select(Edge.source_id, Edge.target_id)
+    if relation_types:
+        query = query.where(Edge.relation_type.in_(relation_types))
+
+    incoming = {}
+    for source_id, target_id in await db.execute(query):
+        incoming.setdefault(target_id, []).append(source_id)
+
+    depths = {}
+    frontier = [node_id]
+    for depth in range(1, max_depth + 1):
+        frontier = [
+            source_id
+            for current in frontier
+            for source_id in incoming.get(current, ())
+            if source_id != node_id and depths.setdefault(source_id, depth) == depth
+        ]
+    return depths
 
 
 class TestGraphService:
     """Tests for GraphService"""
 
-    @pytest.mark.asyncio
+    pytestmark = SESSION_LOOP
+
     async def test_create_node(self, db_session: AsyncSession):
         """Test creating a node"""
         service = GraphService(db_session)
@@ -27,7 +72,94 @@ class TestGraphService:
         assert node.type == "server"
         assert node.properties["ip"] == "192.168.1.1"
 
-    @pytest.mark.asyncio
+    async def test_create_duplicate_node(self, db_session: AsyncSession):
+        """Test that creating a node with an existing name is a no-op"""
+        service = GraphService(db_session)
+
+        await service.create_node(NodeCreate(name="Edge Router", type="network"))
+        duplicate = await service.create_node(NodeCreate(name="Edge Router", type="other"))
+
+        assert duplicate is None
+
+    async def test_upsert_node(self, db_session: AsyncSession):
+        """Test that upsert inserts once and then returns the existing node"""
+        service = GraphService(db_session)
+
+        node, inserted = await service.upsert_node(NodeCreate(name="Load Balancer", type="network"))
+        again, inserted_again = await service.upsert_node(
+            NodeCreate(name="Load Balancer", type="other")
+        )
+
+        assert inserted is True
+        assert inserted_again is False
+        assert again.id == node.id
+        assert again.type == "network"
+
+    async def test_upsert_node_retries_after_concurrent_delete(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        """Test that upsert inserts again if the conflicting node vanishes before the lookup"""
+        service = GraphService(db_session)
+        existing = await service.create_node(NodeCreate(name="Flaky Node", type="service"))
+
+        async def deleted_meanwhile(self, name):
+            await GraphService(db_session).delete_node(existing.id)
+            return None
+
+        monkeypatch.setattr(GraphService, "get_node_by_name", deleted_meanwhile)
+        node, inserted = await service.upsert_node(NodeCreate(name="Flaky Node", type="service"))
+
+        assert inserted is True
+        assert node is not None and node.name == "Flaky Node"
+        assert await service.count_nodes() == 1
+
+    async def test_get_or_create_node(self, db_session: AsyncSession):
+        """Test that repeated and differently-cased names resolve to one node"""
+        service = GraphService(db_session)
+
+        created = await service.get_or_create_node("Auth Service", "service")
+        again = await GraphService(db_session).get_or_create_node("Auth Service")
+        alias = await service.get_or_create_node("auth service")
+
+        assert again.id == created.id
+        assert alias.id == created.id
+        assert await service.count_nodes() == 1
+
+    async def test_bulk_upsert_nodes_and_edges(self, db_session: AsyncSession):
+        """Test batched node upsert and edge insert skip existing rows"""
+        service = GraphService(db_session)
+        existing = await service.create_node(NodeCreate(name="Queue", type="queue"))
+
+        node_ids, created = await service.bulk_upsert_nodes(
+            [
+                {"name": "Queue", "type": "other", "properties": {}},
+                {"name": "Worker", "type": "service", "properties": {}},
+            ]
+        )
+        assert created == 1
+        assert node_ids["Queue"] == existing.id
+
+        edge = (existing.id, node_ids["Worker"], "feeds")
+        assert await service.bulk_create_edges({edge: {}}) == 1
+        assert await service.bulk_create_edges({edge: {}}) == 0
+        assert await service.count_edges() == 1
+
+    async def test_bulk_create_edges_in_batches(self, db_session: AsyncSession, bulk_create_nodes):
+        """Test that more edges than one INSERT holds are created, once each"""
+        service = GraphService(db_session)
+        nodes = await bulk_create_nodes([{"name": f"Node {i}", "type": "service"} for i in range(40)])
+        rows = {
+            (source.id, target.id, "calls"): {}
+            for source in nodes
+            for target in nodes
+            if source.id != target.id
+        }
+        assert len(rows) > EDGE_INSERT_BATCH_SIZE
+
+        assert await service.bulk_create_edges(rows) == len(rows)
+        assert await service.bulk_create_edges(rows) == 0
+        assert await service.count_edges() == len(rows)
+
     async def test_get_node(self, db_session: AsyncSession):
         """Test getting a node by ID"""
         service = GraphService(db_session)
@@ -43,7 +175,6 @@ class TestGraphService:
         assert node is not None
         assert node.name == "Database Server"
 
-    @pytest.mark.asyncio
     async def test_get_node_by_name(self, db_session: AsyncSession):
         """Test getting a node by name"""
         service = GraphService(db_session)
@@ -57,18 +188,17 @@ class TestGraphService:
         assert node is not None
         assert node.name == "Cache Server"
 
-    @pytest.mark.asyncio
-    async def test_list_nodes(self, db_session: AsyncSession):
+    async def test_list_nodes(self, db_session: AsyncSession, bulk_create_nodes):
         """Test listing nodes with pagination"""
         service = GraphService(db_session)
 
         # Create multiple nodes
-        for i in range(5):
-            await service.create_node(
-                NodeCreate(
-                    name=f"Node {i}", type="server" if i % 2 == 0 else "database"
-                )
-            )
+        await bulk_create_nodes(
+            [
+                {"name": f"Node {i}", "type": "server" if i % 2 == 0 else "database"}
+                for i in range(5)
+            ]
+        )
 
         # List all
         nodes, total = await service.list_nodes()
@@ -78,14 +208,21 @@ class TestGraphService:
         servers, total = await service.list_nodes(node_type="server")
         assert len(servers) >= 2
 
-    @pytest.mark.asyncio
-    async def test_create_edge(self, db_session: AsyncSession):
+        # Total is reported for partial and past-the-end pages
+        page, total = await service.list_nodes(skip=4, limit=2)
+        assert len(page) == 1 and total == 5
+        assert "total" not in page[0]
+        page, total = await service.list_nodes(skip=10)
+        assert page == [] and total == 5
+
+    async def test_create_edge(self, db_session: AsyncSession, bulk_create_nodes):
         """Test creating an edge between nodes"""
         service = GraphService(db_session)
 
         # Create nodes
-        source = await service.create_node(NodeCreate(name="Web Server", type="server"))
-        target = await service.create_node(NodeCreate(name="Database", type="database"))
+        source, target = await bulk_create_nodes(
+            [{"name": "Web Server", "type": "server"}, {"name": "Database", "type": "database"}]
+        )
 
         # Create edge
         edge = await service.create_edge(
@@ -99,7 +236,14 @@ class TestGraphService:
         assert edge.target_id == target.id
         assert edge.relation_type == "depends_on"
 
-    @pytest.mark.asyncio
+        # The same relation between the same nodes is not inserted twice
+        duplicate = await service.create_edge(
+            EdgeCreate(
+                source_id=source.id, target_id=target.id, relation_type="depends_on"
+            )
+        )
+        assert duplicate is None
+
     async def test_delete_node(self, db_session: AsyncSession):
         """Test deleting a node"""
         service = GraphService(db_session)
@@ -115,7 +259,6 @@ class TestGraphService:
         not_found = await service.get_node(node.id)
         assert not_found is None
 
-    @pytest.mark.asyncio
     async def test_delete_nonexistent_node(self, db_session: AsyncSession):
         """Test deleting a node that doesn't exist"""
         service = GraphService(db_session)
@@ -123,15 +266,18 @@ class TestGraphService:
         deleted = await service.delete_node(99999)
         assert deleted is False
 
-    @pytest.mark.asyncio
-    async def test_search_nodes(self, db_session: AsyncSession):
+    async def test_search_nodes(self, db_session: AsyncSession, bulk_create_nodes):
         """Test searching nodes"""
         service = GraphService(db_session)
 
         # Create nodes
-        await service.create_node(NodeCreate(name="Payment Service", type="service"))
-        await service.create_node(NodeCreate(name="Payment Database", type="database"))
-        await service.create_node(NodeCreate(name="Auth Service", type="service"))
+        await bulk_create_nodes(
+            [
+                {"name": "Payment Service", "type": "service"},
+                {"name": "Payment Database", "type": "database"},
+                {"name": "Auth Service", "type": "service"},
+            ]
+        )
 
         # Search by name
         results = await service.search_nodes(name="Payment")
@@ -145,8 +291,9 @@ class TestGraphService:
 class TestGraphTraversal:
     """Tests for graph traversal operations"""
 
-    @pytest.mark.asyncio
-    async def test_impact_analysis(self, db_session: AsyncSession):
+    pytestmark = SESSION_LOOP
+
+    async def test_impact_analysis(self, db_session: AsyncSession, bulk_create_edges):
         """Test impact analysis using recursive CTE"""
         service = GraphService(db_session)
 
@@ -155,15 +302,8 @@ class TestGraphTraversal:
         node_b = await service.create_node(NodeCreate(name="Service B", type="service"))
         node_c = await service.create_node(NodeCreate(name="Service C", type="service"))
 
-        await service.create_edge(
-            EdgeCreate(
-                source_id=node_a.id, target_id=node_b.id, relation_type="depends_on"
-            )
-        )
-        await service.create_edge(
-            EdgeCreate(
-                source_id=node_b.id, target_id=node_c.id, relation_type="depends_on"
-            )
+        await bulk_create_edges(
+            [(node_a.id, node_b.id, "depends_on"), (node_b.id, node_c.id, "depends_on")]
         )
 
         # Find impact of C going down
@@ -179,8 +319,16 @@ class TestGraphTraversal:
         dependents = await service.get_node_dependents(node_c.id)
         assert len(dependents) == 1
 
-    @pytest.mark.asyncio
-    async def test_find_path(self, db_session: AsyncSession):
+        # A reference BFS agrees with the direct lookup and follows the chain
+        direct = await _dependents_bfs(db_session, node_c.id, max_depth=1)
+        assert set(direct) == {edge.source_id for edge in dependents}
+        assert await _dependents_bfs(db_session, node_c.id) == {node_b.id: 1, node_a.id: 2}
+        assert await _dependents_bfs(db_session, node_c.id, relation_types=["calls"]) == {}
+
+        streamed = [edge async for edge in service.stream_node_dependencies(node_a.id)]
+        assert [edge.target_id for edge in streamed] == [node_b.id]
+
+    async def test_find_path(self, db_session: AsyncSession, bulk_create_edges):
         """Test finding path between nodes"""
         service = GraphService(db_session)
 
@@ -190,20 +338,12 @@ class TestGraphTraversal:
         node_c = await service.create_node(NodeCreate(name="Node C", type="node"))
         node_d = await service.create_node(NodeCreate(name="Node D", type="node"))
 
-        await service.create_edge(
-            EdgeCreate(
-                source_id=node_a.id, target_id=node_b.id, relation_type="connects"
-            )
-        )
-        await service.create_edge(
-            EdgeCreate(
-                source_id=node_b.id, target_id=node_c.id, relation_type="connects"
-            )
-        )
-        await service.create_edge(
-            EdgeCreate(
-                source_id=node_c.id, target_id=node_d.id, relation_type="connects"
-            )
+        await bulk_create_edges(
+            [
+                (node_a.id, node_b.id, "connects"),
+                (node_b.id, node_c.id, "connects"),
+                (node_c.id, node_d.id, "connects"),
+            ]
         )
 
         # Find path from A to D
@@ -214,3 +354,165 @@ class TestGraphTraversal:
         edges, total = await service.list_edges(source_id=node_a.id)
         assert total == 1
         assert edges[0].target_id == node_b.id
+
+    @REQUIRES_POSTGRES
+    async def test_traversal_ctes_break_ties_deterministically(
+        self, db_session: AsyncSession, bulk_create_nodes, bulk_create_edges
+    ):
+        """Test the impact and path CTEs on a diamond with equal-length paths"""
+        service = GraphService(db_session)
+        a, b, c, d = await bulk_create_nodes(
+            [{"name": f"Diamond {label}", "type": "service"} for label in "ABCD"]
+        )
+        # A -> B -> D and A -> C -> D; D also reached by two relations from C
+        await bulk_create_edges(
+            [
+                (a.id, b.id, "calls"),
+                (a.id, c.id, "calls"),
+                (b.id, d.id, "calls"),
+                (c.id, d.id, "uses"),
+                (c.id, d.id, "calls"),
+            ]
+        )
+
+        impact = await service.get_impacted_nodes(a.id)
+        assert [(n.name, n.depth) for n in impact.impacted_nodes] == [
+            ("Diamond B", 1),
+            ("Diamond C", 1),
+            ("Diamond D", 2),
+        ]
+        assert impact.impacted_nodes[-1].path == ["Diamond B", "Diamond D"]
+
+        paths = await service.find_path(a.id, d.id, top_k=3)
+        assert paths.found
+        assert [[node.id for node in p.path] for p in paths.paths] == [
+            [a.id, b.id, d.id],
+            [a.id, c.id, d.id],
+            [a.id, c.id, d.id],
+        ]
+        assert [p.relations for p in paths.paths][1:] == [["calls", "calls"], ["calls", "uses"]]
+
+        filtered = await service.find_path(a.id, d.id, relation_types=["uses"])
+        assert not filtered.found
+
+
+class TestTraversalQueries:
+    """Tests for the recursive CTE statement builders"""
+
+    @pytest.mark.parametrize("build", [_impact_query, _path_query])
+    def test_relation_filter_is_bound(self, build):
+        """Test that relation types are bound parameters and the SQL text is reused"""
+        filtered = build(True)
+
+        assert "= ANY(:relation_types)" in filtered.text
+        assert ":relation_types" not in build(False).text
+        assert build(True) is filtered
+
+    def test_warmup_binds_every_parameter(self):
+        """Test that warmup covers each statement shape with complete parameters"""
+        statements = traversal_warmup()
+
+        assert len(statements) == 4
+        for statement, params in statements:
+            assert set(statement.compile().params) == set(params)
+
+    def test_impact_query_skips_visited_nodes(self):
+        """Test that the impact CTE guards cycles and returns one row per node"""
+        sql = _impact_query(False).text
+
+        assert "NOT e.target_id = ANY(i.path_ids)" in sql
+        assert "DISTINCT ON (i.target_id)" in sql
+        assert "LIMIT :max_rows" in sql
+
+
+class TestGraphQueryCache:
+    """Tests for the traversal result cache"""
+
+    def test_get_set_and_bump(self):
+        """Test that cached values are dropped when the graph version bumps"""
+        cache = GraphQueryCache(ttl_seconds=60)
+        cache.set(("impact", 1), "result", cache.version)
+
+        assert cache.get(("impact", 1)) == "result"
+
+        cache.bump()
+
+        assert cache.get(("impact", 1)) is None
+        assert cache.version == 1
+
+    def test_set_drops_result_from_older_version(self):
+        """Test that a result computed before a bump is not stored"""
+        cache = GraphQueryCache(ttl_seconds=60)
+        version = cache.version
+        cache.bump()
+        cache.set(("impact", 1), "stale", version)
+
+        assert cache.get(("impact", 1)) is None
+
+    def test_disabled_with_zero_ttl(self):
+        """Test that a zero TTL disables caching"""
+        cache = GraphQueryCache(ttl_seconds=0)
+        cache.set(("impact", 1), "result", cache.version)
+
+        assert cache.get(("impact", 1)) is None
+
+    @SESSION_LOOP
+    async def test_write_bumps_version_when_transaction_ends(self, db_session: AsyncSession):
+        """Test that graph writes invalidate the cache once the transaction ends"""
+        service = GraphService(db_session)
+        version = graph_query_cache.version
+
+        await service.create_node(NodeCreate(name="Cache Probe", type="test"))
+        assert graph_query_cache.version == version
+
+        await db_session.rollback()
+        assert graph_query_cache.version == version + 1
+
+    @SESSION_LOOP
+    async def test_uncommitted_writes_bypass_cache(self, db_session: AsyncSession, monkeypatch):
+        """Test that a session with pending graph writes neither reads nor fills the cache"""
+        monkeypatch.setattr(graph_query_cache, "ttl_seconds", 60)
+        monkeypatch.setattr(graph_query_cache, "entries", OrderedDict())
+        service = GraphService(db_session)
+        node = await service.create_node(NodeCreate(name="Dirty Probe", type="test"))
+        key = ("impact", node.id, 5, ())
+        graph_query_cache.set(key, "committed", graph_query_cache.version)
+
+        async def fake_impact(*_args):
+            return "uncommitted"
+
+        monkeypatch.setattr(GraphService, "_get_impacted_nodes", fake_impact)
+
+        assert await service.get_impacted_nodes(node.id) == "uncommitted"
+        assert graph_query_cache.get(key) == "committed"
+
+
+class TestNodeIdCache:
+    """Tests for the process-wide node name -> ID cache"""
+
+    @SESSION_LOOP
+    async def test_publishes_ids_on_commit_only(self, db_session: AsyncSession):
+        """Test that node IDs are shared after commit and dropped on rollback"""
+        service = GraphService(db_session)
+
+        await service.create_node(NodeCreate(name="Scratch", type="test"))
+        await db_session.rollback()
+        assert node_id_cache.get("Scratch") is None
+
+        node = await service.create_node(NodeCreate(name="Gateway", type="network"))
+        await db_session.commit()
+        assert node_id_cache.get("Gateway") == node.id
+
+        found = await GraphService(db_session).get_node_by_name("Gateway")
+        assert found.id == node.id
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache keeps at most max_entries names"""
+        cache = NodeIdCache(max_entries=2)
+        cache.update({"a": 1, "b": 2})
+        cache.get("a")
+        cache.update({"c": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
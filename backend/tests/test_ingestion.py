@@ -0,0 +1,152 @@
+"""Tests for document ingestion and building the graph from extraction results"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.schemas import (
+    Entity,
+    ExtractionResult,
+    IngestUrlsBatchRequest,
+    NodeCreate,
+    Relation,
+)
+from app.services.dedup import SimHashDedup
+from app.services.graph import GraphService
+from app.services.ingestion import IngestionService
+
+
+class TestCreateGraphFromExtraction:
+    """Tests for IngestionService._create_graph_from_extraction"""
+
+    @pytest.mark.asyncio
+    async def test_creates_nodes_and_edges(self, db_session: AsyncSession):
+        """Test that entities, relation endpoints and edges are created once"""
+        service = IngestionService(db_session)
+        extraction = ExtractionResult(
+            entities=[
+                Entity(name="Checkout API", type="api"),
+                Entity(name="Orders DB", type="database"),
+            ],
+            relations=[
+                Relation(source="Checkout API", target="Orders DB", relation_type="uses"),
+                Relation(source="Checkout API", target="Orders DB", relation_type="uses"),
+                Relation(source="Orders DB", target="Backup Job", relation_type="triggers"),
+            ],
+        )
+
+        nodes_created, edges_created = await service._create_graph_from_extraction(
+            extraction, document_id=None
+        )
+
+        assert nodes_created == 3
+        assert edges_created == 2
+
+        # Re-ingesting the same extraction creates nothing new
+        nodes_created, edges_created = await service._create_graph_from_extraction(
+            extraction, document_id=None
+        )
+
+        assert nodes_created == 0
+        assert edges_created == 0
+
+        # A new service (empty in-process caches) relies on the database check
+        nodes_created, edges_created = await IngestionService(
+            db_session
+        )._create_graph_from_extraction(extraction, document_id=None)
+
+        assert nodes_created == 0
+        assert edges_created == 0
+
+    @pytest.mark.asyncio
+    async def test_matches_normalized_names_as_aliases(self, db_session: AsyncSession):
+        """Test that a differently formatted name resolves to the existing node"""
+        graph = GraphService(db_session)
+        existing = await graph.create_node(NodeCreate(name="Payment Service", type="service"))
+        service = IngestionService(db_session)
+
+        nodes_created, _ = await service._create_graph_from_extraction(
+            ExtractionResult(entities=[Entity(name="payment-service", type="service")]),
+            document_id=None,
+        )
+        await db_session.flush()
+        await db_session.refresh(existing)
+
+        assert nodes_created == 0
+        assert "payment-service" in existing.properties["aliases"]
+
+    @pytest.mark.asyncio
+    async def test_dedupes_names_within_extraction(self, db_session: AsyncSession):
+        """Test that spellings with the same normalized form become one node"""
+        service = IngestionService(db_session)
+        extraction = ExtractionResult(
+            entities=[
+                Entity(name="Orders DB", type="database"),
+                Entity(name="orders  db", type="database"),
+            ],
+            relations=[
+                Relation(source="Checkout", target="ORDERS DB", relation_type="uses"),
+            ],
+        )
+
+        nodes_created, edges_created = await service._create_graph_from_extraction(
+            extraction, document_id=None
+        )
+        node = await GraphService(db_session).get_node_by_name("Orders DB")
+
+        assert nodes_created == 2
+        assert edges_created == 1
+        assert "orders  db" in node.properties["aliases"]
+
+
+class TestSimHashDedup:
+    """Tests for near-duplicate name detection"""
+
+    def test_near_duplicates_share_representative(self):
+        """Test that small spelling variations map to the first-seen name"""
+        dedup = SimHashDedup()
+
+        assert dedup.canonical("Payment Service") == "Payment Service"
+        assert dedup.canonical("Payment Services") == "Payment Service"
+        assert dedup.canonical("Service B") == "Service B"
+
+
+class TestIngestUrlsBatch:
+    """Tests for IngestionService.ingest_urls_batch"""
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_abort_batch(self, db_session: AsyncSession):
+        """Test that scrape/extraction failures are reported while other URLs are ingested"""
+
+        async def fake_scrape(url: str) -> str:
+            if "broken" in url:
+                raise ValueError("HTTP error 404")
+            return f"Content of {url}"
+
+        service = IngestionService(db_session)
+        service.extraction_service = MagicMock()
+        service.extraction_service.extract_many = AsyncMock(
+            return_value=[
+                ExtractionResult(entities=[Entity(name="Docs Site", type="system")]),
+                RuntimeError("LLM timeout"),
+            ]
+        )
+
+        with patch("app.services.ingestion.scrape_url", side_effect=fake_scrape):
+            result = await service.ingest_urls_batch(
+                IngestUrlsBatchRequest(
+                    urls=[
+                        "https://example.com/ok",
+                        "https://example.com/broken",
+                        "https://example.com/slow",
+                    ]
+                )
+            )
+
+        assert len(result.results) == 1
+        assert result.results[0].nodes_created == 1
+        assert [f.url for f in result.failed] == [
+            "https://example.com/broken",
+            "https://example.com/slow",
+        ]
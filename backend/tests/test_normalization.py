@@ -0,0 +1,43 @@
+"""Tests for normalization utilities"""
+
+import pytest
+
+from app.utils.normalization import (
+    normalize_entity_type,
+    normalize_relation_type,
+    normalize_text,
+)
+
+
+class TestNormalizeText:
+    """Tests for normalize_text"""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("  Payment-Service ", "payment service"),
+            ("orders__db", "orders db"),
+            ("Auth API (v2)!", "auth api v2"),
+            ("a \t_- b", "a b"),
+            ("Café Service", "caf service"),
+            ("", ""),
+        ],
+    )
+    def test_normalize_text(self, value, expected):
+        """Test punctuation stripping and separator collapsing"""
+        assert normalize_text(value) == expected
+
+
+class TestNormalizeTypes:
+    """Tests for entity/relation type normalization"""
+
+    def test_entity_type_aliases(self):
+        """Test that entity type aliases map to canonical labels"""
+        assert normalize_entity_type("DB") == "database"
+        assert normalize_entity_type("") == "unknown"
+
+    def test_relation_type_aliases(self):
+        """Test that relation type aliases map to canonical labels"""
+        assert normalize_relation_type("Depends On") == "depends_on"
+        assert normalize_relation_type("connected-to") == "connects_to"
+        assert normalize_relation_type("") == "related_to"
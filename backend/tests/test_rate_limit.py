@@ -0,0 +1,44 @@
+"""Tests for the in-process rate limiter"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import rate_limit
+from app.utils.rate_limit import RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_allows_burst_then_refills(self, monkeypatch):
+        """Test that a full bucket allows max_requests and refills over time"""
+        now = 1000.0
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now))
+        limiter = RateLimiter(max_requests=3, window_seconds=3)
+
+        assert [await limiter.is_allowed("client") for _ in range(4)] == [True, True, True, False]
+        assert await limiter.is_allowed("other")
+
+        now += 1.0
+        assert await limiter.is_allowed("client")
+        assert not await limiter.is_allowed("client")
+
+    @pytest.mark.asyncio
+    async def test_evicts_idle_keys(self, monkeypatch):
+        """Test that keys idle for a full window are dropped by the sweep"""
+        now = 1000.0
+        monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now))
+        limiter = RateLimiter(max_requests=5, window_seconds=16)
+
+        for i in range(100):
+            await limiter.is_allowed(f"client-{i}")
+        assert sum(map(len, limiter._shards)) == 100
+
+        # Each sweep covers one shard; a full round takes one window
+        for _ in range(rate_limit.RATE_LIMIT_SHARDS):
+            now += 17.0
+            await limiter.is_allowed("active")
+
+        assert sum(map(len, limiter._shards)) == 1
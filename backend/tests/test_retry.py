@@ -0,0 +1,52 @@
+"""Tests for the retry helper"""
+
+import pytest
+
+from app.utils import retry
+from app.utils.retry import retry_async
+
+
+class TestRetryAsync:
+    """Tests for retry_async"""
+
+    @pytest.mark.asyncio
+    async def test_every_sleep_is_jittered_within_cap(self, monkeypatch):
+        """Test that each backoff sleep, including the first, is random and capped"""
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        async def always_fails():
+            raise TimeoutError("transient")
+
+        monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+        for _ in range(20):
+            with pytest.raises(TimeoutError):
+                await retry_async(always_fails, retries=3, base_delay=0.5, max_delay=1.0)
+
+        caps = [0.5, 1.0, 1.0]
+        per_attempt = [sleeps[i::3] for i in range(3)]
+        for delays, cap in zip(per_attempt, caps):
+            assert all(0 <= delay <= cap for delay in delays)
+            assert len(set(delays)) > 1
+
+    @pytest.mark.asyncio
+    async def test_returns_after_transient_failure(self, monkeypatch):
+        """Test that a call succeeding on retry returns its value"""
+        calls = 0
+
+        async def fake_sleep(_delay):
+            pass
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise TimeoutError("transient")
+            return "ok"
+
+        monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+
+        assert await retry_async(flaky, retries=2) == "ok"
+        assert calls == 2
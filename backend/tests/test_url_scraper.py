@@ -0,0 +1,124 @@
+"""Tests for the URL scraping helpers"""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from selectolax.lexbor import LexborHTMLParser
+
+from app.utils.url_scraper import (
+    _extract_text_from_html,
+    _extract_title,
+    _is_boilerplate,
+    close_http_client,
+    get_http_client,
+    scrape_url,
+)
+
+
+PAGE = """
+<html>
+  <head><title>Payments Overview</title></head>
+  <body>
+    <nav>Home | Docs | Pricing</nav>
+    <div id="sidebar">Related links and other sidebar text</div>
+    <div class="Page-Content">
+      <h1>Payments</h1>
+      <p>The payment service depends on the ledger database.</p>
+      <script>trackPageView()</script>
+      <p>Skip to navigation</p>
+    </div>
+    <footer>All rights reserved</footer>
+  </body>
+</html>
+"""
+
+
+class TestExtractTextFromHtml:
+    """Tests for HTML text extraction"""
+
+    def test_extracts_main_content_without_noise(self):
+        """Test that the content div is used and scripts/boilerplate are dropped"""
+        text = _extract_text_from_html(PAGE, "https://example.com")
+
+        assert text == "Payments\nThe payment service depends on the ledger database."
+
+    def test_strips_lines_and_drops_short_ones(self):
+        """Test per-line cleanup of preformatted text"""
+        html = "<main><pre>  first line   here  \n ok \n\n\n   second line</pre></main>"
+
+        assert _extract_text_from_html(html, "https://example.com") == "first line here\nsecond line"
+
+    def test_prefers_main_element(self):
+        """Test that <main> wins over content-looking divs"""
+        html = '<div class="content">Div text here</div><main><p>Main text here</p></main>'
+
+        assert _extract_text_from_html(html, "https://example.com") == "Main text here"
+
+        # Class matches outrank id matches regardless of document order
+        html = '<div id="main">Id text here</div><div class="post">Class text here</div>'
+        assert _extract_text_from_html(html, "https://example.com") == "Class text here"
+
+    def test_extract_title(self):
+        """Test title lookup order (h1 before <title>)"""
+        assert _extract_title(LexborHTMLParser(PAGE)) == "Payments"
+
+
+class TestIsBoilerplate:
+    """Tests for boilerplate line detection"""
+
+    def test_boilerplate_lines(self):
+        """Test that navigation/legal lines are detected and prose is kept"""
+        assert _is_boilerplate("Skip to content")
+        assert _is_boilerplate("© 2024 Example Inc.")
+        assert not _is_boilerplate("The cache sits in front of the database.")
+
+
+class TestHttpClient:
+    """Tests for the shared scraping session"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_until_closed(self):
+        """Test that scrapes share one pooled session and shutdown closes it"""
+        client = get_http_client()
+        assert get_http_client() is client
+
+        await close_http_client()
+
+        assert client.closed
+        replacement = get_http_client()
+        assert replacement is not client
+        await close_http_client()
+
+    @pytest.mark.asyncio
+    async def test_scrape_url(self):
+        """Test fetching HTML, and errors for bad status and content type"""
+
+        async def page(request):
+            # Media type matching ignores case and parameters
+            return web.Response(body=PAGE.encode(), headers={"Content-Type": "Text/HTML; charset=utf-8"})
+
+        async def large(request):
+            return web.Response(text="word " * 100_000, content_type="text/plain")
+
+        async def pdf(request):
+            return web.Response(body=b"%PDF", content_type="application/pdf")
+
+        app = web.Application()
+        app.router.add_get("/page", page)
+        app.router.add_get("/large.txt", large)
+        app.router.add_get("/file.pdf", pdf)
+
+        async with TestServer(app) as server:
+            try:
+                text = await scrape_url(str(server.make_url("/page")))
+                assert "ledger database" in text
+
+                truncated = await scrape_url(str(server.make_url("/large.txt")), max_bytes=1000)
+                assert len(truncated) == 1000
+
+                with pytest.raises(ValueError, match="Unsupported content type"):
+                    await scrape_url(str(server.make_url("/file.pdf")))
+                with pytest.raises(ValueError, match="HTTP error 404"):
+                    await scrape_url(str(server.make_url("/missing")))
+            finally:
+                await close_http_client()